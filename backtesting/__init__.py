@@ -1,2 +1,3 @@
 from .backtester import Backtester
-from .evaluator import Evaluator
+from .portfolio_backtester import PortfolioBacktester
+from .out_of_core import OutOfCoreBacktester
@@ -1,29 +1,109 @@
 # backtester.py
+import functools
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from modules.strategy import TradingStrategy
+from strategy.strategy import TechnicalStrategy, INDICATOR_WEIGHTS
+from backtesting.vectorized import simulate, action_codes
+from backtesting.cache import ResultCache
+from backtesting.monte_carlo import monte_carlo
+from data.investing import load_frame
+
+
+# Metrics reported by evaluate_performance, from the balance logged after each trade
+def performance_metrics(balances, final_balance: float) -> dict:
+    balances = np.asarray(balances, dtype=float)
+    if not len(balances):
+        return {}
+    pnl = np.diff(balances, prepend=balances[:1])
+    pnl_std = pnl.std(ddof=1) if len(pnl) > 1 else np.nan
+    return {
+        'Total P&L': pnl.sum(),
+        'Win Rate': (pnl > 0).mean(),
+        'Max Drawdown': (np.maximum.accumulate(balances) - balances).max(),
+        'Sharpe Ratio': pnl.mean() / (pnl_std + 1e-8) * np.sqrt(252),
+        'Final Balance': final_balance
+    }
+
+
+# Realized return per round trip: the account value (cash plus the coins still held, marked
+# at the fill price) after each run of sells, and after the final close, over its value at
+# the previous such point. The coins traded are recovered from the cash change of each fill.
+# Compounded from initial_balance, they reach final_balance in any order.
+def round_trip_returns(trade_log: list, initial_balance: float, final_balance: float) -> np.ndarray:
+    checkpoints, cash, position = [initial_balance], initial_balance, 0.0
+    for trade, following in zip(trade_log, trade_log[1:] + [None]):
+        position += (cash - trade['balance']) / trade['price']
+        cash = trade['balance']
+        if trade['action'] == 'sell' and (following is None or following['action'] == 'buy'):
+            checkpoints.append(cash + max(position, 0.0) * trade['price'])
+    if not np.isclose(final_balance, checkpoints[-1]):
+        checkpoints.append(final_balance)
+    checkpoints = np.asarray(checkpoints, dtype=float)
+    return checkpoints[1:] / checkpoints[:-1] - 1
+
+
+# Serve a run from Backtester.cache when the same data, account state, parameters, signals
+# and code have been run before; otherwise run it and store the trades and final account.
+def cached_run(method):
+    @functools.wraps(method)
+    def wrapper(self, actions=None, sizes=None):
+        if self.cache is None:
+            return method(self, actions, sizes)
+        params = {'balance': self.balance, 'position': self.position, 'trade_size': self.trade_size,
+                  'buy_threshold': self.buy_threshold, 'sell_threshold': self.sell_threshold,
+                  'weights': INDICATOR_WEIGHTS}
+        key = self.cache.key(method.__name__, self.data, params, [actions, sizes])
+        entry = self.cache.get(key)
+        if entry is None:
+            trades = len(self.trade_log)
+            result = method(self, actions, sizes)
+            entry = {'trade_log': self.trade_log[trades:], 'balance': self.balance,
+                     'position': self.position, 'equity': self.equity, 'result': result}
+            self.cache.put(key, entry)
+            return result
+        self.trade_log += entry['trade_log']
+        self.balance, self.position, self.equity = entry['balance'], entry['position'], entry['equity']
+        return entry['result']
+    return wrapper
 
 
 class Backtester:
-    def __init__(self, historical_data: pd.DataFrame):
+    def __init__(self, historical_data: pd.DataFrame, cache: ResultCache = None):
         # Historical OHLCV data
         self.data = historical_data
-        self.strategy = TradingStrategy()
+        self.strategy = TechnicalStrategy()
         self.initial_balance = 10000  # Starting balance in USD
         self.balance = self.initial_balance
         self.position = 0  # Current position (number of coins)
+        self.trade_size = 1.0  # Fraction of balance / position traded per signal
+        self.buy_threshold = 1.0  # combined_strategy decision thresholds
+        self.sell_threshold = -1.0
         self.trade_log = []  # Log all trades
+        self.equity = None  # Per-bar equity from run_vectorized
+        self.cache = cache  # Optional ResultCache for repeated runs
+
+    # Backtester over a bundled dataset (e.g. 'ADAUSD') from the columnar history cache
+    @classmethod
+    def from_dataset(cls, pair: str, cache: ResultCache = None) -> 'Backtester':
+        return cls(load_frame(pair), cache=cache)
+
+    # Per-bar actions from one vectorized strategy pass (row i is the decision combined_strategy
+    # makes on the data up to bar i) and the fraction traded on each bar
+    def decisions(self):
+        actions = self.strategy.signal_matrix(self.data, buy_threshold=self.buy_threshold,
+                                              sell_threshold=self.sell_threshold)['action']
+        return actions, np.full(len(self.data), self.trade_size)
     
-    def run(self):
+    @cached_run
+    def run(self, actions=None, sizes=None):
         # Run the strategy on each row of historical data
-        for index, row in self.data.iterrows():
+        if actions is None:
+            actions, sizes = self.decisions()
+        for i, (index, row) in enumerate(self.data.iterrows()):
             price = row['close']
-            pair = row['pair']
-            
-            decision = self.strategy.execute_strategy(pair)
-            action = decision['action']
-            trade_size = decision['trade_size']
+            action = actions[i]
+            trade_size = sizes[i]
             
             if action == 'buy' and self.balance > 0:
                 self.position += (self.balance * trade_size) / price
@@ -38,6 +118,26 @@ class Backtester:
         # Close remaining position at the end of the backtest
         self.balance += self.position * self.data.iloc[-1]['close']
         self.position = 0
+
+    # Same account rules as run(), computed for all bars at once with NumPy scans
+    @cached_run
+    def run_vectorized(self, actions=None, sizes=None):
+        if actions is None:
+            actions, sizes = self.decisions()
+        prices = self.data['close'].to_numpy(dtype=float)
+        codes = action_codes(actions)
+        result = simulate(prices, codes, sizes, self.balance, self.position)
+        fills = np.flatnonzero(result['fills'])
+        sides = np.where(codes[fills] > 0, 'buy', 'sell').tolist()
+        self.trade_log += [{'action': action, 'price': price, 'balance': balance}
+                           for action, price, balance in zip(sides, prices[fills].tolist(),
+                                                             result['balance'][fills].tolist())]
+        self.equity = result['balance'] + result['position'] * prices
+
+        # Close remaining position at the end of the backtest
+        self.balance = result['final_balance'] + result['final_position'] * prices[-1]
+        self.position = 0
+        return result
     
     def evaluate_performance(self):
         # Analyze trade log for performance metrics
@@ -46,19 +146,7 @@ class Backtester:
             print("[WARNING] No trades executed during backtest.")
             return {}
         
-        df['pnl'] = df['balance'].diff().fillna(0)
-        total_pnl = df['pnl'].sum()
-        win_rate = (df['pnl'] > 0).mean()
-        max_drawdown = (df['balance'].cummax() - df['balance']).max()
-        sharpe_ratio = df['pnl'].mean() / (df['pnl'].std() + 1e-8) * np.sqrt(252)
-        
-        results = {
-            'Total P&L': total_pnl,
-            'Win Rate': win_rate,
-            'Max Drawdown': max_drawdown,
-            'Sharpe Ratio': sharpe_ratio,
-            'Final Balance': self.balance
-        }
+        results = performance_metrics(df['balance'].to_numpy(), self.balance)
         
         print("[INFO] Backtest Results:")
         for k, v in results.items():
@@ -66,6 +154,29 @@ class Backtester:
         
         return results
     
+    # Monte Carlo confidence intervals for Sharpe, drawdown and final balance, resampling the
+    # per-bar equity returns (after run_vectorized) and the realized return per round trip
+    # (compounded, so a path's size follows its own earlier trades as the backtest's does).
+    # block_size > 1 resamples blocks of consecutive bars / trades instead of single ones.
+    def monte_carlo(self, paths: int = 10000, block_size: int = 1, confidence: float = 0.95,
+                    seed: int = 0, processes: int = None) -> dict:
+        results = {}
+        if self.equity is not None and len(self.equity) > 1:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                returns = np.diff(self.equity) / self.equity[:-1]
+            results['returns'] = monte_carlo(returns, paths, block_size, self.initial_balance, confidence,
+                                             seed, processes)
+        trips = round_trip_returns(self.trade_log, self.initial_balance, self.balance)
+        if len(trips) > 1:
+            results['pnl'] = monte_carlo(trips, paths, block_size, self.initial_balance, confidence,
+                                         seed, processes)
+        if not results:
+            print("[WARNING] Not enough bars or trades for Monte Carlo analysis.")
+        for kind, table in results.items():
+            print(f"[INFO] Monte Carlo ({paths} paths, {kind}, {confidence:.0%} intervals):")
+            print(table)
+        return results
+
     def plot_results(self):
         # Plot balance over time
         df = pd.DataFrame(self.trade_log)
@@ -0,0 +1,149 @@
+# cache.py
+import functools
+import glob
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from typing import Any, Optional
+import numpy as np
+import pandas as pd
+
+from config.config import BACKTEST_CACHE_PATH, BACKTEST_CACHE_MAX_BYTES
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Packages whose source decides a backtest's outcome: the data loaders and config defaults as well as the logic
+VERSIONED_PACKAGES = ('strategy', 'backtesting', 'data', 'config')
+
+
+@functools.lru_cache(maxsize=None)
+def code_version() -> str:
+    # Hash of the versioned packages' sources, so editing any of them invalidates every entry
+    digest = hashlib.sha256()
+    for package in VERSIONED_PACKAGES:
+        for filename in sorted(glob.glob(os.path.join(PACKAGE_ROOT, package, '*.py'))):
+            digest.update(os.path.basename(filename).encode())
+            with open(filename, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _feed(digest, value: Any):
+    # Hash a value by content: arrays and frames by their bytes, everything else as JSON
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        dtypes = value.dtypes if isinstance(value, pd.DataFrame) else pd.Series({value.name: value.dtype})
+        digest.update(json.dumps([[str(name), str(dtype)] for name, dtype in dtypes.items()]).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        value = np.ascontiguousarray(value)
+        digest.update(f'array{value.dtype.str}{value.shape}'.encode())
+        digest.update(value.astype(str).tobytes() if value.dtype.kind == 'O' else value.tobytes())
+    elif isinstance(value, (list, tuple)) and any(isinstance(v, (np.ndarray, pd.Series, pd.DataFrame)) for v in value):
+        for item in value:
+            _feed(digest, item)
+    else:
+        digest.update(json.dumps(value, sort_keys=True, default=str).encode())
+    digest.update(b'\0')
+
+
+class ResultCache:
+    # Content-addressed on-disk cache for backtest results. Entries are keyed by a sha256 of
+    # their inputs (price arrays, parameters) and the code version, one pickle file per key.
+    # Reads refresh the file's mtime, and once the directory grows past max_bytes the least
+    # recently used entries are deleted.
+    def __init__(self, path: str = BACKTEST_CACHE_PATH, max_bytes: int = BACKTEST_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._nbytes = None  # Running size estimate; the directory is rescanned only to evict
+        os.makedirs(path, exist_ok=True)
+
+    @staticmethod
+    def key(*parts: Any) -> str:
+        digest = hashlib.sha256(code_version().encode())
+        for part in parts:
+            _feed(digest, part)
+        return digest.hexdigest()
+
+    def _filename(self, key: str) -> str:
+        return os.path.join(self.path, f'{key}.pkl')
+
+    def get(self, key: str) -> Optional[Any]:
+        filename = self._filename(key)
+        try:
+            with open(filename, 'rb') as f:
+                value = pickle.load(f)
+            os.utime(filename)  # Mark as recently used
+        except (OSError, EOFError, pickle.UnpicklingError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any):
+        # Write to a temporary file first so readers never see a partial entry
+        handle, temporary = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            size = os.path.getsize(temporary)
+            filename = self._filename(key)
+            try:
+                replaced = os.path.getsize(filename)  # Overwriting an entry frees its old size
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(temporary, filename)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+        self._nbytes = self.nbytes if self._nbytes is None else self._nbytes + size - replaced
+        if self._nbytes > self.max_bytes:
+            self.evict()
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(self._filename(key))
+
+    def entries(self):
+        # (mtime, size, filename) for every entry, least recently used first
+        entries = []
+        for filename in glob.glob(os.path.join(self.path, '*.pkl')):
+            try:
+                stat = os.stat(filename)
+            except FileNotFoundError:
+                continue  # Evicted by another process
+            entries.append((stat.st_mtime, stat.st_size, filename))
+        return sorted(entries)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, filename in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(filename)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._nbytes = total
+
+    def clear(self):
+        for _, _, filename in self.entries():
+            os.unlink(filename)
+        self._nbytes = 0
+
+
+# Example Usage
+if __name__ == '__main__':
+    cache = ResultCache(tempfile.mkdtemp(), max_bytes=2 ** 20)
+    prices = np.random.uniform(1, 2, 1000)
+    key = cache.key(prices, {'buy_threshold': 0.3})
+    print(cache.get(key))
+    cache.put(key, {'Final Balance': 10250.0})
+    print(cache.get(key), cache.hits, cache.misses)
@@ -0,0 +1,227 @@
+# optimizer.py
+import hashlib
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+from config.config import STOP_LOSS, TAKE_PROFIT
+from strategy.strategy import TechnicalStrategy, INDICATOR_WEIGHTS
+from strategy.signal_matrix import score_votes
+from backtesting.backtester import performance_metrics
+from backtesting.vectorized import simulate, apply_exits
+from backtesting.cache import ResultCache
+
+# Tunable parameters; indicator weights are given as 'weights.<indicator>' (e.g. 'weights.rsi')
+DEFAULT_PARAMS = {
+    'buy_threshold': 1.0,
+    'sell_threshold': -1.0,
+    'stop_loss': STOP_LOSS,
+    'take_profit': TAKE_PROFIT,
+    'trade_size': 1.0,
+}
+
+
+# *Candidate generation*
+def grid(space: Dict[str, List[Any]]) -> Iterator[Dict[str, Any]]:
+    names = list(space)
+    for values in itertools.product(*(space[name] for name in names)):
+        yield dict(zip(names, values))
+
+
+# Lists are sampled from, (low, high) tuples are sampled uniformly
+def random_candidates(space: Dict[str, Any], count: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    rng = np.random.default_rng(seed)
+    for _ in range(count):
+        yield {name: (float(rng.uniform(*values)) if isinstance(values, tuple)
+                      else values[rng.integers(len(values))])
+               for name, values in space.items()}
+
+
+# *Evaluation of one candidate on bars [start, end)*
+def evaluate_candidate(prices: np.ndarray, votes: np.ndarray, params: Dict[str, Any], start: int = 0,
+                       end: Optional[int] = None, initial_balance: float = 10000) -> Dict[str, Any]:
+    params = {**DEFAULT_PARAMS, **params}
+    weights = dict(INDICATOR_WEIGHTS)
+    weights.update({name.split('.', 1)[1]: value for name, value in params.items() if name.startswith('weights.')})
+    prices, votes = prices[start:end], votes[start:end]
+    if not len(prices):  # Window outside the data: no bars, no trades
+        return {'Final Balance': float(initial_balance), 'Trades': 0}
+    actions = score_votes(votes, weights, params['buy_threshold'], params['sell_threshold'])['action']
+    codes, sizes = apply_exits(prices, actions, params['trade_size'], params['stop_loss'], params['take_profit'])
+    result = simulate(prices, codes, sizes, initial_balance)
+    final_balance = result['final_balance'] + result['final_position'] * prices[-1]
+    metrics = performance_metrics(result['balance'][result['fills']], final_balance)
+    return {**metrics, 'Final Balance': final_balance, 'Trades': int(result['fills'].sum())}
+
+
+# Identifies a result: the candidate (with the defaults it runs with, which follow config), its
+# bar range and the data / balance it was run on
+def task_key(params: Dict[str, Any], start: int, end: Optional[int], dataset: str = '') -> str:
+    payload = json.dumps({'params': {**DEFAULT_PARAMS, **params}, 'start': start, 'end': end, 'dataset': dataset},
+                         sort_keys=True, default=float)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+# *Worker side: price and vote arrays are attached from shared memory once per process*
+_SHARED: Dict[str, np.ndarray] = {}
+
+
+def _attach(blocks: Dict[str, Tuple[str, tuple, str]], initial_balance: float):
+    for name, (shm_name, shape, dtype) in blocks.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _SHARED[name] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        _SHARED[f'_{name}_shm'] = shm
+    _SHARED['initial_balance'] = initial_balance
+
+
+def _run_task(task: Dict[str, Any]) -> Dict[str, Any]:
+    metrics = evaluate_candidate(_SHARED['prices'], _SHARED['votes'], task['params'], task['start'],
+                                 task['end'], _SHARED['initial_balance'])
+    return {**task, **metrics}
+
+
+class Optimizer:
+    # Grid / random sweeps and walk-forward analysis on top of the vectorized backtest.
+    # The strategy's vote matrix is computed once; every candidate only re-scores it with
+    # its own weights and thresholds. Results are appended to `results_path` (JSON lines)
+    # as they complete, and tasks already in that file are skipped, so interrupted runs resume.
+    # With a ResultCache, tasks evaluated by any earlier run (same data and code) are reused.
+    def __init__(self, data: pd.DataFrame, results_path: str = None, processes: int = None,
+                 initial_balance: float = 10000, market_returns: pd.Series = None,
+                 cache: ResultCache = None):
+        matrix = TechnicalStrategy().signal_matrix(data, market_returns)
+        self.prices = data['close'].to_numpy(dtype=float)
+        self.votes = matrix['votes']
+        self.results_path = results_path
+        self.processes = processes
+        self.initial_balance = initial_balance
+        self.cache = cache
+        digest = hashlib.sha256(self.prices.tobytes())
+        digest.update(self.votes.tobytes())
+        digest.update(str(initial_balance).encode())
+        self.dataset = digest.hexdigest()[:16]
+
+    def _completed(self) -> Dict[str, Dict[str, Any]]:
+        if not self.results_path or not os.path.exists(self.results_path):
+            return {}
+        done = {}
+        with open(self.results_path) as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Partially written last line from an interrupted run
+                done[row['key']] = row
+        return done
+
+    # Run tasks (params + bar range) on the process pool, streaming results to disk
+    def _run(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        done = self._completed()
+        for task in tasks:
+            task['key'] = task_key(task['params'], task['start'], task['end'], self.dataset)
+        pending = list({task['key']: task for task in tasks if task['key'] not in done}.values())
+        if len(pending) < len(tasks):
+            print(f"[INFO] Resuming: {len(tasks) - len(pending)} of {len(tasks)} tasks already completed.")
+
+        cached = {}
+        if self.cache is not None:
+            for task in pending:
+                metrics = self.cache.get(self.cache.key(task['key']))
+                if metrics is not None:
+                    cached[task['key']] = {**task, **metrics}
+            pending = [task for task in pending if task['key'] not in cached]
+        tasks_by_key = {task['key']: task for task in pending}
+
+        output = open(self.results_path, 'a') if self.results_path else None
+        try:
+            for row in itertools.chain(cached.values(), self._execute(pending)):
+                if self.cache is not None and row['key'] not in cached:
+                    # Only the metrics are cached; task fields (phase, window, ...) vary per run
+                    self.cache.put(self.cache.key(row['key']),
+                                   {name: value for name, value in row.items() if name not in tasks_by_key[row['key']]})
+                done[row['key']] = row
+                if output:
+                    output.write(json.dumps(row, default=float) + '\n')
+                    output.flush()
+        finally:
+            if output:
+                output.close()
+        return [{**done[task['key']], **task} for task in tasks]
+
+    def _execute(self, tasks: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        if not tasks:
+            return
+        if self.processes == 0:
+            _attach({}, self.initial_balance)
+            _SHARED.update(prices=self.prices, votes=self.votes)
+            yield from map(_run_task, tasks)
+            return
+
+        blocks, segments = {}, []
+        try:
+            for name, array in (('prices', self.prices), ('votes', self.votes)):
+                shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                segments.append(shm)
+                np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+                blocks[name] = (shm.name, array.shape, array.dtype.str)
+            with ProcessPoolExecutor(self.processes, initializer=_attach,
+                                     initargs=(blocks, self.initial_balance)) as pool:
+                futures = [pool.submit(_run_task, task) for task in tasks]
+                for future in as_completed(futures):
+                    yield future.result()
+        finally:
+            for shm in segments:
+                shm.close()
+                shm.unlink()
+
+    # Every candidate on bars [start, end), ranked by `metric` (best first)
+    def sweep(self, candidates: Iterable[Dict[str, Any]], start: int = 0, end: int = None,
+              metric: str = 'Sharpe Ratio') -> pd.DataFrame:
+        tasks = [{'params': dict(params), 'start': start, 'end': end, 'phase': 'sweep'} for params in candidates]
+        return ranked(self._run(tasks), metric)
+
+    # Optimise on each training window, then score the winner on the following test window
+    def walk_forward(self, candidates: Iterable[Dict[str, Any]], train_size: int, test_size: int,
+                     step: int = None, metric: str = 'Sharpe Ratio') -> pd.DataFrame:
+        candidates = [dict(params) for params in candidates]
+        step = step or test_size
+        windows = [(start, start + train_size, start + train_size + test_size)
+                   for start in range(0, len(self.prices) - train_size - test_size + 1, step)]
+        train = self._run([{'params': params, 'start': start, 'end': split, 'phase': 'train', 'window': window}
+                           for window, (start, split, _) in enumerate(windows) for params in candidates])
+
+        tests = []
+        for window, (start, split, stop) in enumerate(windows):
+            best = ranked([row for row in train if row['window'] == window], metric).iloc[0]
+            tests.append({'params': best['params'], 'start': split, 'end': stop, 'phase': 'test',
+                          'window': window, 'train ' + metric: best[metric]})
+        return pd.DataFrame(self._run(tests)).drop(columns=['key'])
+
+
+def ranked(rows: List[Dict[str, Any]], metric: str = 'Sharpe Ratio') -> pd.DataFrame:
+    table = pd.DataFrame(rows)
+    if table.empty:
+        return table
+    params = pd.DataFrame(list(table['params']), index=table.index)
+    table = pd.concat([params, table.drop(columns=params.columns, errors='ignore')], axis=1)
+    if metric not in table:  # No candidate traded
+        table[metric] = np.nan
+    table = table.sort_values(metric, ascending=False, na_position='last', kind='stable')
+    return table.drop(columns=['key'], errors='ignore').reset_index(drop=True)
+
+
+# Example Usage
+if __name__ == '__main__':
+    rng = np.random.default_rng(0)
+    close = 1 + np.abs(np.cumsum(rng.normal(0, 0.02, 1000)))
+    data = pd.DataFrame({'open': close, 'high': close * 1.01, 'low': close * 0.99, 'close': close,
+                         'volume': rng.uniform(1000, 5000, 1000)})
+    optimizer = Optimizer(data, processes=2)
+    space = {'buy_threshold': [0.2, 0.4], 'sell_threshold': [-0.2, -0.4], 'stop_loss': [0.05, 0.1]}
+    print(optimizer.sweep(grid(space)).head())
+    print(optimizer.walk_forward(grid(space), train_size=400, test_size=200))
@@ -0,0 +1,110 @@
+# out_of_core.py
+from typing import Any, Dict
+import numpy as np
+import pandas as pd
+
+from strategy.strategy import INDICATOR_WEIGHTS
+from strategy.signal_matrix import signal_matrix, LOOKBACK
+from data.columnar import ColumnarFile
+from backtesting.vectorized import simulate
+
+FIELDS = ['open', 'high', 'low', 'close', 'volume']
+
+
+class StreamingMetrics:
+    # performance_metrics accumulated trade by trade across chunks (no balance history kept).
+    # P&L mean / variance are merged per chunk with Chan's parallel update.
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.total = 0.0
+        self.wins = 0
+        self.peak = -np.inf
+        self.max_drawdown = 0.0
+        self.last_balance = None
+
+    def update(self, balances: np.ndarray):
+        if not len(balances):
+            return
+        previous = balances[0] if self.last_balance is None else self.last_balance
+        pnl = np.diff(balances, prepend=previous)
+        count, mean = len(pnl), pnl.mean()
+        m2 = ((pnl - mean) ** 2).sum()
+        delta = mean - self.mean
+        total_count = self.count + count
+        self.m2 += m2 + delta * delta * self.count * count / total_count
+        self.mean += delta * count / total_count
+        self.count = total_count
+        self.total += pnl.sum()
+        self.wins += int((pnl > 0).sum())
+        peaks = np.maximum(np.maximum.accumulate(balances), self.peak)
+        self.max_drawdown = max(self.max_drawdown, (peaks - balances).max())
+        self.peak = peaks[-1]
+        self.last_balance = balances[-1]
+
+    def results(self, final_balance: float) -> Dict[str, float]:
+        if not self.count:
+            return {}
+        std = np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan
+        return {
+            'Total P&L': self.total,
+            'Win Rate': self.wins / self.count,
+            'Max Drawdown': self.max_drawdown,
+            'Sharpe Ratio': self.mean / (std + 1e-8) * np.sqrt(252),
+            'Final Balance': final_balance
+        }
+
+
+class OutOfCoreBacktester:
+    # Backtester over a ColumnarFile history that is read in fixed-size windows instead of
+    # loaded as a DataFrame. Each window is evaluated with LOOKBACK bars of overlap for the
+    # rolling indicators; EMA and running-extreme state, balance and position carry over
+    # from the previous window, so results match an in-memory run while memory stays
+    # bounded by the window size.
+    def __init__(self, path: str, chunk_size: int = 100_000):
+        if chunk_size <= LOOKBACK:
+            raise ValueError(f"Chunk size must exceed the {LOOKBACK}-bar indicator lookback")
+        self.history = ColumnarFile(path)
+        self.chunk_size = chunk_size
+        self.weights = dict(INDICATOR_WEIGHTS)
+        self.initial_balance = 10000  # Starting balance in USD
+        self.balance = self.initial_balance
+        self.position = 0  # Current position (number of coins)
+        self.trade_size = 1.0  # Fraction of balance / position traded per signal
+        self.buy_threshold = 1.0  # combined_strategy decision thresholds
+        self.sell_threshold = -1.0
+        self.trades = 0
+        self.chunk_equity = []  # Equity at the end of each window
+        self.metrics = StreamingMetrics()
+
+    def run(self) -> Dict[str, Any]:
+        state, last_close = {}, np.nan
+        for first, start, stop, bars in self.history.windows(self.chunk_size, LOOKBACK, FIELDS):
+            # The next window starts LOOKBACK bars before this one ends; carry state from the bar before it
+            carry_index = stop - LOOKBACK - 1 - first if stop < len(self.history) else None
+            matrix = signal_matrix(pd.DataFrame(bars, copy=False), self.weights, self.buy_threshold,
+                                   self.sell_threshold, tail=stop - start, state=state, carry_index=carry_index)
+            state = matrix['state']
+            prices = bars['close'][start - first:]
+            result = simulate(prices, matrix['action'], self.trade_size, self.balance, self.position)
+            self.metrics.update(result['balance'][result['fills']])
+            self.trades += int(result['fills'].sum())
+            self.balance, self.position = result['final_balance'], result['final_position']
+            last_close = prices[-1]
+            self.chunk_equity.append(self.balance + self.position * last_close)
+
+        # Close remaining position at the end of the backtest
+        self.balance += self.position * last_close
+        self.position = 0
+        return {'final_balance': self.balance, 'trades': self.trades}
+
+    def evaluate_performance(self) -> Dict[str, float]:
+        results = self.metrics.results(self.balance)
+        if not results:
+            print("[WARNING] No trades executed during backtest.")
+            return {}
+        print("[INFO] Backtest Results:")
+        for k, v in results.items():
+            print(f"{k}: {v}")
+        return results
@@ -0,0 +1,127 @@
+# portfolio_backtester.py
+from typing import Any, Dict
+import numpy as np
+import pandas as pd
+
+from config.config import MAX_PORTFOLIO_EXPOSURE, RESERVE_BALANCE
+from strategy.strategy import TechnicalStrategy
+from strategy.panel import OHLCVPanel
+from backtesting.vectorized import action_codes
+
+
+def forward_fill(values: np.ndarray) -> np.ndarray:
+    # Carry the last non-NaN value down each column (leading NaNs stay NaN)
+    rows = np.where(np.isnan(values), -1, np.arange(len(values))[:, None])
+    last = np.maximum.accumulate(rows, axis=0)
+    filled = np.take_along_axis(values, np.maximum(last, 0), axis=0)
+    filled[last < 0] = np.nan
+    return filled
+
+
+# Long/flat target weight per bar and pair. A pair is held from a buy signal until the
+# next sell signal. Each held pair gets MAX_PORTFOLIO_EXPOSURE of equity, scaled down
+# equally when the held pairs together would eat into the RESERVE_BALANCE cash buffer.
+def target_weights(codes: np.ndarray, tradable: np.ndarray, max_exposure: float = MAX_PORTFOLIO_EXPOSURE,
+                   reserve: float = RESERVE_BALANCE) -> np.ndarray:
+    signals = np.where(tradable, codes, 0)
+    rows = np.where(signals != 0, np.arange(len(signals))[:, None], -1)
+    last = np.maximum.accumulate(rows, axis=0)
+    # Positions are kept through bars a pair has no price for (they earn no return there)
+    held = (np.take_along_axis(signals, np.maximum(last, 0), axis=0) == 1) & (last >= 0)
+    count = held.sum(axis=1, keepdims=True)
+    per_pair = np.minimum(max_exposure, (1 - reserve) / np.maximum(count, 1))
+    return np.where(held, per_pair, 0.0)
+
+
+# Shared-capital simulation over bars x pairs arrays. Weights set at a bar's close earn
+# the next bar's return, and holdings are rebalanced to their targets every bar.
+# Missing prices are carried forward (no return, no new trades).
+def simulate_portfolio(prices: np.ndarray, weights: np.ndarray, initial_balance: float) -> Dict[str, np.ndarray]:
+    filled = forward_fill(np.asarray(prices, dtype=float))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = np.nan_to_num(filled[1:] / filled[:-1] - 1, nan=0.0, posinf=0.0, neginf=0.0)
+    contribution = weights[:-1] * returns
+    growth = np.cumprod(1 + contribution.sum(axis=1))
+    equity = initial_balance * np.concatenate(([1.0], growth))
+    pair_pnl = np.zeros_like(weights)
+    pair_pnl[1:] = np.cumsum(equity[:-1, None] * contribution, axis=0)
+    holdings = weights * equity[:, None]
+    return {
+        'equity': equity,
+        'cash': equity - holdings.sum(axis=1),
+        'holdings': holdings,
+        'pair_pnl': pair_pnl,
+        'weights': weights,
+        'entries': np.diff(weights > 0, axis=0, prepend=False) & (weights > 0),
+    }
+
+
+class PortfolioBacktester:
+    # Several pairs against one cash balance: histories are aligned on their common time
+    # index (OHLCVPanel), the strategy is evaluated for all pairs in one vectorized pass,
+    # and portfolio / per-pair equity curves come out of one shared-capital simulation.
+    def __init__(self, frames: Dict[str, pd.DataFrame], time_column: str = 'timestamp',
+                 initial_balance: float = 10000, max_exposure: float = MAX_PORTFOLIO_EXPOSURE,
+                 reserve: float = RESERVE_BALANCE):
+        self.panel = OHLCVPanel.from_frames(frames, time_column)
+        self.strategy = TechnicalStrategy()
+        self.initial_balance = initial_balance
+        self.max_exposure = max_exposure
+        self.reserve = reserve
+        self.buy_threshold = 1.0  # combined_strategy decision thresholds
+        self.sell_threshold = -1.0
+        self.equity = None  # Total equity per bar
+        self.pair_equity = None  # Cumulative P&L per bar and pair
+        self.result = None
+
+    # Per-bar, per-pair actions from one panel signal_matrix pass
+    def decisions(self) -> np.ndarray:
+        return self.strategy.signal_matrix(self.panel.frames(), buy_threshold=self.buy_threshold,
+                                           sell_threshold=self.sell_threshold)['action']
+
+    def run(self, actions=None) -> Dict[str, Any]:
+        if actions is None:
+            actions = self.decisions()
+        prices = self.panel.fields['close']
+        weights = target_weights(action_codes(actions), ~np.isnan(prices), self.max_exposure, self.reserve)
+        self.result = simulate_portfolio(prices, weights, self.initial_balance)
+        self.equity = pd.Series(self.result['equity'], index=self.panel.index, name='equity')
+        self.pair_equity = pd.DataFrame(self.result['pair_pnl'], index=self.panel.index,
+                                        columns=self.panel.pairs, copy=False)
+        return self.result
+
+    def evaluate_performance(self) -> Dict[str, Any]:
+        if self.result is None:
+            print("[WARNING] Run the portfolio backtest first.")
+            return {}
+        equity = self.result['equity']
+        returns = np.diff(equity) / equity[:-1]
+        results = {
+            'Total P&L': equity[-1] - equity[0],
+            'Max Drawdown': (np.maximum.accumulate(equity) - equity).max(),
+            'Sharpe Ratio': returns.mean() / (returns.std(ddof=1) + 1e-8) * np.sqrt(252),
+            'Trades': int(self.result['entries'].sum()),
+            'Final Balance': equity[-1],
+            'Pair P&L': dict(zip(self.panel.pairs, self.result['pair_pnl'][-1].tolist())),
+        }
+        print("[INFO] Portfolio Backtest Results:")
+        for k, v in results.items():
+            print(f"{k}: {v}")
+        return results
+
+
+# Example Usage
+if __name__ == '__main__':
+    rng = np.random.default_rng(0)
+    frames = {}
+    for pair in ('ADAUSD', 'LTCUSD', 'DOTUSD'):
+        close = 1 + np.abs(np.cumsum(rng.normal(0, 0.02, 500)))
+        frames[pair] = pd.DataFrame({
+            'timestamp': pd.date_range(start='2022-01-01', periods=500, freq='D'),
+            'open': close, 'high': close * 1.01, 'low': close * 0.99, 'close': close,
+            'volume': rng.uniform(1000, 5000, 500)
+        })
+    backtester = PortfolioBacktester(frames)
+    backtester.buy_threshold, backtester.sell_threshold = 0.3, -0.3
+    backtester.run()
+    backtester.evaluate_performance()
@@ -0,0 +1,159 @@
+# vectorized.py
+from typing import Any, Dict
+import numpy as np
+
+# Account state before a bar: bit 0 = balance > 0, bit 1 = position > 0.
+# Buys only fill when the balance is positive and sells only when the position is,
+# so these two flags decide which signals turn into trades.
+CASH, COIN = 1, 2
+STATES = np.arange(4)
+
+
+def action_codes(actions) -> np.ndarray:
+    # 'buy' / 'sell' / anything else -> 1 / -1 / 0 (numeric codes pass through)
+    actions = np.asarray(actions)
+    if actions.dtype.kind in 'UOS':
+        return np.select([actions == 'buy', actions == 'sell'], [1, -1], 0).astype(np.int8)
+    return np.sign(actions).astype(np.int8)
+
+
+def account_state(balance: float, position: float) -> int:
+    return (CASH if balance > 0 else 0) | (COIN if position > 0 else 0)
+
+
+# A map from the 4 states to the 4 states is packed into one byte (2 bits per state),
+# so composing two per-bar maps is a single lookup in COMPOSE[later, earlier].
+def _pack(maps: np.ndarray) -> np.ndarray:
+    return (maps << (2 * STATES)).sum(axis=-1).astype(np.uint8)
+
+
+def _unpack(codes: np.ndarray) -> np.ndarray:
+    return (codes[..., None].astype(np.int64) >> (2 * STATES)) & 3
+
+
+_ALL_MAPS = _unpack(np.arange(256))
+COMPOSE = _pack(np.take_along_axis(_ALL_MAPS[:, None, :], _ALL_MAPS[None, :, :], axis=2))
+
+
+# Map from the state before a bar to the state after it, for every action code (-1, 0, 1)
+# and size class (size <= 0, 0 < size < 1, size >= 1), packed as in _pack
+def _transition_table() -> np.ndarray:
+    cash = (STATES & CASH).astype(bool)
+    coin = (STATES & COIN).astype(bool)
+    table = np.zeros((3, 3), dtype=np.uint8)
+    for code in (-1, 0, 1):
+        for size_class, (traded, keeps_rest) in enumerate(((False, True), (True, True), (True, False))):
+            buy, sell = (code == 1) & cash, (code == -1) & coin
+            new_cash = np.where(buy, keeps_rest, np.where(sell, cash | traded, cash))
+            new_coin = np.where(buy, coin | traded, np.where(sell, keeps_rest, coin))
+            table[code + 1, size_class] = _pack(new_cash * CASH | new_coin * COIN)
+    return table
+
+
+TRANSITIONS = _transition_table()
+IDENTITY = _pack(STATES)
+
+
+def _state_transitions(codes: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+    size_class = (sizes > 0).view(np.int8) + (sizes >= 1).view(np.int8)
+    return TRANSITIONS[codes + 1, size_class]
+
+
+# Inclusive prefix composition of per-bar maps by recursive doubling (log2(n) steps):
+# out[i] = maps[i] o maps[i - 1] o ... o maps[0]
+def _compose_scan(maps: np.ndarray) -> np.ndarray:
+    out = maps.copy()
+    step = 1
+    while step < len(out):
+        out[step:] = COMPOSE[out[step:], out[:-step]]
+        step *= 2
+    return out
+
+
+# Inclusive prefix product of 2x2 matrices given as their four entry arrays, by recursive
+# doubling: out[i] = matrices[i] @ matrices[i - 1] @ ... @ matrices[0]
+def _product_scan(a: np.ndarray, b: np.ndarray, c: np.ndarray, d: np.ndarray):
+    a, b, c, d = a.copy(), b.copy(), c.copy(), d.copy()
+    step = 1
+    while step < len(a):
+        la, lb, lc, ld = a[step:], b[step:], c[step:], d[step:]
+        ea, eb, ec, ed = a[:-step], b[:-step], c[:-step], d[:-step]
+        a[step:], b[step:], c[step:], d[step:] = (la * ea + lb * ec, la * eb + lb * ed,
+                                                  lc * ea + ld * ec, lc * eb + ld * ed)
+        step *= 2
+    return a, b, c, d
+
+
+# Vectorized equivalent of Backtester.run's bar loop. Pure function of the inputs and
+# the starting balance/position, so long histories can be simulated chunk by chunk by
+# feeding one chunk's final state into the next.
+#   buy  (balance > 0):  position += balance * size / price; balance -= balance * size
+#   sell (position > 0): balance += position * price * size; position -= position * size
+# Sizes are fractions in [0, 1]. Results match the loop up to floating-point rounding.
+def simulate(prices, actions, sizes, balance: float, position: float = 0.0) -> Dict[str, Any]:
+    prices = np.asarray(prices, dtype=float)
+    codes = action_codes(actions)
+    sizes = np.broadcast_to(np.asarray(sizes, dtype=float), prices.shape)
+    n = len(prices)
+    start = account_state(balance, position)
+    if n == 0:
+        empty = np.zeros(0)
+        return {'balance': empty, 'position': empty, 'fills': np.zeros(0, dtype=bool),
+                'final_balance': balance, 'final_position': position}
+
+    # Which signals fill follows from the state before each bar
+    # (holds and other identity maps cannot change the state, so only the rest are scanned)
+    transitions = _state_transitions(codes, sizes)
+    changed = transitions != IDENTITY
+    after = np.concatenate(([start], (_compose_scan(transitions[changed]) >> (2 * start)) & 3))
+    before = after[np.cumsum(changed) - changed]
+    buys = (codes == 1) & (before & CASH).astype(bool)
+    sells = (codes == -1) & (before & COIN).astype(bool)
+
+    # Each fill is a linear map [[a, b], [c, d]] on (balance, position); bars without a
+    # fill are the identity, so only the fills need to be scanned
+    fills = np.flatnonzero(buys | sells)
+    fill_sizes, fill_prices, fill_buys = sizes[fills], prices[fills], buys[fills]
+    a = np.where(fill_buys, 1.0 - fill_sizes, 1.0)
+    b = np.where(fill_buys, 0.0, fill_prices * fill_sizes)
+    c = np.where(fill_buys, fill_sizes / fill_prices, 0.0)
+    d = np.where(fill_buys, 1.0, 1.0 - fill_sizes)
+    a, b, c, d = _product_scan(a, b, c, d)
+    fill_balance = np.concatenate(([balance], a * balance + b * position))
+    fill_position = np.concatenate(([position], c * balance + d * position))
+
+    # Carry each fill's account forward to the bars up to the next fill
+    latest = np.cumsum(buys | sells)
+    return {
+        'balance': fill_balance[latest],
+        'position': fill_position[latest],
+        'fills': buys | sells,
+        'final_balance': float(fill_balance[-1]),
+        'final_position': float(fill_position[-1]),
+    }
+
+
+# Force a full exit once the close moves stop_loss below or take_profit above the price of
+# the buy that opened the current position (0 / None disables either side). Tracks the
+# same balance/position flags as simulate, in one pass over the bars.
+def apply_exits(prices, actions, sizes, stop_loss: float = None, take_profit: float = None,
+                balance: float = 1.0, position: float = 0.0):
+    codes = action_codes(actions).copy()
+    sizes = np.array(np.broadcast_to(np.asarray(sizes, dtype=float), codes.shape))
+    if not stop_loss and not take_profit:
+        return codes, sizes
+    floor = 1 - stop_loss if stop_loss else -np.inf
+    ceiling = 1 + take_profit if take_profit else np.inf
+    cash, coin = balance > 0, position > 0
+    entry = np.nan  # A position carried in has no known entry price and is left alone
+    for i, (price, code, size) in enumerate(zip(np.asarray(prices, dtype=float).tolist(),
+                                                codes.tolist(), sizes.tolist())):
+        if coin and (price <= entry * floor or price >= entry * ceiling):
+            codes[i], sizes[i] = code, size = -1, 1.0
+        if code == 1 and cash:
+            if size > 0 and not coin:
+                entry = price
+            cash, coin = size < 1, coin or size > 0
+        elif code == -1 and coin:
+            cash, coin = cash or size > 0, size < 1
+    return codes, sizes
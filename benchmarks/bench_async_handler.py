@@ -0,0 +1,61 @@
+# bench_async_handler.py
+# One bot cycle over 50 pairs (OHLC sync, ticker and an order per pair) against a local
+# stand-in server adding 50 ms per request: blocking handler/executor one request at a
+# time vs. the asyncio handler/executor with every request overlapping on one loop.
+# Run from the repository root: python -m benchmarks.bench_async_handler
+import asyncio
+import contextlib
+import os
+import tempfile
+import time
+from data.ohlc_store import OHLCStore
+from execution.async_data_handler import AsyncKrakenDataHandler
+from execution.async_kraken_client import AsyncKrakenClient
+from execution.async_trade_executor import AsyncTradeExecutor
+from execution.data_handler import KrakenDataHandler
+from execution.kraken_client import KrakenClient
+from execution.market_cache import MarketDataCache
+from execution.trade_executor import TradeExecutor
+from tests.test_kraken_client import LocalKraken
+
+PAIRS = [f'PAIR{i:02d}USD' for i in range(50)]
+LATENCY = 0.05
+
+
+def blocking_cycle(handler: KrakenDataHandler, executor: TradeExecutor):
+    for pair in PAIRS:
+        handler.get_ohlc(pair)
+        handler.get_ticker(pair)
+        executor.place_market_order(pair, 1.0, 'buy')
+
+
+async def async_cycle(handler: AsyncKrakenDataHandler, executor: AsyncTradeExecutor):
+    async def trade(pair: str):
+        await asyncio.gather(handler.get_ohlc(pair), handler.get_ticker(pair))
+        await executor.place_market_order(pair, 1.0, 'buy')
+    await asyncio.gather(*(trade(pair) for pair in PAIRS))
+
+
+async def run_async(client: KrakenClient, directory: str) -> float:
+    async with AsyncKrakenClient(client, pool_size=len(PAIRS)) as session:
+        handler = AsyncKrakenDataHandler(OHLCStore(directory), MarketDataCache({}), session)
+        executor = AsyncTradeExecutor(MarketDataCache({}), session)
+        start = time.perf_counter()
+        await async_cycle(handler, executor)
+        return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    with LocalKraken(latency=LATENCY) as kraken, tempfile.TemporaryDirectory() as directory:
+        client = KrakenClient('key', 'c2VjcmV0')
+        client.uri = kraken.uri
+        handler = KrakenDataHandler(OHLCStore(os.path.join(directory, 'blocking')), MarketDataCache({}), client)
+        executor = TradeExecutor(MarketDataCache({}), client)
+        with open(os.devnull, 'w') as quiet:
+            with contextlib.redirect_stdout(quiet):  # Order logs
+                start = time.perf_counter()
+                blocking_cycle(handler, executor)
+                blocking = time.perf_counter() - start
+                overlapped = asyncio.run(run_async(client, os.path.join(directory, 'async')))
+        print(f"[INFO] {len(PAIRS)}-pair cycle ({3 * len(PAIRS)} requests, {LATENCY * 1000:.0f} ms each): "
+              f"blocking {blocking * 1000:.0f} ms, asyncio {overlapped * 1000:.0f} ms ({blocking / overlapped:.0f}x)")
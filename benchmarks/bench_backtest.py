@@ -0,0 +1,35 @@
+# bench_backtest.py
+# Backtester.run (iterrows loop) vs. Backtester.run_vectorized on the bundled datasets,
+# with the same per-bar decisions fed to both.
+# Run from the repository root: python -m benchmarks.bench_backtest
+import time
+import pandas as pd
+from backtesting.backtester import Backtester
+from tests.test_vectorized_backtest import load_dataset
+
+
+def timed(backtester: Backtester, method: str, actions, sizes) -> float:
+    start = time.perf_counter()
+    getattr(backtester, method)(actions, sizes)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    ada = load_dataset('ADAUSD')
+    # Ten back-to-back copies of the ADA history for a longer run
+    long_history = pd.concat([ada] * 10, ignore_index=True)
+    long_history['timestamp'] = pd.date_range('1990-01-01', periods=len(long_history), freq='D')
+    for pair, data in (('ADAUSD', ada), ('LTCUSD', load_dataset('LTCUSD')), ('ADAUSD x10', long_history)):
+        reference = Backtester(data)
+        reference.buy_threshold, reference.sell_threshold, reference.trade_size = 0.3, -0.3, 0.5
+        actions, sizes = reference.decisions()
+
+        loop, vectorized = Backtester(data), Backtester(data)
+        loop_time = min(timed(Backtester(data), 'run', actions, sizes) for _ in range(3))
+        loop.run(actions, sizes)
+        vectorized_time = min(timed(Backtester(data), 'run_vectorized', actions, sizes) for _ in range(20))
+        vectorized.run_vectorized(actions, sizes)
+        print(f"[INFO] {pair}: {len(data)} bars, {len(loop.trade_log)} trades, "
+              f"final balance {loop.balance:.6f} (loop) vs {vectorized.balance:.6f} (vectorized)")
+        print(f"[INFO] {pair}: loop {loop_time * 1000:.1f} ms, vectorized {vectorized_time * 1000:.2f} ms "
+              f"({loop_time / vectorized_time:.0f}x)")
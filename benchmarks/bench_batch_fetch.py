@@ -0,0 +1,44 @@
+# bench_batch_fetch.py
+# Market data for a 50-pair cycle over a simulated 50 ms round-trip: one Ticker request
+# per pair vs. one batched request, and OHLC synced pair by pair vs. concurrently.
+# (The old loop also slept API_CALL_DELAY after every pair, i.e. 50 s per cycle on top.)
+# Run from the repository root: python -m benchmarks.bench_batch_fetch
+import tempfile
+import time
+from data.ohlc_store import OHLCStore
+from execution.data_handler import KrakenDataHandler
+from execution.kraken_client import KrakenClient
+from execution.market_cache import MarketDataCache
+from tests.test_batch_fetch import OHLCServer, ticker
+
+PAIRS = [f'PAIR{i:02d}USD' for i in range(50)]
+LATENCY = 0.05
+
+
+def slow_ticker_query(method, data=None):
+    time.sleep(LATENCY)
+    return {'error': [], 'result': {pair: ticker(1.0) for pair in data['pair'].split(',')}}
+
+
+def timed(function) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    handler = KrakenDataHandler(cache=MarketDataCache({'Ticker': 0}), client=KrakenClient())
+    handler.api.query_public = slow_ticker_query
+    one_by_one = timed(lambda: [handler.get_ticker(pair) for pair in PAIRS])
+    batched = timed(lambda: handler.get_tickers(PAIRS))
+    print(f"[INFO] Ticker for {len(PAIRS)} pairs: one request per pair {one_by_one * 1000:.0f} ms, "
+          f"batched {batched * 1000:.0f} ms ({one_by_one / batched:.0f}x)")
+
+    results = {}
+    for label, workers in (('sequential', 1), ('concurrent', 8), ('concurrent', 50)):
+        with tempfile.TemporaryDirectory() as directory:
+            handler = KrakenDataHandler(OHLCStore(directory), MarketDataCache({'OHLC': 0}), KrakenClient())
+            handler.api.session = OHLCServer(LATENCY)
+            results[f'{label} ({workers} workers)'] = timed(lambda: handler.get_ohlc_many(PAIRS, 60, workers=workers))
+    print(f"[INFO] OHLC for {len(PAIRS)} pairs: " +
+          ", ".join(f"{label} {seconds * 1000:.0f} ms" for label, seconds in results.items()))
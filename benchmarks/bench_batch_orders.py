@@ -0,0 +1,48 @@
+# bench_batch_orders.py
+# Closing a book of 24 positions (4 lots in each of 6 pairs) through a KrakenClient against
+# the local HTTP stand-in answering every call in 50 ms: one place_market_order after
+# another (the previous RiskManager.monitor_positions loop) vs. TradeExecutor.place_batch
+# (one AddOrderBatch per pair). The client sends private calls one at a time, so the gain
+# is the number of calls. Reports when the last order was confirmed.
+# Run from the repository root: python -m benchmarks.bench_batch_orders
+import contextlib
+import os
+import time
+from execution.kraken_client import KrakenClient
+from execution.market_cache import MarketDataCache
+from execution.trade_executor import TradeExecutor
+from tests.test_batch_orders import order
+from tests.test_kraken_client import LocalKraken
+
+PAIRS = ['ADAUSD', 'LTCUSD', 'DOTUSD', 'XRPUSD', 'SOLUSD', 'ETHUSD']
+LOTS = 4
+LATENCY = 0.05
+
+
+def book():
+    return [order(pair, float(lot + 1)) for pair in PAIRS for lot in range(LOTS)]
+
+
+def close(batched: bool) -> tuple:
+    with LocalKraken(latency=LATENCY, batches=True) as kraken:
+        client = KrakenClient('key', 'c2VjcmV0')
+        client.uri = kraken.uri
+        executor = TradeExecutor(MarketDataCache({}), client)
+        start = time.perf_counter()
+        if batched:
+            assert all(executor.place_batch(book()))
+        else:
+            for entry in book():
+                executor.place_market_order(entry['pair'], entry['volume'], 'sell')
+        elapsed = time.perf_counter() - start
+        executor.pipeline.shutdown()
+        return elapsed, client.requests['AddOrder'] + client.requests['AddOrderBatch']
+
+
+if __name__ == '__main__':
+    with open(os.devnull, 'w') as quiet:
+        with contextlib.redirect_stdout(quiet):  # Order logs
+            sequential, sequential_calls = close(batched=False)
+            grouped, grouped_calls = close(batched=True)
+    print(f"[INFO] Closing {len(PAIRS) * LOTS} positions: one by one {sequential * 1000:.0f} ms ({sequential_calls} order calls), "
+          f"place_batch {grouped * 1000:.0f} ms ({grouped_calls} order calls, {sequential / grouped:.0f}x)")
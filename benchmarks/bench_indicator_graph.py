@@ -0,0 +1,45 @@
+# bench_indicator_graph.py
+# Duplicate work removed by the shared indicator graph in combined_strategy.
+# Run from the repository root: python -m benchmarks.bench_indicator_graph
+import time
+import numpy as np
+import pandas as pd
+from strategy.strategy import TechnicalStrategy
+from strategy.indicator_graph import IndicatorGraph
+
+
+def make_frame(n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(42)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    return pd.DataFrame({
+        'open': close + rng.normal(0, 0.5, n),
+        'high': close + rng.uniform(0.5, 1.5, n),
+        'low': close - rng.uniform(0.5, 1.5, n),
+        'close': close,
+        'volume': rng.uniform(1000, 5000, n),
+    })
+
+
+def evaluate(data: pd.DataFrame, memoize: bool, repeats: int):
+    elapsed = []
+    for _ in range(repeats):
+        strategy = TechnicalStrategy()
+        strategy.data = data.copy()
+        strategy._graph = IndicatorGraph(strategy.data, memoize=memoize)
+        start = time.perf_counter()
+        strategy._evaluate_indicators('ADAUSD')
+        elapsed.append(time.perf_counter() - start)
+    return strategy._graph.report(), min(elapsed)
+
+
+if __name__ == '__main__':
+    for bars, repeats in ((200, 20), (100_000, 3)):
+        data = make_frame(bars)
+        naive, naive_time = evaluate(data, memoize=False, repeats=repeats)
+        shared, shared_time = evaluate(data, memoize=True, repeats=repeats)
+        removed = naive['computed'] - shared['computed']
+        print(f"[INFO] {bars} bars: {naive['computed']} node evaluations without sharing, "
+              f"{shared['computed']} with sharing ({removed} duplicates removed, "
+              f"{removed / naive['computed']:.0%})")
+        print(f"[INFO] {bars} bars: {naive_time * 1000:.1f} ms -> {shared_time * 1000:.1f} ms "
+              f"({naive_time / shared_time:.2f}x)")
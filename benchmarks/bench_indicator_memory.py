@@ -0,0 +1,44 @@
+# bench_indicator_memory.py
+# Memory held per pair by indicator outputs: scratch columns in self.data (before) vs.
+# the separate IndicatorStore, full-length and bounded (after).
+# Run from the repository root: python -m benchmarks.bench_indicator_memory
+import tracemalloc
+import numpy as np
+import pandas as pd
+from strategy.strategy import TechnicalStrategy
+from benchmarks.bench_indicator_graph import make_frame
+
+
+def evaluate(data: pd.DataFrame, bounded: bool):
+    strategy = TechnicalStrategy(bounded_indicators=bounded)
+    strategy.data = data
+    np.random.seed(0)
+    tracemalloc.start()
+    strategy.combined_strategy('ADAUSD')
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return strategy, peak
+
+
+def scratch_columns_frame(data: pd.DataFrame, strategy: TechnicalStrategy) -> pd.DataFrame:
+    # What combined_strategy used to leave behind: every indicator output as a frame column
+    return data.assign(**{name: strategy.indicators[name] for name in strategy.indicators.columns})
+
+
+def mib(size: int) -> str:
+    return f"{size / 2 ** 20:8.2f} MiB"
+
+
+if __name__ == '__main__':
+    for bars in (720, 10_000, 100_000):
+        data = make_frame(bars)
+        frame_bytes = data.memory_usage(deep=True).sum()
+        full, full_peak = evaluate(data, bounded=False)
+        bounded, bounded_peak = evaluate(data, bounded=True)
+        before = scratch_columns_frame(data, full).memory_usage(deep=True).sum()
+        print(f"[INFO] {bars} bars, {len(full.indicators.columns)} indicator columns:")
+        print(f"    before  self.data with scratch columns  {mib(before)}")
+        print(f"    after   self.data + full-length store   {mib(frame_bytes + full.indicators.nbytes)}"
+              f"  (store {mib(full.indicators.nbytes)}, peak during evaluation {mib(full_peak)})")
+        print(f"    after   self.data + bounded store       {mib(frame_bytes + bounded.indicators.nbytes)}"
+              f"  (store {bounded.indicators.nbytes} bytes, peak during evaluation {mib(bounded_peak)})")
@@ -0,0 +1,47 @@
+# bench_investing.py
+# Loading the bundled Investing.com CSVs: pandas read_csv + per-row parsing (before),
+# vectorized parsing, and the memory-mapped columnar cache (after).
+# Run from the repository root: python -m benchmarks.bench_investing
+import os
+import tempfile
+import time
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from data.investing import DATASETS_PATH, available_pairs, parse_investing_csv, load_history
+
+SUFFIXES = {'K': 1e3, 'M': 1e6, 'B': 1e9}
+
+
+def row_by_row(path: str) -> pd.DataFrame:
+    df = pd.read_csv(path, encoding='utf-8-sig', dtype=str)
+    rows = []
+    for _, row in df.iterrows():
+        volume = row['Vol.']
+        rows.append({'time': datetime.strptime(row['Date'], '%d/%m/%Y'),
+                     'open': float(row['Open'].replace(',', '')), 'high': float(row['High'].replace(',', '')),
+                     'low': float(row['Low'].replace(',', '')), 'close': float(row['Price'].replace(',', '')),
+                     'volume': float(volume[:-1]) * SUFFIXES.get(volume[-1], 1) if volume != '-' else np.nan,
+                     'change': float(row['Change %'].rstrip('%')) / 100})
+    return pd.DataFrame(rows[::-1])
+
+
+def median_time(function, *args, repeat: int = 20) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(*args)
+        times.append(time.perf_counter() - started)
+    return float(np.median(times))
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as cache:
+        for pair in available_pairs():
+            path = os.path.join(DATASETS_PATH, f'{pair}.csv')
+            loop = median_time(row_by_row, path, repeat=3)
+            vectorized = median_time(parse_investing_csv, path)
+            load_history(pair, cache_path=cache)  # Build the cache
+            cached = median_time(load_history, pair, DATASETS_PATH, cache, repeat=1000)
+            print(f"[INFO] {pair}: row-by-row {loop * 1e3:7.1f} ms, vectorized parse {vectorized * 1e3:6.1f} ms, "
+                  f"cached load {cached * 1e3:6.3f} ms ({loop / cached:.0f}x)")
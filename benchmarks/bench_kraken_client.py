@@ -0,0 +1,49 @@
+# bench_kraken_client.py
+# Connections opened and wall time against a local HTTP stand-in for api.kraken.com:
+# a separate krakenex.API per module (as before) vs. the shared pooled KrakenClient, for
+# sequential per-module requests and for a 16-worker OHLC fan-out. Every new connection
+# costs a simulated 30 ms TCP + TLS handshake, as one to Kraken would.
+# Run from the repository root: python -m benchmarks.bench_kraken_client
+import time
+import krakenex
+from execution.data_handler import fan_out
+from execution.kraken_client import KrakenClient
+from tests.test_kraken_client import LocalKraken
+
+MODULES = 5  # Data handler, executor, risk manager, portfolio, predictor
+REQUESTS = 40  # Per module
+PAIRS = [f'PAIR{i:02d}USD' for i in range(50)]
+ROUNDS = 5
+WORKERS = 16
+HANDSHAKE = 0.03
+
+
+def ohlc(client, pair: str) -> bytes:
+    response = client.session.get(f'{client.uri}/0/public/OHLC', params={'pair': pair})
+    return response.content
+
+
+def run(kraken: LocalKraken, clients: list) -> tuple:
+    for client in clients:
+        client.uri = kraken.uri
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        for client in clients:
+            client.query_public('Ticker', {'pair': 'ADAUSD'})
+    sequential = time.perf_counter() - start
+    connections = kraken.connections
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        fan_out(lambda pair: ohlc(clients[0], pair), PAIRS, WORKERS)
+    return sequential, connections, time.perf_counter() - start, kraken.connections - connections
+
+
+if __name__ == '__main__':
+    for label, make_clients in (('client per module', lambda: [krakenex.API() for _ in range(MODULES)]),
+                                ('shared pooled client', lambda: [KrakenClient(pool_size=WORKERS)] * MODULES)):
+        with LocalKraken(handshake=HANDSHAKE) as kraken:
+            sequential, connections, fanned, fan_connections = run(kraken, make_clients())
+        print(f"[INFO] {label}: {MODULES} modules x {REQUESTS} requests {sequential * 1000:.0f} ms over "
+              f"{connections} connections; {ROUNDS} x {len(PAIRS)}-pair OHLC fan-out ({WORKERS} workers) "
+              f"{fanned * 1000:.0f} ms, {fan_connections} new connections")
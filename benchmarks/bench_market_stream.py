@@ -0,0 +1,76 @@
+# bench_market_stream.py
+# Order book maintenance and top-of-book reads: OrderBook (sorted levels kept with bisect)
+# vs. a price -> qty dict sorted whenever the best level is read, over 200k random deltas
+# with a best bid/ask read after each; and reading a ticker from the stream vs. a REST
+# request to a local stand-in server adding 50 ms.
+# Run from the repository root: python -m benchmarks.bench_market_stream
+import random
+import time
+from execution.data_handler import KrakenDataHandler
+from execution.kraken_client import KrakenClient
+from execution.market_cache import MarketDataCache
+from execution.market_stream import MarketStream, OrderBook
+from tests.test_kraken_client import LocalKraken
+
+DELTAS = 200_000
+DEPTH = 100
+LATENCY = 0.05
+
+
+def deltas(count: int):
+    rng = random.Random(0)
+    for _ in range(count):
+        side = rng.choice(('bids', 'asks'))
+        price = round(rng.uniform(0.80, 0.85) if side == 'bids' else rng.uniform(0.85, 0.90), 4)
+        yield side, price, 0.0 if rng.random() < 0.3 else round(rng.uniform(1, 1000), 2)
+
+
+def sorted_dict(updates) -> float:
+    sides = {'bids': {}, 'asks': {}}
+    start = time.perf_counter()
+    for side, price, qty in updates:
+        if qty == 0:
+            sides[side].pop(price, None)
+        else:
+            sides[side][price] = qty
+        levels = sorted(sides[side], reverse=side == 'bids')
+        for extra in levels[DEPTH:]:
+            del sides[side][extra]
+        max(sides['bids'], default=None), min(sides['asks'], default=None)
+    return time.perf_counter() - start
+
+
+def order_book(updates) -> float:
+    book = OrderBook(DEPTH)
+    start = time.perf_counter()
+    for side, price, qty in updates:
+        delta = [{'price': price, 'qty': qty}]
+        book.update(delta if side == 'bids' else [], delta if side == 'asks' else [])
+        book.best_bid, book.best_ask
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    updates = list(deltas(DELTAS))
+    baseline, streamed = sorted_dict(updates), order_book(updates)
+    print(f"[INFO] {DELTAS} book deltas at depth {DEPTH}: sorted dict {baseline * 1000:.0f} ms, "
+          f"OrderBook {streamed * 1000:.0f} ms ({baseline / streamed:.1f}x)")
+
+    stream = MarketStream(['ADAUSD'])
+    stream.handle({'channel': 'ticker', 'data': [{'symbol': 'ADA/USD', 'bid': 0.85, 'bid_qty': 10.0, 'ask': 0.851,
+                                                  'ask_qty': 12.0, 'last': 0.8505, 'volume': 1e6, 'vwap': 0.849,
+                                                  'low': 0.83, 'high': 0.86}]})
+    stream.connected.set()
+    with LocalKraken(latency=LATENCY) as kraken:
+        client = KrakenClient()
+        client.uri = kraken.uri
+        rest = KrakenDataHandler(cache=MarketDataCache({}), client=client)
+        live = KrakenDataHandler(cache=MarketDataCache({}), client=client, stream=stream)
+        timings = {}
+        for name, handler in (('REST', rest), ('stream', live)):
+            start = time.perf_counter()
+            for _ in range(20):
+                handler.get_ticker('ADAUSD')
+            timings[name] = (time.perf_counter() - start) / 20
+    print(f"[INFO] get_ticker: REST {timings['REST'] * 1000:.1f} ms, stream {timings['stream'] * 1e6:.1f} us "
+          f"({client.requests['Ticker']} REST requests)")
@@ -0,0 +1,46 @@
+# bench_ohlc_parser.py
+# Decoding a Kraken OHLC response: json + DataFrame of strings as get_ohlc used to build
+# (before, plus the float conversion every indicator then needed), json + typed columns,
+# and parse_payload straight from the response bytes (after).
+# Run from the repository root: python -m benchmarks.bench_ohlc_parser
+import json
+import time
+import numpy as np
+import pandas as pd
+from data.ohlc_store import parse_payload, parse_rows
+
+
+def make_payload(bars: int, seed: int = 0) -> bytes:
+    rng = np.random.default_rng(seed)
+    close = 0.87 * np.exp(np.cumsum(rng.normal(0, 0.002, bars)))
+    rows = [[1700000000 + 60 * i, f"{c:.6f}", f"{c * 1.001:.6f}", f"{c * 0.999:.6f}", f"{c:.6f}", f"{c:.6f}",
+             f"{v:.8f}", int(n)]
+            for i, (c, v, n) in enumerate(zip(close, rng.uniform(1e3, 1e5, bars), rng.integers(1, 500, bars)))]
+    return json.dumps({'error': [], 'result': {'ADAUSD': rows, 'last': rows[-2][0]}}).encode()
+
+
+def strings_frame(payload: bytes) -> pd.DataFrame:
+    data = json.loads(payload)['result']['ADAUSD']
+    df = pd.DataFrame(data, columns=['time', 'open', 'high', 'low', 'close', 'vwap', 'volume', 'count'])
+    df['time'] = pd.to_datetime(df['time'], unit='s')
+    return df.astype({name: float for name in ('open', 'high', 'low', 'close', 'vwap', 'volume')})
+
+
+def best_time(function, payload: bytes, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(payload)
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+if __name__ == '__main__':
+    for bars, repeat in ((720, 200), (100_000, 5)):
+        payload = make_payload(bars)
+        before = best_time(strings_frame, payload, repeat)
+        decoded = best_time(lambda body: parse_rows(json.loads(body)['result']['ADAUSD']), payload, repeat)
+        after = best_time(parse_payload, payload, repeat)
+        print(f"[INFO] {bars} bars ({len(payload) / 2 ** 10:.0f} KiB): DataFrame of strings + astype "
+              f"{before * 1e3:8.2f} ms, json + typed columns {decoded * 1e3:8.2f} ms, "
+              f"parse_payload {after * 1e3:7.2f} ms ({before / after:.1f}x)")
@@ -0,0 +1,48 @@
+# bench_ohlcv_buffer.py
+# Per-cycle cost of rebuilding the OHLC DataFrame (as get_ohlc does) vs. merging the
+# new bars into an OHLCVRingBuffer and taking a zero-copy frame.
+# Run from the repository root: python -m benchmarks.bench_ohlcv_buffer
+import time
+import numpy as np
+import pandas as pd
+from data.ohlcv_buffer import OHLCVRingBuffer
+
+BARS = 720  # One Kraken OHLC response
+PAIRS = 50
+
+
+def make_response(start: int) -> list:
+    rng = np.random.default_rng(start)
+    close = 100 + np.cumsum(rng.normal(0, 1, BARS))
+    return [[60 * (start + i), f"{c:.4f}", f"{c + 1:.4f}", f"{c - 1:.4f}", f"{c:.4f}", f"{c:.4f}",
+             f"{v:.8f}", 12] for i, (c, v) in enumerate(zip(close, rng.uniform(1000, 5000, BARS)))]
+
+
+def rebuild(rows: list) -> pd.DataFrame:
+    df = pd.DataFrame(rows, columns=['time', 'open', 'high', 'low', 'close', 'vwap', 'volume', 'count'])
+    df['time'] = pd.to_datetime(df['time'], unit='s')
+    return df.astype({name: float for name in ('open', 'high', 'low', 'close', 'vwap', 'volume')})
+
+
+if __name__ == '__main__':
+    responses = [make_response(i) for i in range(PAIRS)]
+    buffers = []
+    for rows in responses:
+        buffers.append(OHLCVRingBuffer(BARS))
+        buffers[-1].extend(rows)
+
+    start = time.perf_counter()
+    for rows in responses:
+        rebuild(rows)
+    rebuild_time = time.perf_counter() - start
+
+    # Each cycle only the forming bar and one new bar are merged
+    start = time.perf_counter()
+    for rows, buffer in zip(responses, buffers):
+        last = rows[-1]
+        buffer.extend([last, [last[0] + 60] + last[1:]])
+        buffer.frame()
+    buffer_time = time.perf_counter() - start
+
+    print(f"[INFO] {PAIRS} pairs x {BARS} bars per cycle: DataFrame rebuild {rebuild_time * 1000:.1f} ms, "
+          f"ring buffer {buffer_time * 1000:.1f} ms ({rebuild_time / buffer_time:.1f}x)")
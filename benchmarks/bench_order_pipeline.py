@@ -0,0 +1,64 @@
+# bench_order_pipeline.py
+# Placing 20 orders across pairs when every fifth AddOrder fails with EService:Unavailable,
+# through a KrakenClient against the local HTTP stand-in answering each call in 50 ms: one
+# order after another with a fixed 1 s sleep before each retry (the previous TradeExecutor
+# loop) vs. OrderPipeline handles (jittered exponential backoff on timers). The client sends
+# private calls one at a time, so the pipeline's gain is that a retrying order's backoff
+# no longer holds up the orders behind it, not overlapping requests.
+# Run from the repository root: python -m benchmarks.bench_order_pipeline
+import contextlib
+import os
+import time
+from config.config import API_CALL_DELAY
+from execution.kraken_client import KrakenClient
+from execution.market_cache import MarketDataCache
+from execution.trade_executor import TradeExecutor
+from tests.test_kraken_client import LocalKraken
+
+ORDERS = 20
+LATENCY = 0.05
+
+
+def orders():
+    return [{'pair': f'PAIR{i:02d}USD', 'type': 'buy', 'ordertype': 'market', 'volume': 1.0} for i in range(ORDERS)]
+
+
+def client_for(kraken: LocalKraken) -> KrakenClient:
+    client = KrakenClient('key', 'c2VjcmV0')
+    client.uri = kraken.uri
+    return client
+
+
+def fixed_delay_loop() -> tuple:
+    with LocalKraken(latency=LATENCY, flaky=5) as kraken:
+        client = client_for(kraken)
+        start = time.perf_counter()
+        for order in orders():
+            for attempt in range(3):
+                response = client.query_private('AddOrder', dict(order, userref=attempt))
+                if not response.get('error'):
+                    break
+                time.sleep(API_CALL_DELAY)
+        return time.perf_counter() - start, client.total_requests
+
+
+def pipeline() -> tuple:
+    with LocalKraken(latency=LATENCY, flaky=5) as kraken:
+        client = client_for(kraken)
+        executor = TradeExecutor(MarketDataCache({}), client)  # Configured backoff and workers
+        start = time.perf_counter()
+        handles = [executor.submit_order(order) for order in orders()]
+        for handle in handles:
+            handle.result()
+        elapsed = time.perf_counter() - start
+        executor.pipeline.shutdown()
+        return elapsed, client.total_requests
+
+
+if __name__ == '__main__':
+    with open(os.devnull, 'w') as quiet:
+        with contextlib.redirect_stdout(quiet):  # Order logs
+            blocking, blocking_calls = fixed_delay_loop()
+            piped, piped_calls = pipeline()
+    print(f"[INFO] {ORDERS} orders, 1 in 5 AddOrder calls retried: fixed-delay loop {blocking:.2f} s "
+          f"({blocking_calls} requests), OrderPipeline {piped:.2f} s ({piped_calls} requests, {blocking / piped:.1f}x)")
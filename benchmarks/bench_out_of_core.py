@@ -0,0 +1,80 @@
+# bench_out_of_core.py
+# Peak RSS of a backtest over minute-bar histories of growing length: the in-memory
+# Backtester (whole history as a DataFrame) vs. the chunked OutOfCoreBacktester reading a
+# memory-mapped columnar file. Each run is measured in a fresh child process.
+# Run from the repository root: python -m benchmarks.bench_out_of_core
+import os
+import resource
+import sys
+import tempfile
+import time
+from multiprocessing import get_context
+import numpy as np
+import pandas as pd
+from data.columnar import ColumnarFile, OHLCV_DTYPES
+
+CHUNK = 100_000
+
+
+# Write a random-walk minute history to `path` chunk by chunk (never fully in memory)
+def write_history(path: str, bars: int, seed: int = 0):
+    history = ColumnarFile.create(path, bars, OHLCV_DTYPES)
+    rng = np.random.default_rng(seed)
+    last = 100.0
+    for start in range(0, bars, CHUNK):
+        n = min(CHUNK, bars - start)
+        close = last * np.exp(np.cumsum(rng.normal(0, 1e-3, n)))
+        last = close[-1]
+        open_ = np.concatenate(([close[0]], close[:-1]))
+        history.write(start, {
+            'time': 1_600_000_000 + 60 * np.arange(start, start + n, dtype=np.int64),
+            'open': open_, 'close': close,
+            'high': np.maximum(open_, close) * (1 + rng.uniform(0, 5e-4, n)),
+            'low': np.minimum(open_, close) * (1 - rng.uniform(0, 5e-4, n)),
+            'volume': rng.uniform(1, 10, n),
+        })
+
+
+def peak_rss_mib() -> float:
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2 ** 20
+
+
+def child(mode: str, path: str, queue):
+    from backtesting.backtester import Backtester
+    from backtesting.out_of_core import OutOfCoreBacktester
+    baseline = peak_rss_mib()
+    started = time.perf_counter()
+    if mode == 'in-memory':
+        history = ColumnarFile(path)
+        backtester = Backtester(pd.DataFrame(history.read(0, len(history))))
+        backtester.buy_threshold, backtester.sell_threshold = 0.3, -0.3
+        backtester.run_vectorized()
+        balance = backtester.balance
+    else:
+        backtester = OutOfCoreBacktester(path, chunk_size=CHUNK)
+        backtester.buy_threshold, backtester.sell_threshold = 0.3, -0.3
+        balance = backtester.run()['final_balance']
+    queue.put((peak_rss_mib() - baseline, time.perf_counter() - started, balance))
+
+
+def measure(mode: str, path: str):
+    context = get_context('spawn')
+    queue = context.Queue()
+    process = context.Process(target=child, args=(mode, path, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+if __name__ == '__main__':
+    for bars in (250_000, 1_000_000, 4_000_000):
+        with tempfile.TemporaryDirectory() as path:
+            write_history(path, bars)
+            size = sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+            print(f"[INFO] {bars} minute bars ({size / 2 ** 20:.0f} MiB on disk):")
+            for mode in ('in-memory', 'out-of-core'):
+                rss, seconds, balance = measure(mode, path)
+                print(f"    {mode:12s} peak RSS +{rss:8.1f} MiB  {seconds:7.2f}s  final balance {balance:.2f}")
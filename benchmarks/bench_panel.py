@@ -0,0 +1,50 @@
+# bench_panel.py
+# Per-pair combined_strategy loop vs. one panel evaluation across all pairs.
+# Run from the repository root: python -m benchmarks.bench_panel
+import time
+import numpy as np
+import pandas as pd
+from strategy.strategy import TechnicalStrategy
+from strategy.panel import OHLCVPanel
+
+BARS = 720  # One Kraken OHLC response
+
+
+def make_frames(pairs: int) -> dict:
+    rng = np.random.default_rng(7)
+    frames = {}
+    for i in range(pairs):
+        close = 100 + np.cumsum(rng.normal(0, 1, BARS))
+        frames[f'PAIR{i}USD'] = pd.DataFrame({
+            'open': close + rng.normal(0, 0.5, BARS),
+            'high': close + rng.uniform(0.5, 1.5, BARS),
+            'low': close - rng.uniform(0.5, 1.5, BARS),
+            'close': close,
+            'volume': rng.uniform(1000, 5000, BARS),
+        })
+    return frames
+
+
+def per_pair_loop(frames: dict) -> float:
+    strategy = TechnicalStrategy()
+    start = time.perf_counter()
+    for pair, frame in frames.items():
+        strategy.data = frame.copy()
+        strategy.combined_strategy(pair)
+    return time.perf_counter() - start
+
+
+def panel(frames: dict) -> float:
+    strategy = TechnicalStrategy()
+    start = time.perf_counter()
+    strategy.panel_strategy(OHLCVPanel.from_frames(frames))
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    for pairs in (1, 10, 100, 300):
+        frames = make_frames(pairs)
+        loop_time = per_pair_loop(frames)
+        panel_time = min(panel(frames) for _ in range(3))
+        print(f"[INFO] {pairs:>3} pairs x {BARS} bars: loop {loop_time * 1000:8.1f} ms, "
+              f"panel {panel_time * 1000:7.1f} ms ({loop_time / panel_time:.1f}x)")
@@ -0,0 +1,42 @@
+# bench_resampler.py
+# Cost of keeping 4h / 1d / 1w bars current as each 1h bar closes: pandas resample() of
+# the whole base history every bar vs. MultiTimeframeResampler.on_bar, plus the bulk
+# warm-up from a stored history.
+# Run from the repository root: python -m benchmarks.bench_resampler
+import time
+import numpy as np
+import pandas as pd
+from data.resampler import MultiTimeframeResampler
+from tests.test_resampler import make_bars
+
+HISTORY = 17280  # 720 daily bars of 1h base bars
+UPDATES = 200
+TIMEFRAMES = {'4h': '4h', '1d': '24h', '1w': '168h'}
+AGGREGATION = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum', 'count': 'sum'}
+
+
+if __name__ == '__main__':
+    bars = make_bars(HISTORY + UPDATES)
+    indexed = bars.set_index(pd.to_datetime(bars['time'], unit='s'))
+
+    start = time.perf_counter()
+    for stop in range(HISTORY, HISTORY + UPDATES):
+        window = indexed.iloc[:stop]
+        for rule in TIMEFRAMES.values():
+            window.resample(rule, origin='1970-01-05' if rule == '168h' else 'epoch').agg(AGGREGATION)
+    resample_time = (time.perf_counter() - start) / UPDATES
+
+    resampler = MultiTimeframeResampler('1h', list(TIMEFRAMES))
+    start = time.perf_counter()
+    resampler.extend(bars.iloc[:HISTORY])
+    warm_up_time = time.perf_counter() - start
+
+    rows = list(bars.iloc[HISTORY:].itertuples(index=False))
+    start = time.perf_counter()
+    for row in rows:
+        resampler.on_bar(*row)
+    update_time = (time.perf_counter() - start) / UPDATES
+
+    print(f"[INFO] {HISTORY} base bars, {len(TIMEFRAMES)} higher timeframes per closed bar: "
+          f"full resample() {resample_time * 1000:.2f} ms, incremental {update_time * 1e6:.1f} us "
+          f"({resample_time / update_time:.0f}x); bulk warm-up {warm_up_time * 1000:.1f} ms")
@@ -0,0 +1,31 @@
+# bench_result_cache.py
+# Backtester.run_vectorized on a long history: uncached, first cached run (miss + store),
+# and the repeat run served from the ResultCache (best of 5).
+# Run from the repository root: python -m benchmarks.bench_result_cache
+import tempfile
+import time
+from backtesting.backtester import Backtester
+from backtesting.cache import ResultCache, code_version
+from benchmarks.bench_indicator_graph import make_frame
+
+
+def timed_run(data, cache) -> float:
+    backtester = Backtester(data, cache=cache)
+    backtester.buy_threshold, backtester.sell_threshold = 0.3, -0.3
+    started = time.perf_counter()
+    backtester.run_vectorized()
+    backtester.evaluate_performance()
+    return time.perf_counter() - started
+
+
+if __name__ == '__main__':
+    code_version()  # Source hash is computed once per process
+    for bars in (10_000, 100_000):
+        data = make_frame(bars)
+        with tempfile.TemporaryDirectory() as path:
+            cache = ResultCache(path)
+            uncached = timed_run(data, None)
+            first = timed_run(data, cache)
+            repeat = min(timed_run(data, cache) for _ in range(5))
+        print(f"[INFO] {bars} bars: uncached {uncached * 1e3:8.1f} ms, first cached run {first * 1e3:8.1f} ms, "
+              f"repeat {repeat * 1e3:6.1f} ms ({uncached / repeat:.0f}x)")
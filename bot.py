@@ -7,7 +7,7 @@ from strategy import TradingStrategy
 from portfolio import PortfolioManager
 from execution import TradeExecutor
 from dashboard import DashboardApp
-from config import TRADING_MODE, API_CALL_DELAY
+from config import TRADING_MODE
 
 class TradingBot:
     def __init__(self):
@@ -60,8 +60,7 @@ class TradingBot:
 
                 for pair in self.portfolio.positions.keys() or ['ADAUSD', 'LTCUSD']:
                     print(f"\n[INFO] Processing pair: {pair}")
-                    self.execute_trade(pair)
-                    time.sleep(API_CALL_DELAY)
+                    self.execute_trade(pair)  # Requests are paced by the client's rate limiter
                 
                 self.monitor_trades()
                 print("[INFO] Cycle complete. Sleeping before next iteration.")
@@ -35,6 +35,7 @@ ALLOWED_PAIRS = ["ADA/USD", "LTC/USD", "DOT/USD"]
 # Strategy Settings
 # ============================================
 TIMEFRAME = "1h"  # Trading timeframe (e.g., 1h, 4h, 1d)
+TIMEFRAMES = ["4h", "1d"]  # Higher timeframes resampled from TIMEFRAME bars
 TAKE_PROFIT = 0.1  # 10% take-profit per trade
 STOP_LOSS = 0.05  # 5% stop-loss per trade
 MAX_CONCURRENT_POSITIONS = 5  # Max number of simultaneous positions
@@ -62,6 +63,32 @@ NOTIFICATIONS = {
 # ============================================
 ORDER_TYPE = "market"  # Default order type ('market' or 'limit')
 API_CALL_DELAY = 1  # Delay between API calls (in seconds)
+API_TIER = "starter"  # Kraken verification tier of the API key ('starter', 'intermediate' or 'pro')
+# Kraken call counters per tier as (maximum, decay per second): 'public' is the per-IP
+# budget of the public endpoints, 'private' the key's REST API counter and 'trading' its
+# matching-engine counter for orders
+API_RATE_LIMITS = {
+    "starter": {"public": (15, 1.0), "private": (15, 0.33), "trading": (60, 1.0)},
+    "intermediate": {"public": (15, 1.0), "private": (20, 0.5), "trading": (125, 2.34)},
+    "pro": {"public": (15, 1.0), "private": (20, 1.0), "trading": (180, 3.75)}}
+# (counter, cost) per endpoint; unlisted endpoints cost 1 on the public or private counter
+API_CALL_COSTS = {"AddOrder": ("trading", 1), "AddOrderBatch": ("trading", 1), "EditOrder": ("trading", 1), "CancelOrder": ("trading", 1),
+                  "CancelAll": ("trading", 1), "Ledgers": ("private", 2), "QueryLedgers": ("private", 2),
+                  "TradesHistory": ("private", 2), "QueryTrades": ("private", 2)}
+# Order in which queued calls are sent (lower first); unlisted endpoints (market data) go last
+API_PRIORITIES = {"AddOrder": 0, "AddOrderBatch": 0, "EditOrder": 0, "CancelOrder": 0, "CancelAll": 0,
+                  "Balance": 1, "OpenOrders": 1, "ClosedOrders": 1, "QueryOrders": 1, "TradesHistory": 1}
+ORDER_WORKERS = 8  # Order pipeline threads (KrakenClient still sends private calls one at a time)
+ORDER_BACKOFF = (0.5, 8.0)  # Retry backoff in seconds: base (doubled per attempt, jittered) and cap
+ORDER_POLL_INTERVAL = 2  # Seconds between fill-status checks of placed orders
+BATCH_MAX_ORDERS = 15  # Orders per AddOrderBatch call (Kraken accepts 2 to 15, all for one pair)
+# Seconds a market-data response is reused for, per Kraken endpoint (shorter than a bot cycle,
+# so each cycle makes one request per resource)
+MARKET_DATA_TTL = {"Ticker": 5, "OHLC": 60, "Balance": 5, "OpenOrders": 5}
+FETCH_WORKERS = 8  # Concurrent requests for endpoints without a multi-pair form (OHLC)
+HTTP_POOL_SIZE = 16  # Keep-alive connections in the shared Kraken client (at least FETCH_WORKERS)
+KRAKEN_WS_URL = "wss://ws.kraken.com/v2"  # Public market-data WebSocket (ticker, trade, ohlc, book)
+BOOK_DEPTH = 10  # Order book levels kept per side (Kraken: 10, 25, 100, 500 or 1000)
 
 # ============================================
 # Mock and Data Paths
@@ -71,6 +98,9 @@ HISTORICAL_DATA_PATH = os.path.join(BASE_DATA_PATH, 'historical')
 LIVE_DATA_PATH = os.path.join(BASE_DATA_PATH, 'live')
 MOCK_DATA_PATH = os.path.join(BASE_DATA_PATH, 'mock')
 MODEL_DATA_PATH = os.path.join(BASE_DATA_PATH, 'models')
+KRAKEN_OHLC_PATH = os.path.join(HISTORICAL_DATA_PATH, 'kraken')  # Incrementally synced OHLC store
+BACKTEST_CACHE_PATH = os.path.join(BASE_DATA_PATH, 'cache')
+BACKTEST_CACHE_MAX_BYTES = 512 * 2 ** 20  # Least recently used results are evicted beyond this size
 
 # Ensure paths exist
 os.makedirs(BASE_DATA_PATH, exist_ok=True)
@@ -0,0 +1,2 @@
+from .ohlcv_buffer import OHLCVRingBuffer
+from .resampler import MultiTimeframeResampler
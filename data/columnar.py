@@ -0,0 +1,109 @@
+# columnar.py
+import mmap
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+# Column layout for OHLCV histories (time in epoch seconds)
+OHLCV_DTYPES = {'time': np.int64, 'open': np.float64, 'high': np.float64, 'low': np.float64,
+                'close': np.float64, 'volume': np.float64}
+
+
+class ColumnarFile:
+    # A bar history on disk as one .npy file per column in a directory. Reads map only
+    # the requested row window and copy it out, so the process never keeps more than one
+    # window of the file resident however long the history is.
+    # `layout` (a saved ColumnarFile.layout) skips parsing the .npy headers when reopening.
+    def __init__(self, path: str, layout: Optional[Dict[str, Tuple[str, int, int]]] = None):
+        self.path = path
+        self._layout: Dict[str, Tuple[np.dtype, int, int]] = {}  # column -> (dtype, rows, data offset)
+        if layout is not None:
+            self._layout = {name: (np.dtype(dtype), rows, offset) for name, (dtype, rows, offset) in layout.items()}
+        else:
+            for name in sorted(os.listdir(path)):
+                if name.endswith('.npy'):
+                    self._layout[name[:-4]] = self._read_header(os.path.join(path, name))
+        lengths = {rows for _, rows, _ in self._layout.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns in {path} have different lengths: {sorted(lengths)}")
+        self.length = lengths.pop() if lengths else 0
+
+    @staticmethod
+    def _read_header(filename: str) -> Tuple[np.dtype, int, int]:
+        with open(filename, 'rb') as f:
+            version = np.lib.format.read_magic(f)
+            read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+            shape, fortran_order, dtype = read_header(f)
+            if len(shape) != 1:
+                raise ValueError(f"{filename} is not a single column")
+            return dtype, shape[0], f.tell()
+
+    # Preallocate `length` rows of every column (filled later with write())
+    @classmethod
+    def create(cls, path: str, length: int, dtypes: Dict[str, type] = None) -> 'ColumnarFile':
+        os.makedirs(path, exist_ok=True)
+        for name, dtype in (dtypes or OHLCV_DTYPES).items():
+            column = np.lib.format.open_memmap(os.path.join(path, f'{name}.npy'), mode='w+',
+                                               dtype=dtype, shape=(length,))
+            del column
+        return cls(path)
+
+    @classmethod
+    def from_frame(cls, path: str, frame: pd.DataFrame) -> 'ColumnarFile':
+        columns = {name: frame[name].to_numpy() for name in frame.columns}
+        store = cls.create(path, len(frame), {name: values.dtype for name, values in columns.items()})
+        store.write(0, columns)
+        return store
+
+    def __len__(self) -> int:
+        return self.length
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._layout)
+
+    @property
+    def layout(self) -> Dict[str, Tuple[str, int, int]]:
+        return {name: (dtype.str, rows, offset) for name, (dtype, rows, offset) in self._layout.items()}
+
+    def _map(self, name: str, start: int, stop: int, mode: str) -> np.memmap:
+        dtype, _, offset = self._layout[name]
+        return np.memmap(os.path.join(self.path, f'{name}.npy'), dtype=dtype, mode=mode,
+                         offset=offset + start * dtype.itemsize, shape=(stop - start,))
+
+    def write(self, start: int, values: Dict[str, np.ndarray]):
+        for name, column in values.items():
+            window = self._map(name, start, start + len(column), 'r+')
+            window[:] = column
+            window.flush()
+            del window
+
+    # Rows [start, stop) of the requested columns as in-memory arrays
+    def read(self, start: int, stop: int, columns: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        stop = min(stop, self.length)
+        result = {}
+        for name in columns or self.columns:
+            window = self._map(name, start, stop, 'r')
+            result[name] = np.array(window)
+            del window
+        return result
+
+    # Whole columns as read-only arrays over memory maps (zero-copy; pages are read on first access)
+    def mmap(self, columns: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        arrays = {}
+        for name in columns or self.columns:
+            dtype, rows, offset = self._layout[name]
+            with open(os.path.join(self.path, f'{name}.npy'), 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            arrays[name] = np.frombuffer(mapped, dtype=dtype, count=rows, offset=offset)
+        return arrays
+
+    # Consecutive windows of `size` new rows, each preceded by up to `overlap` earlier rows.
+    # Yields (first row read, first new row, end row, arrays).
+    def windows(self, size: int, overlap: int = 0, columns: Optional[List[str]] = None
+                ) -> Iterator[Tuple[int, int, int, Dict[str, np.ndarray]]]:
+        for start in range(0, self.length, size):
+            stop = min(start + size, self.length)
+            first = max(0, start - overlap)
+            yield first, start, stop, self.read(first, stop, columns)
@@ -0,0 +1,111 @@
+# investing.py
+import json
+import os
+import shutil
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+from config.config import HISTORICAL_DATA_PATH
+from data.columnar import ColumnarFile
+
+DATASETS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'datasets')
+# Investing.com export header -> column name (time is epoch seconds, as in OHLCV_DTYPES)
+COLUMNS = {'Date': 'time', 'Open': 'open', 'High': 'high', 'Low': 'low', 'Price': 'close',
+           'Vol.': 'volume', 'Change %': 'change'}
+SUFFIXES = {'K': 1e3, 'M': 1e6, 'B': 1e9}
+CACHE_VERSION = 1  # Bump when the parsed layout changes to rebuild existing caches
+
+
+def _number(values: pd.Series) -> np.ndarray:
+    # '1,234.56' -> 1234.56; '-' and blanks -> NaN
+    return pd.to_numeric(values.str.replace(',', '', regex=False), errors='coerce').to_numpy(dtype=np.float64)
+
+
+# Parse an Investing.com historical-data CSV (UTF-8 BOM, quoted fields, dd/mm/yyyy dates
+# newest first, volumes like '162.76M', changes like '1.69%') into typed columns, oldest first.
+# Every column is converted with vectorized string operations, never row by row.
+def parse_investing_csv(path: str) -> Dict[str, np.ndarray]:
+    raw = pd.read_csv(path, encoding='utf-8-sig', dtype=str, keep_default_na=False)
+    missing = set(COLUMNS) - set(raw.columns)
+    if missing:
+        raise ValueError(f"{path} is missing Investing.com columns: {sorted(missing)}")
+    raw = raw.apply(lambda column: column.str.strip())
+
+    dates = pd.to_datetime(raw['Date'], format='%d/%m/%Y').to_numpy(dtype='datetime64[s]')
+    volume = raw['Vol.']
+    multiplier = volume.str[-1:].map(SUFFIXES).fillna(1.0).to_numpy()
+    columns = {
+        'time': dates.astype(np.int64),
+        'open': _number(raw['Open']),
+        'high': _number(raw['High']),
+        'low': _number(raw['Low']),
+        'close': _number(raw['Price']),
+        'volume': _number(volume.str.rstrip('KMB')) * multiplier,
+        'change': _number(raw['Change %'].str.rstrip('%')) / 100,
+    }
+    order = np.argsort(columns['time'], kind='stable')
+    return {name: values[order] for name, values in columns.items()}
+
+
+def _source_stamp(source: str) -> Dict[str, int]:
+    stat = os.stat(source)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'version': CACHE_VERSION}
+
+
+# Typed columns of a bundled dataset (e.g. 'ADAUSD'). The CSV is parsed once into a
+# ColumnarFile under cache_path/<pair>; later loads memory-map that cache read-only
+# (zero-copy) and only re-parse when the CSV changes. source.json records the CSV's size,
+# mtime and the column layout, so a cached load is a stat, a small JSON read and the maps.
+# cache_path=None parses without caching.
+def load_history(pair: str, datasets_path: str = DATASETS_PATH, cache_path: Optional[str] = HISTORICAL_DATA_PATH,
+                 columns: List[str] = None) -> Dict[str, np.ndarray]:
+    source = os.path.join(datasets_path, f'{pair}.csv')
+    if cache_path is None:
+        parsed = parse_investing_csv(source)
+        return {name: parsed[name] for name in columns or parsed}
+
+    directory = os.path.join(cache_path, pair)
+    stamp_file = os.path.join(directory, 'source.json')
+    stamp = _source_stamp(source)
+    try:
+        with open(stamp_file) as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        saved = {}
+    if saved.get('source') == stamp:
+        return ColumnarFile(directory, saved['layout']).mmap(columns)
+
+    print(f"[INFO] Building columnar cache for {pair} from {source}")
+    staging = directory + '.tmp'
+    shutil.rmtree(staging, ignore_errors=True)
+    history = ColumnarFile.from_frame(staging, pd.DataFrame(parse_investing_csv(source)))
+    with open(os.path.join(staging, 'source.json'), 'w') as f:
+        json.dump({'source': stamp, 'layout': history.layout}, f)
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(staging, directory)
+    return ColumnarFile(directory, history.layout).mmap(columns)
+
+
+# The same history as the OHLCV frame Backtester / TechnicalStrategy expect
+def load_frame(pair: str, datasets_path: str = DATASETS_PATH,
+               cache_path: Optional[str] = HISTORICAL_DATA_PATH) -> pd.DataFrame:
+    history = load_history(pair, datasets_path, cache_path)
+    frame = pd.DataFrame({'timestamp': history['time'].view('datetime64[s]'),
+                          **{name: history[name] for name in ('open', 'high', 'low', 'close', 'volume', 'change')}},
+                         copy=False)
+    frame['pair'] = pair
+    return frame
+
+
+# Pairs with a bundled CSV
+def available_pairs(datasets_path: str = DATASETS_PATH) -> List[str]:
+    return sorted(name[:-4] for name in os.listdir(datasets_path) if name.endswith('.csv'))
+
+
+# Example Usage
+if __name__ == '__main__':
+    for pair in available_pairs():
+        frame = load_frame(pair)
+        print(f"[INFO] {pair}: {len(frame)} bars from {frame['timestamp'].iloc[0]} to {frame['timestamp'].iloc[-1]}")
+        print(frame.tail(3))
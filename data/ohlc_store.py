@@ -0,0 +1,163 @@
+# ohlc_store.py
+import json
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import numpy as np
+import pandas as pd
+
+from config.config import KRAKEN_OHLC_PATH
+
+# Kraken OHLC row layout: time, open, high, low, close, vwap, volume, count
+DTYPES = {'time': np.dtype(np.int64), 'open': np.dtype(np.float64), 'high': np.dtype(np.float64),
+          'low': np.dtype(np.float64), 'close': np.dtype(np.float64), 'vwap': np.dtype(np.float64),
+          'volume': np.dtype(np.float64), 'count': np.dtype(np.int64)}
+
+
+_ERROR = re.compile(rb'"error"\s*:\s*\[([^\]]*)\]')
+_BARS = re.compile(rb'"([^"]+)"\s*:\s*\[\s*([\[\]])')  # The result key holding the array of bars
+_BARS_END = re.compile(rb'\]\s*\]')
+_LAST = re.compile(rb'"last"\s*:\s*(\d+)')
+
+
+def deduplicate(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    # Sorted by time, one row per time (the later row wins, as a repeated time is a newer
+    # version of the forming bar)
+    times = columns['time']
+    _, last = np.unique(times[::-1], return_index=True)
+    keep = len(times) - 1 - last
+    return {name: values[keep] for name, values in columns.items()}
+
+
+def parse_rows(rows: Iterable[Sequence]) -> Dict[str, np.ndarray]:
+    # Decoded Kraken rows (prices as strings) -> typed columns
+    rows = np.asarray(rows, dtype=object).reshape(-1, len(DTYPES))
+    columns = {name: rows[:, i].astype(np.float64).astype(dtype) if dtype.kind == 'i' else rows[:, i].astype(dtype)
+               for i, (name, dtype) in enumerate(DTYPES.items())}
+    return deduplicate(columns)
+
+
+# Raw OHLC response body -> (typed columns, last cursor). The bar array is decoded by one
+# C-level pass (brackets and quotes dropped, np.fromstring on the comma-separated numbers)
+# into a bars x 8 float64 block that is split into contiguous columns: no per-cell Python
+# objects. Times and counts are integers far below 2**53, so they survive float64 exactly.
+def parse_payload(payload: bytes) -> Tuple[Dict[str, np.ndarray], Optional[int]]:
+    error = _ERROR.search(payload)
+    if error and error.group(1).strip():
+        raise Exception(json.loads(b'[' + error.group(1) + b']'))
+    result = max(payload.find(b'"result"'), 0)
+    bars = _BARS.search(payload, result)
+    if bars is None:
+        raise ValueError("No OHLC bars in response")
+    start = bars.start(2)
+    end = _BARS_END.search(payload, start).end() if bars.group(2) == b'[' else start
+    values = np.fromstring(payload[start:end].translate(None, b'[]"'), sep=',').reshape(-1, len(DTYPES))
+    block = np.ascontiguousarray(values.T)
+    columns = {name: block[i].astype(dtype) if dtype.kind == 'i' else block[i]
+               for i, (name, dtype) in enumerate(DTYPES.items())}
+    last = _LAST.search(payload, result)  # Before or after the bars: key order is not fixed
+    return deduplicate(columns), int(last.group(1)) if last else None
+
+
+class OHLCStore:
+    # Persistent OHLC history per pair and interval, synced incrementally: every column is
+    # an append-only binary file, and meta.json holds the row count and Kraken's `last`
+    # cursor (the `since` for the next request). A merged bar with the same time as the
+    # stored last bar replaces it (the forming bar); older rows are already stored.
+    def __init__(self, path: str = KRAKEN_OHLC_PATH):
+        self.path = path
+        self._meta: Dict[tuple, dict] = {}
+
+    def _directory(self, pair: str, interval: int) -> str:
+        return os.path.join(self.path, f'{pair}_{interval}')
+
+    def _load_meta(self, pair: str, interval: int) -> dict:
+        key = (pair, interval)
+        if key not in self._meta:
+            try:
+                with open(os.path.join(self._directory(pair, interval), 'meta.json')) as f:
+                    self._meta[key] = json.load(f)
+            except FileNotFoundError:
+                self._meta[key] = {'rows': 0, 'last': None}
+        return self._meta[key]
+
+    def _save_meta(self, pair: str, interval: int, meta: dict):
+        # Column data is written before the row count, so an interrupted merge only loses itself
+        filename = os.path.join(self._directory(pair, interval), 'meta.json')
+        with open(filename + '.tmp', 'w') as f:
+            json.dump(meta, f)
+        os.replace(filename + '.tmp', filename)
+        self._meta[(pair, interval)] = meta
+
+    def rows(self, pair: str, interval: int = 60) -> int:
+        return self._load_meta(pair, interval)['rows']
+
+    # `since` value for the next OHLC request (None before the first sync)
+    def cursor(self, pair: str, interval: int = 60) -> Optional[int]:
+        return self._load_meta(pair, interval)['last']
+
+    def _write(self, directory: str, start: int, columns: Dict[str, np.ndarray]):
+        for name, values in columns.items():
+            filename = os.path.join(directory, f'{name}.bin')
+            with open(filename, 'r+b' if os.path.exists(filename) else 'wb') as f:
+                f.seek(start * DTYPES[name].itemsize)
+                f.write(np.ascontiguousarray(values, dtype=DTYPES[name]).tobytes())
+
+    # Merge one OHLC response (result[pair] rows or parsed columns, and result['last']);
+    # returns the number of new bars
+    def merge(self, pair: str, interval: int, rows: Union[Iterable[Sequence], Dict[str, np.ndarray]],
+              last: int = None) -> int:
+        meta = dict(self._load_meta(pair, interval))
+        directory = self._directory(pair, interval)
+        os.makedirs(directory, exist_ok=True)
+        incoming = deduplicate(rows) if isinstance(rows, dict) else parse_rows(rows)
+        stored = meta['rows']
+        if stored and len(incoming['time']):
+            last_time = self.arrays(pair, interval, ['time'], bars=1)['time'][0]
+            keep = incoming['time'] >= last_time
+            incoming = {name: values[keep] for name, values in incoming.items()}
+            if len(incoming['time']) and incoming['time'][0] == last_time:
+                self._write(directory, stored - 1, {name: values[:1] for name, values in incoming.items()})
+                incoming = {name: values[1:] for name, values in incoming.items()}
+        added = len(incoming['time'])
+        if added:
+            self._write(directory, stored, incoming)
+        meta['rows'] = stored + added
+        if last is not None:
+            meta['last'] = int(last)
+        self._save_meta(pair, interval, meta)
+        return added
+
+    # Typed columns of the stored history (the last `bars` rows if given)
+    def arrays(self, pair: str, interval: int = 60, columns: List[str] = None,
+               bars: int = None) -> Dict[str, np.ndarray]:
+        stored = self.rows(pair, interval)
+        count = stored if bars is None else min(bars, stored)
+        directory = self._directory(pair, interval)
+        arrays = {}
+        for name in columns or DTYPES:
+            dtype = DTYPES[name]
+            if not count:
+                arrays[name] = np.empty(0, dtype=dtype)
+                continue
+            arrays[name] = np.fromfile(os.path.join(directory, f'{name}.bin'), dtype=dtype,
+                                       count=count, offset=(stored - count) * dtype.itemsize)
+        return arrays
+
+    # Same layout as KrakenDataHandler.get_ohlc used to return, with typed columns
+    def frame(self, pair: str, interval: int = 60, bars: int = None) -> pd.DataFrame:
+        frame = pd.DataFrame(self.arrays(pair, interval, bars=bars), copy=False)
+        frame['time'] = pd.to_datetime(frame['time'], unit='s')
+        return frame
+
+
+# Example Usage
+if __name__ == '__main__':
+    import tempfile
+    store = OHLCStore(tempfile.mkdtemp())
+    store.merge('ADAUSD', 60, [[1700000000, '0.37', '0.38', '0.36', '0.375', '0.372', '1000.5', 12],
+                               [1700003600, '0.375', '0.376', '0.37', '0.371', '0.373', '80.0', 3]], last=1700000000)
+    # The next poll (since=1700000000) returns the finished bar and a new forming one
+    store.merge('ADAUSD', 60, [[1700003600, '0.375', '0.39', '0.37', '0.385', '0.38', '900.0', 20],
+                               [1700007200, '0.385', '0.386', '0.384', '0.385', '0.385', '10.0', 1]], last=1700003600)
+    print(store.frame('ADAUSD', 60), store.cursor('ADAUSD', 60))
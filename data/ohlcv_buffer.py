@@ -0,0 +1,121 @@
+# ohlcv_buffer.py
+from typing import Any, Dict, Iterable, Sequence
+import numpy as np
+import pandas as pd
+
+# Kraken OHLC row layout: time, open, high, low, close, vwap, volume, count
+COLUMNS = ('open', 'high', 'low', 'close', 'vwap', 'volume', 'count')
+
+
+class OHLCVRingBuffer:
+    # The last `capacity` bars of one pair as NumPy columns (float64 or float32; bar
+    # times are int64 seconds). Storage is twice the capacity: bars are written after
+    # the current window and, once the end is reached, the window is moved back to the
+    # front in one copy. Appends are amortised O(1) and every column of the window stays
+    # contiguous, so views and frame() never copy.
+    def __init__(self, capacity: int = 720, dtype: Any = np.float64):
+        if capacity < 1:
+            raise ValueError("Capacity must be at least one bar")
+        self.capacity = capacity
+        self.dtype = np.dtype(dtype)
+        self._time = np.zeros(2 * capacity, dtype=np.int64)
+        self._values = np.full((len(COLUMNS), 2 * capacity), np.nan, dtype=self.dtype)
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def last_time(self):
+        return int(self._time[self._end - 1]) if len(self) else None
+
+    # Append a bar (O(1) amortised); the oldest bar is dropped once the buffer is full
+    def append(self, time: int, open_: float, high: float, low: float, close: float,
+               vwap: float = np.nan, volume: float = 0.0, count: float = 0.0):
+        if self._end == len(self._time):
+            self._compact()
+        row = self._end
+        self._time[row] = time
+        self._values[:, row] = (open_, high, low, close, vwap, volume, count)
+        self._end += 1
+        if len(self) > self.capacity:
+            self._start += 1
+
+    # Overwrite the forming (last) bar in place, or append it if it opens a new interval
+    def update(self, time: int, open_: float, high: float, low: float, close: float,
+               vwap: float = np.nan, volume: float = 0.0, count: float = 0.0):
+        if len(self) and self.last_time == time:
+            self._values[:, self._end - 1] = (open_, high, low, close, vwap, volume, count)
+        elif len(self) and time < self.last_time:
+            raise ValueError(f"Bar at {time} is older than the last bar ({self.last_time})")
+        else:
+            self.append(time, open_, high, low, close, vwap, volume, count)
+
+    # Merge rows laid out like Kraken's OHLC result ([time, open, ..., count] per bar).
+    # Rows older than the last stored bar are ignored and a row with the same time
+    # replaces the forming bar, so overlapping responses can be fed in directly.
+    def extend(self, rows: Iterable[Sequence]):
+        rows = np.asarray(rows, dtype=object)
+        if not len(rows):
+            return
+        times = rows[:, 0].astype(np.int64)
+        values = rows[:, 1:].astype(np.float64)
+        if len(self):
+            keep = times >= self.last_time
+            times, values = times[keep], values[keep]
+            if len(times) and times[0] == self.last_time:
+                self._values[:, self._end - 1] = values[0]
+                times, values = times[1:], values[1:]
+        self.extend_arrays(times, values.T)
+
+    # Append bars given as times and a COLUMNS x bars block, all newer than the last bar
+    def extend_arrays(self, times: np.ndarray, values: np.ndarray):
+        # Only the newest `capacity` rows can survive
+        times, values = times[-self.capacity:], values[:, -self.capacity:]
+        if self._end + len(times) > len(self._time):
+            self._compact(room=len(times))
+        rows_slice = slice(self._end, self._end + len(times))
+        self._time[rows_slice] = times
+        self._values[:, rows_slice] = values
+        self._end += len(times)
+        self._start = max(self._start, self._end - self.capacity)
+
+    # Move the window to the front so `room` more bars fit after it
+    def _compact(self, room: int = 1):
+        keep = min(len(self), len(self._time) - room)
+        source = slice(self._end - keep, self._end)
+        self._time[:keep] = self._time[source]
+        self._values[:, :keep] = self._values[:, source]
+        self._start, self._end = 0, keep
+
+    # *Zero-copy views (oldest bar first); valid until the next append*
+    @property
+    def time(self) -> np.ndarray:
+        return self._time[self._start:self._end]
+
+    # The last bar's values in COLUMNS order (writable, so the forming bar can be merged in place)
+    @property
+    def last_row(self) -> np.ndarray:
+        return self._values[:, self._end - 1]
+
+    def column(self, name: str) -> np.ndarray:
+        return self._values[COLUMNS.index(name), self._start:self._end]
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        return {name: self.column(name) for name in COLUMNS}
+
+    # DataFrame over the same memory, in the layout KrakenDataHandler.get_ohlc returns
+    def frame(self) -> pd.DataFrame:
+        window = slice(self._start, self._end)
+        frame = pd.DataFrame(self._values[:, window].T, columns=list(COLUMNS), copy=False)
+        frame.insert(0, 'time', pd.to_datetime(self._time[window], unit='s'))
+        return frame
+
+
+if __name__ == '__main__':
+    buffer = OHLCVRingBuffer(capacity=3)
+    for t in range(5):
+        buffer.append(60 * t, 1.0 + t, 2.0 + t, 0.5 + t, 1.5 + t, 1.2 + t, 100.0, 10)
+    buffer.update(240, 5.0, 6.5, 4.5, 6.0, 5.5, 150.0, 12)
+    print(f"[INFO] Buffered bars:\n{buffer.frame()}")
@@ -0,0 +1,172 @@
+# resampler.py
+import re
+from typing import Dict, Iterable, Union
+import numpy as np
+import pandas as pd
+
+from config.config import TIMEFRAME, TIMEFRAMES
+from data.ohlcv_buffer import OHLCVRingBuffer, COLUMNS
+
+TIMEFRAME_UNITS = {'m': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+WEEK_OFFSET = 4 * 86400  # The epoch was a Thursday; weekly bars open on Monday 00:00 UTC
+
+
+# '4h' -> 14400 seconds; plain integers are minutes, like Kraken's `interval`
+def timeframe_seconds(timeframe: Union[str, int]) -> int:
+    if isinstance(timeframe, (int, np.integer)):
+        seconds = int(timeframe) * 60
+    else:
+        match = re.fullmatch(r'\s*(\d+)\s*([mhdw])\s*', str(timeframe).lower())
+        if match is None:
+            raise ValueError(f"Unknown timeframe '{timeframe}' (expected e.g. 15m, 4h, 1d, 1w)")
+        seconds = int(match.group(1)) * TIMEFRAME_UNITS[match.group(2)]
+    if seconds <= 0:
+        raise ValueError(f"Timeframe '{timeframe}' must be positive")
+    return seconds
+
+
+# 14400 -> '4h' (the largest unit that divides the length)
+def timeframe_label(seconds: int) -> str:
+    for unit, length in sorted(TIMEFRAME_UNITS.items(), key=lambda item: -item[1]):
+        if seconds % length == 0:
+            return f'{seconds // length}{unit}'
+    return f'{seconds}s'
+
+
+# Open time of the bar of `seconds` length holding each time (bars are aligned to the epoch,
+# so 1d bars open at midnight UTC, as Kraken's do)
+def bucket_start(times, seconds: int):
+    offset = WEEK_OFFSET if seconds % TIMEFRAME_UNITS['w'] == 0 else 0
+    return times - (times - offset) % seconds
+
+
+# Aggregate bars (time plus COLUMNS, oldest first) into bars of `seconds` length in one
+# vectorized pass: first open, highest high, lowest low, last close, summed volume and
+# count, and the volume-weighted vwap (the last vwap where a bar traded nothing)
+def aggregate(times: np.ndarray, values: np.ndarray, seconds: int):
+    starts = bucket_start(times, seconds)
+    first = np.flatnonzero(np.r_[True, starts[1:] != starts[:-1]])
+    last = np.r_[first[1:] - 1, len(times) - 1]
+    open_, high, low, close, vwap, volume, count = values
+    total = np.add.reduceat(volume, first)
+    traded = np.add.reduceat(np.where(volume > 0, vwap * volume, 0), first)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weighted = np.where(total > 0, traded / total, vwap[last])
+    block = np.vstack([open_[first], np.maximum.reduceat(high, first), np.minimum.reduceat(low, first),
+                       close[last], weighted, total, np.add.reduceat(count, first)])
+    return starts[first], block.astype(values.dtype, copy=False)
+
+
+class MultiTimeframeResampler:
+    # Higher timeframes (4h, 1d, ...) built from one base series (1m or 1h bars) as each
+    # base bar closes, so every timeframe stays in sync without extra OHLC requests or
+    # full-history resample() calls. Each timeframe is an OHLCVRingBuffer whose last bar
+    # is the forming higher bar: a closed base bar either merges into it in place (O(1))
+    # or opens the next one. Only closed base bars may be fed in; bars not newer than the
+    # last one seen are ignored, so overlapping histories can be passed directly.
+    def __init__(self, base: Union[str, int] = TIMEFRAME, timeframes: Iterable[Union[str, int]] = TIMEFRAMES,
+                 capacity: int = 720, dtype=np.float64):
+        self.base_seconds = timeframe_seconds(base)
+        self.base = timeframe_label(self.base_seconds)
+        self.seconds: Dict[str, int] = {}  # Higher timeframe label ('4h') -> bar length
+        for timeframe in timeframes:
+            seconds = timeframe_seconds(timeframe)
+            if seconds % self.base_seconds:
+                raise ValueError(f"Timeframe '{timeframe}' is not a multiple of the {self.base} base bars")
+            if seconds != self.base_seconds:
+                self.seconds[timeframe_label(seconds)] = seconds
+        self.base_buffer = OHLCVRingBuffer(capacity, dtype)
+        self.buffers: Dict[str, OHLCVRingBuffer] = {self.base: self.base_buffer}
+        self.buffers.update({label: OHLCVRingBuffer(capacity, dtype) for label in self.seconds})
+
+    @property
+    def timeframes(self):
+        return list(self.buffers)
+
+    @property
+    def last_time(self):
+        return self.base_buffer.last_time
+
+    def __getitem__(self, timeframe: str) -> OHLCVRingBuffer:
+        return self.buffers[timeframe]
+
+    # Fold a later bar into the forming bar `row` (COLUMNS order) in place
+    @staticmethod
+    def _merge(row: np.ndarray, high: float, low: float, close: float, vwap: float, volume: float, count: float):
+        total = row[5] + volume
+        if volume > 0:
+            row[4] = (row[4] * row[5] + vwap * volume) / total if row[5] > 0 else vwap
+        elif row[5] == 0:
+            row[4] = vwap
+        row[1] = max(row[1], high)
+        row[2] = min(row[2], low)
+        row[3] = close
+        row[5] = total
+        row[6] += count
+
+    # One closed base bar (O(1) per timeframe); returns False if it was already seen
+    def on_bar(self, time: int, open_: float, high: float, low: float, close: float,
+               vwap: float = np.nan, volume: float = 0.0, count: float = 0.0) -> bool:
+        if self.last_time is not None and time <= self.last_time:
+            return False
+        self.base_buffer.append(time, open_, high, low, close, vwap, volume, count)
+        for label, seconds in self.seconds.items():
+            buffer = self.buffers[label]
+            start = bucket_start(time, seconds)
+            if buffer.last_time == start:
+                self._merge(buffer.last_row, high, low, close, vwap, volume, count)
+            else:
+                buffer.append(start, open_, high, low, close, vwap, volume, count)
+        return True
+
+    # Many closed base bars at once (warm-up from a stored history): columns keyed like
+    # COLUMNS plus 'time' as epoch seconds or datetimes; a missing vwap is NaN, a missing
+    # count 0. Returns the number of new base bars.
+    def extend(self, columns: Union[Dict[str, np.ndarray], pd.DataFrame]) -> int:
+        times = np.asarray(columns['time'])
+        if times.dtype.kind == 'M':
+            times = times.astype('datetime64[s]').astype(np.int64)
+        times = times.astype(np.int64, copy=False)
+        dtype = self.base_buffer.dtype
+        values = np.empty((len(COLUMNS), len(times)), dtype=dtype)
+        for i, name in enumerate(COLUMNS):
+            if name in columns:
+                values[i] = np.asarray(columns[name], dtype=dtype)
+            else:
+                values[i] = np.nan if name == 'vwap' else 0
+        if self.last_time is not None:
+            keep = times > self.last_time
+            times, values = times[keep], values[:, keep]
+        if not len(times):
+            return 0
+        if np.any(np.diff(times) <= 0):
+            raise ValueError("Base bars must be in strictly increasing time order")
+
+        self.base_buffer.extend_arrays(times, values)
+        for label, seconds in self.seconds.items():
+            buffer = self.buffers[label]
+            starts, block = aggregate(times, values, seconds)
+            if buffer.last_time == starts[0]:
+                # The first aggregate continues the forming bar: merge it like a single base bar
+                self._merge(buffer.last_row, *block[1:, 0])
+                starts, block = starts[1:], block[:, 1:]
+            buffer.extend_arrays(starts, block)
+        return len(times)
+
+    # Zero-copy frame of one timeframe, in the layout KrakenDataHandler.get_ohlc returns
+    def frame(self, timeframe: str) -> pd.DataFrame:
+        return self.buffers[timeframe].frame()
+
+    def frames(self) -> Dict[str, pd.DataFrame]:
+        return {label: buffer.frame() for label, buffer in self.buffers.items()}
+
+
+# Example Usage
+if __name__ == '__main__':
+    resampler = MultiTimeframeResampler('1h', ['4h', '1d'])
+    rng = np.random.default_rng(0)
+    close = 0.4 * np.exp(np.cumsum(rng.normal(0, 0.01, 72)))
+    for i, price in enumerate(close):
+        resampler.on_bar(1700006400 + 3600 * i, price, price * 1.01, price * 0.99, price, price, 1000.0, 10)
+    for label, frame in resampler.frames().items():
+        print(f"[INFO] {label}: {len(frame)} bars\n{frame.tail(2)}")
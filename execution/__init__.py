@@ -1,3 +1,6 @@
 from .trade_executor import TradeExecutor
-from .kraken_api import KrakenAPI
-from .mock_api import MockAPI
+from .data_handler import KrakenDataHandler
+from .market_cache import MarketDataCache
+from .kraken_client import KrakenClient, shared_client
+from .rate_limiter import RateLimiter
+from .order_pipeline import OrderPipeline, OrderHandle
@@ -0,0 +1,124 @@
+# async_data_handler.py
+import asyncio
+import pandas as pd
+from typing import Dict, List, Tuple, Union
+
+from config.config import TIMEFRAMES
+from data.ohlcv_buffer import OHLCVRingBuffer
+from data.ohlc_store import OHLCStore, parse_payload
+from data.resampler import MultiTimeframeResampler
+from execution.async_kraken_client import AsyncKrakenClient
+from execution.data_handler import KrakenDataHandler
+from execution.market_cache import MarketDataCache
+
+
+class AsyncKrakenDataHandler(KrakenDataHandler):
+    # KrakenDataHandler on asyncio: the same methods, arguments and return shapes as
+    # coroutines over a non-blocking AsyncKrakenClient, so many pairs' requests overlap on
+    # one event loop (get_ohlc_many gathers them instead of using threads). The OHLC store,
+    # ring buffers, resamplers and TTL cache are shared with the blocking handler's logic.
+    def __init__(self, store: OHLCStore = None, cache: MarketDataCache = None, client: AsyncKrakenClient = None):
+        super().__init__(store, cache, client.client if client is not None else None)
+        self.api = client if client is not None else AsyncKrakenClient(self.api)
+
+    async def _query(self, method: str, data: dict = None, private: bool = False):
+        query = self.api.query_private if private else self.api.query_public
+        response = await query(method, data or {})
+        if response.get('error'):
+            raise Exception(response['error'])
+        return response['result']
+
+    async def get_balance(self) -> Dict[str, Union[str, float]]:
+        try:
+            return await self.cache.aget(('Balance',), lambda: self._query('Balance', private=True))
+        except Exception as e:
+            print(f"[ERROR] Could not retrieve account balance: {e}")
+            return {}
+
+    async def get_ticker(self, pair: str) -> Dict[str, Union[str, float]]:
+        return await self.get_tickers([pair])
+
+    async def get_tickers(self, pairs: List[str]) -> Dict[str, Dict[str, Union[str, float]]]:
+        try:
+            tickers = await self.cache.aget_many([('Ticker', pair) for pair in pairs], self._fetch_tickers)
+        except Exception as e:
+            print(f"[ERROR] Failed to fetch ticker data for {', '.join(pairs)}: {e}")
+            return {}
+        return {pair: ticker for value in tickers.values() for pair, ticker in value.items()}
+
+    async def _fetch_tickers(self, keys: List[Tuple]) -> Dict[Tuple, dict]:
+        return self._match_tickers(keys, await self._query('Ticker', {'pair': ','.join(pair for _, pair in keys)}))
+
+    async def _public_payload(self, method: str, data: dict) -> bytes:
+        return await self.api.public_payload(method, data)
+
+    async def _sync_ohlc(self, pair: str, interval: int) -> int:
+        columns, last = parse_payload(await self._public_payload('OHLC', self._ohlc_params(pair, interval)))
+        return self.store.merge(pair, interval, columns, last)
+
+    async def sync_ohlc(self, pair: str, interval: int = 60, cached: bool = False) -> int:
+        try:
+            if cached:
+                return await self.cache.aget(('OHLC', self.store.path, pair, interval),
+                                             lambda: self._sync_ohlc(pair, interval))
+            return await self._sync_ohlc(pair, interval)
+        except Exception as e:
+            print(f"[ERROR] Failed to sync OHLC data for {pair}: {e}")
+            return 0
+
+    async def get_ohlc(self, pair: str, interval: int = 60, bars: int = 720) -> pd.DataFrame:
+        await self.sync_ohlc(pair, interval, cached=True)
+        return self.store.frame(pair, interval, bars)
+
+    # `workers` is accepted for the blocking signature; every sync is in flight at once
+    # (bounded by the client's connection pool)
+    async def get_ohlc_many(self, pairs: List[str], interval: int = 60, bars: int = 720,
+                            workers: int = None) -> Dict[str, pd.DataFrame]:
+        pairs = list(dict.fromkeys(pairs))
+        await asyncio.gather(*(self.sync_ohlc(pair, interval, cached=True) for pair in pairs))
+        return {pair: self.store.frame(pair, interval, bars) for pair in pairs}
+
+    async def get_timeframes(self, pair: str, timeframes: List[str] = TIMEFRAMES, interval: int = 60,
+                             capacity: int = 720) -> MultiTimeframeResampler:
+        await self.sync_ohlc(pair, interval, cached=True)
+        return self._resample(pair, timeframes, interval, capacity)
+
+    async def update_ohlc(self, pair: str, interval: int = 60, capacity: int = 720) -> OHLCVRingBuffer:
+        buffer = self._buffer(pair, capacity)
+        try:
+            buffer.extend((await self._query('OHLC', {'pair': pair, 'interval': interval}))[pair])
+        except Exception as e:
+            print(f"[ERROR] Failed to update OHLC data for {pair}: {e}")
+        return buffer
+
+    async def get_open_orders(self) -> Dict[str, Union[str, float]]:
+        try:
+            return (await self.cache.aget(('OpenOrders',), lambda: self._query('OpenOrders', private=True)))['open']
+        except Exception as e:
+            print(f"[ERROR] Could not retrieve open orders: {e}")
+            return {}
+
+    async def get_trade_history(self) -> Dict[str, Union[str, float]]:
+        try:
+            return (await self._query('TradesHistory', private=True))['trades']
+        except Exception as e:
+            print(f"[ERROR] Failed to retrieve trade history: {e}")
+            return {}
+
+    async def close(self):
+        await self.api.close()
+
+
+# Example Usage
+if __name__ == '__main__':
+    async def main():
+        handler = AsyncKrakenDataHandler()
+        try:
+            print(await handler.get_tickers(['ADAUSD', 'LTCUSD', 'DOTUSD']))
+            frames = await handler.get_ohlc_many(['ADAUSD', 'LTCUSD', 'DOTUSD'], interval=60)
+            for pair, frame in frames.items():
+                print(f"[INFO] {pair}: {len(frame)} bars, last close {frame['close'].iloc[-1]}")
+        finally:
+            await handler.close()
+
+    asyncio.run(main())
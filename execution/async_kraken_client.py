@@ -0,0 +1,132 @@
+# async_kraken_client.py
+import asyncio
+import contextlib
+import json
+import urllib.parse
+import aiohttp
+
+from config.config import HTTP_POOL_SIZE
+from execution.kraken_client import KrakenClient, shared_client
+
+
+class AsyncKrakenClient:
+    # Non-blocking counterpart of KrakenClient on one aiohttp session (a keep-alive pool of
+    # pool_size connections). Credentials, nonces, request signing and the per-endpoint
+    # request counter come from the wrapped KrakenClient (the process-wide one by default),
+    # so sync and async callers share one view of the requests sent, and its rate limiter
+    # paces both.
+    def __init__(self, client: KrakenClient = None, pool_size: int = HTTP_POOL_SIZE):
+        self.client = client if client is not None else shared_client()
+        self.pool_size = pool_size
+        self._session = None
+
+    @property
+    def uri(self) -> str:
+        return self.client.uri
+
+    @property
+    def requests(self):
+        return self.client.requests
+
+    def _http(self) -> aiohttp.ClientSession:
+        # Created on first use, inside the running event loop
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                headers={'User-Agent': self.client.session.headers.get('User-Agent', 'krakenex')})
+        return self._session
+
+    async def _throttle(self, method: str, private: bool, cost: float = None):
+        if self.client.limiter is not None:
+            await self.client.limiter.aacquire(method, private, cost)
+
+    # The wrapped client's private-call lock (KrakenClient.query_private), shared with its
+    # threads; polled rather than waited on, so the event loop keeps running
+    @contextlib.asynccontextmanager
+    async def _private_call(self):
+        while not self.client._private_lock.acquire(blocking=False):
+            await asyncio.sleep(0.001)
+        try:
+            yield
+        finally:
+            self.client._private_lock.release()
+
+    async def _request(self, urlpath: str, data: dict, private: bool) -> bytes:
+        self.client._count(urlpath)
+        url = self.client.uri + urlpath
+        if private:
+            # Signed over the exact urlencoded body that is sent
+            headers = {'API-Key': self.client.key, 'API-Sign': self.client._sign(data, urlpath),
+                       'Content-Type': 'application/x-www-form-urlencoded'}
+            request = self._http().post(url, data=urllib.parse.urlencode(data), headers=headers)
+        else:
+            request = self._http().get(url, params={name: str(value) for name, value in data.items()})
+        async with request as response:
+            response.raise_for_status()
+            return await response.read()
+
+    async def query_public(self, method: str, data: dict = None) -> dict:
+        response = json.loads(await self.public_payload(method, data))
+        self.client._check_limit(f'/{self.client.apiversion}/public/{method}', response.get('error'))
+        return response
+
+    # Raw body of a public endpoint, for callers that parse it themselves (parse_payload)
+    async def public_payload(self, method: str, data: dict = None) -> bytes:
+        await self._throttle(method, private=False)
+        return await self._request(f'/{self.client.apiversion}/public/{method}', dict(data or {}), private=False)
+
+    async def query_private(self, method: str, data: dict = None) -> dict:
+        if not self.client.key or not self.client.secret:
+            raise Exception('Either key or secret is not set!')
+        await self._throttle(method, private=True)
+        data = dict(data or {})
+        urlpath = f'/{self.client.apiversion}/private/{method}'
+        # Gathered calls would otherwise race to Kraken with their nonces out of order
+        async with self._private_call():
+            data['nonce'] = self.client._nonce()
+            response = json.loads(await self._request(urlpath, data, private=True))
+        self.client._check_limit(urlpath, response.get('error'))
+        return response
+
+    # Private call with a JSON body (AddOrderBatch), as KrakenClient.query_private_json
+    async def query_private_json(self, method: str, data: dict = None, cost: float = None) -> dict:
+        if not self.client.key or not self.client.secret:
+            raise Exception('Either key or secret is not set!')
+        await self._throttle(method, private=True, cost=cost)
+        urlpath = f'/{self.client.apiversion}/private/{method}'
+        data = dict(data or {})
+        async with self._private_call():
+            data['nonce'] = self.client._nonce()
+            body = json.dumps(data)
+            self.client._count(urlpath)
+            async with self._http().post(self.client.uri + urlpath, data=body,
+                                         headers=self.client.json_headers(urlpath, data['nonce'], body)) as response:
+                response.raise_for_status()
+                result = json.loads(await response.read())
+        self.client._check_limit(urlpath, result.get('error'))
+        return result
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> 'AsyncKrakenClient':
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+# Example Usage
+if __name__ == '__main__':
+    import asyncio
+
+    async def main():
+        async with AsyncKrakenClient() as client:
+            tickers = await asyncio.gather(*(client.query_public('Ticker', {'pair': pair})
+                                             for pair in ('ADAUSD', 'LTCUSD', 'DOTUSD')))
+            print(tickers)
+            print(f"[INFO] Requests sent: {dict(client.requests)}")
+
+    asyncio.run(main())
@@ -0,0 +1,148 @@
+# async_trade_executor.py
+import asyncio
+from typing import Callable, Dict, List, Union
+
+from execution.async_kraken_client import AsyncKrakenClient
+from execution.market_cache import MarketDataCache
+from execution.order_pipeline import backoff_delay, batch_entry, batch_groups, is_retryable, new_userref
+from execution.trade_executor import TradeExecutor
+
+
+class AsyncTradeExecutor(TradeExecutor):
+    # TradeExecutor on asyncio: orders are submitted over a non-blocking AsyncKrakenClient
+    # and retries wait a jittered backoff with asyncio.sleep, so orders for many pairs overlap
+    # on one event loop. As in OrderPipeline, each order carries a userref that is looked up
+    # before a retry is sent, and only transient errors are retried. place_market_order / place_limit_order / place_stop_loss_order are inherited:
+    # they return self._execute_order(...), which is a coroutine here, so they are awaited
+    # the same way and return the same result.
+    def __init__(self, cache: MarketDataCache = None, client: AsyncKrakenClient = None):
+        super().__init__(cache, client.client if client is not None else None)
+        self.api = client if client is not None else AsyncKrakenClient(self.api)
+
+    # Open or closed order placed with this userref, as an AddOrder-shaped result
+    async def _find_existing(self, userref: int) -> Union[Dict, None]:
+        for method, key in (('OpenOrders', 'open'), ('ClosedOrders', 'closed')):
+            response = await self.api.query_private(method, {'userref': userref})
+            if response.get('error'):
+                raise Exception(', '.join(response['error']))
+            for txid, info in response['result'].get(key, {}).items():
+                return {'txid': [txid], 'descr': info.get('descr', {})}
+        return None
+
+    # On the event loop the task is the handle: it resolves to the AddOrder result (None on
+    # failure) and `callback` gets the finished task
+    def submit_order(self, order_data: Dict, callback: Callable[[asyncio.Task], None] = None) -> asyncio.Task:
+        task = asyncio.ensure_future(self._execute_order(order_data))
+        if callback is not None:
+            task.add_done_callback(callback)
+        return task
+
+    def submit_batch(self, orders: List[Dict], callback: Callable[[asyncio.Task], None] = None) -> asyncio.Task:
+        task = asyncio.ensure_future(self.place_batch(orders))
+        if callback is not None:
+            task.add_done_callback(callback)
+        return task
+
+    # Orders of one pair in one AddOrderBatch call, the rest singly, all at once; each
+    # order's AddOrder result, or None where it failed
+    async def place_batch(self, orders: List[Dict]) -> List[Union[Dict, None]]:
+        orders = [dict(order_data, userref=order_data.get('userref', new_userref())) for order_data in orders]
+        results: List[Union[Dict, None]] = [None] * len(orders)
+
+        async def place(pair: str, positions: List[int]):
+            if len(positions) == 1:
+                results[positions[0]] = await self._execute_order(orders[positions[0]])
+                return
+            try:
+                print(f"[INFO] Attempting to place {len(positions)} orders for {pair} in one batch")
+                response = await self.api.query_private_json('AddOrderBatch', {
+                    'pair': pair, 'orders': [batch_entry(orders[position]) for position in positions]},
+                    cost=len(positions))
+                error = ', '.join(response['error']) if response.get('error') else None
+                placed = None if error else response['result'].get('orders', [])
+            except Exception as e:
+                error, placed = str(e), None
+            fallback = placed is None or len(placed) != len(positions)
+            if fallback:
+                error = error or 'no result per order'
+                print(f"[WARNING] Batch for {pair} failed ({error}); submitting its orders one by one.")
+                placed = [{'error': error}] * len(positions)
+            self._invalidate_account()
+            retries = []
+            for position, result in zip(positions, placed):
+                if result.get('error') and (fallback or is_retryable([result['error']])):
+                    retries.append(position)  # Sent alone, after a lookup of its userref
+                elif result.get('error'):
+                    print(f"[FATAL] Order rejected: {result['error']}")
+                else:
+                    print(f"[SUCCESS] Order placed successfully: {result}")
+                    results[position] = {'txid': [result['txid']], 'descr': result.get('descr', {})}
+            retried = await asyncio.gather(*(self._execute_order(orders[position], attempt=1) for position in retries))
+            for position, result in zip(retries, retried):
+                results[position] = result
+
+        await asyncio.gather(*(place(pair, positions) for pair, positions in batch_groups(orders)))
+        return results
+
+    # Execute an order with retry logic, without blocking the event loop between attempts;
+    # `attempt` counts earlier tries (a failed batch), after which the userref is looked up first
+    async def _execute_order(self, order_data: Dict, attempt: int = 0) -> Union[Dict, None]:
+        order_data = dict(order_data)
+        order_data.setdefault('userref', new_userref())
+        while attempt < self.retry_attempts:
+            attempt += 1
+            try:
+                existing = await self._find_existing(order_data['userref']) if attempt > 1 else None
+                if existing is not None:
+                    print(f"[INFO] Order {order_data['userref']} was already placed; not sending it again.")
+                    self._invalidate_account()
+                    return existing
+                print(f"[INFO] Attempting to place order: {order_data}")
+                response = await self.api.query_private('AddOrder', order_data)
+            except Exception as e:
+                error, retryable = str(e), True
+            else:
+                if not response.get('error'):
+                    print(f"[SUCCESS] Order placed successfully: {response['result']}")
+                    self._invalidate_account()
+                    return response['result']
+                error, retryable = ', '.join(response['error']), is_retryable(response['error'])
+            print(f"[ERROR] Failed to place order (Attempt {attempt}): {error}")
+            if not retryable:
+                print(f"[FATAL] Order rejected: {error}")
+                return None
+            if attempt < self.retry_attempts:
+                await asyncio.sleep(backoff_delay(attempt))
+
+        print("[FATAL] Order failed after multiple attempts.")
+        return None
+
+    async def cancel_order(self, order_id: str) -> bool:
+        try:
+            print(f"[INFO] Cancelling order: {order_id}")
+            response = await self.api.query_private('CancelOrder', {'txid': order_id})
+            if response.get('error'):
+                raise Exception(', '.join(response['error']))
+            print(f"[SUCCESS] Order {order_id} cancelled successfully.")
+            self._invalidate_account()
+            return True
+        except Exception as e:
+            print(f"[ERROR] Failed to cancel order {order_id}: {e}")
+            return False
+
+    async def close(self):
+        await self.api.close()
+
+
+# Example Usage
+if __name__ == '__main__':
+    async def main():
+        executor = AsyncTradeExecutor()
+        try:
+            # Both orders are in flight at once
+            print(await asyncio.gather(executor.place_limit_order('ADAUSD', 1.0, 'sell', 0.50),
+                                       executor.place_limit_order('LTCUSD', 0.1, 'sell', 150.0)))
+        finally:
+            await executor.close()
+
+    asyncio.run(main())
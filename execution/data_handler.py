@@ -1,66 +1,185 @@
 # data_handler.py
-import krakenex
-import time
 import pandas as pd
-from typing import Dict, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Union
 
 # Import configuration settings
 
-from config.config import API_KEY, API_SECRET, ALLOWED_PAIRS, API_CALL_DELAY
+from config.config import ALLOWED_PAIRS, TIMEFRAMES, FETCH_WORKERS
+from data.ohlcv_buffer import OHLCVRingBuffer
+from data.ohlc_store import OHLCStore, parse_payload
+from data.resampler import MultiTimeframeResampler
+from execution.kraken_client import KrakenClient, shared_client
+from execution.market_cache import MarketDataCache, shared_cache
+
+
+# 'ADA/USD' -> 'ADAUSD'; Kraken's full names -> the short ones ('XXBTZUSD' -> 'XBTUSD'), as
+# results may be keyed by either
+def pair_altname(name: str) -> str:
+    name = name.replace('/', '')
+    if len(name) == 8 and name[0] in 'XZ' and name[4] in 'XZ':
+        return name[1:4] + name[5:]
+    return name
+
+
+# Run function(item) for every item on a thread pool (for I/O-bound requests that cannot
+# be batched); results keyed by item
+def fan_out(function: Callable[[Any], Any], items: Iterable, workers: int = FETCH_WORKERS) -> Dict[Any, Any]:
+    items = list(dict.fromkeys(items))
+    if len(items) <= 1 or workers <= 1:
+        return {item: function(item) for item in items}
+    with ThreadPoolExecutor(min(workers, len(items))) as pool:
+        return dict(zip(items, pool.map(function, items)))
 
 
 class KrakenDataHandler:
-    def __init__(self):
-        # Set up Kraken API with credentials
-        self.api = krakenex.API()
-        self.api.key = API_KEY
-        self.api.secret = API_SECRET
+    def __init__(self, store: OHLCStore = None, cache: MarketDataCache = None, client: KrakenClient = None,
+                 stream=None):
+        # Kraken API client (the process-wide pooled one unless injected)
+        self.api = client if client is not None else shared_client()
+        self.buffers: Dict[str, OHLCVRingBuffer] = {}  # Latest bars per pair, see update_ohlc
+        self.store = store if store is not None else OHLCStore()  # Persistent OHLC history, see sync_ohlc
+        self.resamplers: Dict[str, MultiTimeframeResampler] = {}  # Higher timeframes per pair, see get_timeframes
+        self._resampled: Dict[str, int] = {}  # Stored bars already folded into each resampler
+        # Ticker, OHLC, balance and open orders are read through this TTL cache
+        self.cache = cache if cache is not None else shared_cache
+        # Optional running MarketStream; its live tickers are served without a request
+        self.stream = stream
+
+    def _query(self, method: str, data: dict = None, private: bool = False):
+        # Result of one Kraken request (raises on API errors, which are never cached)
+        query = self.api.query_private if private else self.api.query_public
+        response = query(method, data or {})
+        if response.get('error'):
+            raise Exception(response['error'])
+        return response['result']
 
     def get_balance(self) -> Dict[str, Union[str, float]]:
         # Fetch the current account balance from Kraken
         try:
-            response = self.api.query_private('Balance')
-            if response.get('error'):
-                raise Exception(response['error'])
-            return response['result']
+            return self.cache.get(('Balance',), lambda: self._query('Balance', private=True))
         except Exception as e:
             print(f"[ERROR] Could not retrieve account balance: {e}")
             return {}
 
     def get_ticker(self, pair: str) -> Dict[str, Union[str, float]]:
         # Get live ticker data for a trading pair (e.g., ADAUSD)
+        return self.get_tickers([pair])
+
+    def get_tickers(self, pairs: List[str]) -> Dict[str, Dict[str, Union[str, float]]]:
+        # Ticker data for many pairs in one request (Kraken takes a comma-separated list),
+        # keyed by the requested names; pairs still cached are not requested again
+        streamed = self._streamed_tickers(pairs)
+        pairs = [pair for pair in pairs if pair not in streamed]
+        if not pairs:
+            return streamed
         try:
-            response = self.api.query_public('Ticker', {'pair': pair})
-            if response.get('error'):
-                raise Exception(response['error'])
-            return response['result']
+            tickers = self.cache.get_many([('Ticker', pair) for pair in pairs], self._fetch_tickers)
         except Exception as e:
-            print(f"[ERROR] Failed to fetch ticker data for {pair}: {e}")
+            print(f"[ERROR] Failed to fetch ticker data for {', '.join(pairs)}: {e}")
+            return streamed
+        return {**streamed, **{pair: ticker for value in tickers.values() for pair, ticker in value.items()}}
+
+    def _streamed_tickers(self, pairs: List[str]) -> Dict[str, dict]:
+        # Tickers the stream already holds, in the REST shape and keyed by the requested names
+        if self.stream is None or not self.stream.connected.is_set():
             return {}
+        tickers = {pair: self.stream.ticker(pair_altname(pair)) for pair in pairs}
+        return {pair: ticker for pair, ticker in tickers.items() if ticker is not None}
+
+    def _fetch_tickers(self, keys: List[Tuple]) -> Dict[Tuple, dict]:
+        return self._match_tickers(keys, self._query('Ticker', {'pair': ','.join(pair for _, pair in keys)}))
+
+    @staticmethod
+    def _match_tickers(keys: List[Tuple], result: dict) -> Dict[Tuple, dict]:
+        # Ticker result -> {('Ticker', requested pair): {requested pair: ticker}}
+        by_altname = {pair_altname(name): ticker for name, ticker in result.items()}
+        fetched = {}
+        for key in keys:
+            pair = key[1]
+            ticker = result.get(pair, by_altname.get(pair_altname(pair)))
+            if ticker is not None:
+                fetched[key] = {pair: ticker}
+        return fetched
+
+    def _public_payload(self, method: str, data: dict) -> bytes:
+        # Raw body of a public endpoint (the request query_public makes, without decoding the
+        # JSON into Python objects)
+        return self.api.public_payload(method, data)
 
-    def get_ohlc(self, pair: str, interval: int = 60) -> pd.DataFrame:
-        # Fetch historical OHLC data for a trading pair
+    def _ohlc_params(self, pair: str, interval: int) -> dict:
+        params = {'pair': pair, 'interval': interval}
+        since = self.store.cursor(pair, interval)
+        if since is not None:
+            params['since'] = since
+        return params
+
+    def _sync_ohlc(self, pair: str, interval: int) -> int:
+        columns, last = parse_payload(self._public_payload('OHLC', self._ohlc_params(pair, interval)))
+        return self.store.merge(pair, interval, columns, last)
+
+    def sync_ohlc(self, pair: str, interval: int = 60, cached: bool = False) -> int:
+        # Fetch only the bars after the stored `last` cursor into the OHLC store (the full
+        # window on the first call); returns the number of new bars. The response body is
+        # parsed straight into typed columns (parse_payload). cached=True skips the request
+        # if the store was synced within the OHLC TTL (and returns that sync's count).
+        try:
+            if cached:
+                return self.cache.get(('OHLC', self.store.path, pair, interval), lambda: self._sync_ohlc(pair, interval))
+            return self._sync_ohlc(pair, interval)
+        except Exception as e:
+            print(f"[ERROR] Failed to sync OHLC data for {pair}: {e}")
+            return 0
+
+    def get_ohlc(self, pair: str, interval: int = 60, bars: int = 720) -> pd.DataFrame:
+        # Latest `bars` OHLC bars for a trading pair, synced incrementally through the store
+        self.sync_ohlc(pair, interval, cached=True)
+        return self.store.frame(pair, interval, bars)
+
+    def get_ohlc_many(self, pairs: List[str], interval: int = 60, bars: int = 720,
+                      workers: int = FETCH_WORKERS) -> Dict[str, pd.DataFrame]:
+        # OHLC has no multi-pair form, so the syncs run concurrently over the client's
+        # connection pool: a cycle over many pairs takes about one round-trip
+        fan_out(lambda pair: self.sync_ohlc(pair, interval, cached=True), pairs, workers)
+        return {pair: self.store.frame(pair, interval, bars) for pair in dict.fromkeys(pairs)}
+
+    def get_timeframes(self, pair: str, timeframes: List[str] = TIMEFRAMES, interval: int = 60,
+                       capacity: int = 720) -> MultiTimeframeResampler:
+        # Sync the pair's base bars once and fold the newly closed ones into its resampler, so
+        # every higher timeframe comes from the same OHLC request (the last stored bar is
+        # still forming and is folded in on a later call, once it has closed)
+        self.sync_ohlc(pair, interval, cached=True)
+        return self._resample(pair, timeframes, interval, capacity)
+
+    def _resample(self, pair: str, timeframes: List[str], interval: int, capacity: int) -> MultiTimeframeResampler:
+        resampler = self.resamplers.get(pair)
+        if resampler is None:
+            resampler = self.resamplers[pair] = MultiTimeframeResampler(interval, timeframes, capacity)
+        stored = self.store.rows(pair, interval)
+        closed = self.store.arrays(pair, interval, bars=stored - self._resampled.get(pair, 0))
+        resampler.extend({name: values[:-1] for name, values in closed.items()})
+        self._resampled[pair] = max(stored - 1, 0)
+        return resampler
+
+    def update_ohlc(self, pair: str, interval: int = 60, capacity: int = 720) -> OHLCVRingBuffer:
+        # Merge the latest OHLC response into the pair's ring buffer instead of building a
+        # new DataFrame; the last row Kraken returns is the forming bar and is updated in place
+        buffer = self._buffer(pair, capacity)
         try:
-            response = self.api.query_public('OHLC', {'pair': pair, 'interval': interval})
-            if response.get('error'):
-                raise Exception(response['error'])
-            data = response['result'][pair]
-            df = pd.DataFrame(data, columns=[
-                'time', 'open', 'high', 'low', 'close', 'vwap', 'volume', 'count'
-            ])
-            df['time'] = pd.to_datetime(df['time'], unit='s')
-            return df
+            buffer.extend(self._query('OHLC', {'pair': pair, 'interval': interval})[pair])
         except Exception as e:
-            print(f"[ERROR] Failed to fetch OHLC data for {pair}: {e}")
-            return pd.DataFrame()
+            print(f"[ERROR] Failed to update OHLC data for {pair}: {e}")
+        return buffer
+
+    def _buffer(self, pair: str, capacity: int) -> OHLCVRingBuffer:
+        if pair not in self.buffers:
+            self.buffers[pair] = OHLCVRingBuffer(capacity)
+        return self.buffers[pair]
 
     def get_open_orders(self) -> Dict[str, Union[str, float]]:
         # Retrieve any currently open orders
         try:
-            response = self.api.query_private('OpenOrders')
-            if response.get('error'):
-                raise Exception(response['error'])
-            return response['result']['open']
+            return self.cache.get(('OpenOrders',), lambda: self._query('OpenOrders', private=True))['open']
         except Exception as e:
             print(f"[ERROR] Could not retrieve open orders: {e}")
             return {}
@@ -68,10 +187,7 @@ class KrakenDataHandler:
     def get_trade_history(self) -> Dict[str, Union[str, float]]:
         # Fetch the account's trade history
         try:
-            response = self.api.query_private('TradesHistory')
-            if response.get('error'):
-                raise Exception(response['error'])
-            return response['result']['trades']
+            return self._query('TradesHistory', private=True)['trades']
         except Exception as e:
             print(f"[ERROR] Failed to retrieve trade history: {e}")
             return {}
@@ -0,0 +1,144 @@
+# kraken_client.py
+import base64
+import hashlib
+import hmac
+import json
+import threading
+import time
+from collections import Counter
+from typing import Dict
+import krakenex
+from requests.adapters import HTTPAdapter
+
+from config.config import API_KEY, API_SECRET, HTTP_POOL_SIZE
+from execution.rate_limiter import RateLimiter
+
+# Errors Kraken answers with once a call counter is over its limit
+RATE_LIMIT_ERRORS = ('EAPI:Rate limit exceeded', 'EOrder:Rate limit exceeded', 'EGeneral:Too many requests')
+
+
+class KrakenClient(krakenex.API):
+    # krakenex.API made safe to share between modules and threads: one keep-alive HTTP
+    # connection pool (HTTP_POOL_SIZE connections, so concurrent fan-outs reuse them rather
+    # than opening and discarding extra ones), responses kept per call instead of on the
+    # shared `response` attribute, strictly increasing nonces, and a count of requests
+    # per endpoint for the whole process. With a `limiter`, every request first waits for
+    # its turn on the key's call counters (the shared client always has one). Private calls
+    # are sent one at a time (see query_private); other programs using the same key need a
+    # nonce window set on it, or their calls and ours reject each other's nonces.
+    def __init__(self, key: str = API_KEY, secret: str = API_SECRET, pool_size: int = HTTP_POOL_SIZE,
+                 limiter: RateLimiter = None):
+        super().__init__(key, secret)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.requests = Counter()  # Endpoint ('Ticker', 'AddOrder', ...) -> requests sent
+        self.limiter = limiter
+        self._lock = threading.Lock()
+        self._private_lock = threading.Lock()  # Held by a private call from its nonce to its response
+        self._last_nonce = 0
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+
+    def _count(self, urlpath: str):
+        with self._lock:
+            self.requests[urlpath.rsplit('/', 1)[-1]] += 1
+
+    def _throttle(self, urlpath: str):
+        if self.limiter is not None:
+            self.limiter.acquire(urlpath.rsplit('/', 1)[-1], '/private/' in urlpath)
+
+    # A rate-limit answer means the counter model is behind Kraken's: hold further calls
+    def _check_limit(self, urlpath: str, errors):
+        if self.limiter is not None and any(error in RATE_LIMIT_ERRORS for error in errors or ()):
+            self.limiter.exhaust(urlpath.rsplit('/', 1)[-1], '/private/' in urlpath)
+
+    def _nonce(self) -> int:
+        with self._lock:
+            self._last_nonce = max(self._last_nonce + 1, int(1000 * time.time()))
+            return self._last_nonce
+
+    # Kraken rejects a nonce lower than one it has already seen ('EAPI:Invalid nonce'), and
+    # concurrent calls on separate connections can arrive in any order. So after its wait
+    # for the limiter, a private call holds _private_lock from taking its nonce until its
+    # response is in, and nonces reach Kraken in the order they were taken.
+    def query_private(self, method: str, data: dict = None, timeout=None) -> dict:
+        self._throttle(f'/{self.apiversion}/private/{method}')
+        with self._private_lock:
+            return super().query_private(method, data, timeout)
+
+    # Private call with a JSON body, for endpoints taking nested arrays (AddOrderBatch);
+    # `cost` is what it counts against the rate limiter
+    def query_private_json(self, method: str, data: dict = None, timeout=None, cost: float = None) -> dict:
+        if not self.key or not self.secret:
+            raise Exception('Either key or secret is not set!')
+        urlpath = f'/{self.apiversion}/private/{method}'
+        if self.limiter is not None:
+            self.limiter.acquire(method, True, cost)
+        data = dict(data or {})
+        with self._private_lock:
+            data['nonce'] = self._nonce()
+            body = json.dumps(data)
+            self._count(urlpath)
+            response = self.session.post(self.uri + urlpath, data=body,
+                                         headers=self.json_headers(urlpath, data['nonce'], body), timeout=timeout)
+        response.raise_for_status()
+        result = response.json(**self._json_options)
+        self._check_limit(urlpath, result.get('error'))
+        return result
+
+    # Headers of a JSON request: the signature covers the nonce and the exact body sent
+    def json_headers(self, urlpath: str, nonce: int, body: str) -> Dict[str, str]:
+        message = urlpath.encode() + hashlib.sha256((str(nonce) + body).encode()).digest()
+        signature = hmac.new(base64.b64decode(self.secret), message, hashlib.sha512)
+        return {'API-Key': self.key, 'API-Sign': base64.b64encode(signature.digest()).decode(),
+                'Content-Type': 'application/json'}
+
+    def _query(self, urlpath: str, data: dict, headers: dict = None, timeout=None):
+        if '/public/' in urlpath:
+            self._throttle(urlpath)
+        self._count(urlpath)
+        url = self.uri + urlpath
+        if '/public/' in urlpath:
+            response = self.session.get(url, params=data or {}, headers=headers or {}, timeout=timeout)
+        else:
+            response = self.session.post(url, data=data or {}, headers=headers or {}, timeout=timeout)
+        self.response = response  # As krakenex keeps it; never read back, so concurrent calls cannot mix results
+        if response.status_code not in (200, 201, 202):
+            response.raise_for_status()
+        result = response.json(**self._json_options)
+        self._check_limit(urlpath, result.get('error'))
+        return result
+
+    # Raw body of a public endpoint, for callers that parse it themselves (parse_payload)
+    def public_payload(self, method: str, data: dict = None, timeout=None) -> bytes:
+        urlpath = f'/{self.apiversion}/public/{method}'
+        self._throttle(urlpath)
+        self._count(urlpath)
+        response = self.session.get(self.uri + urlpath, params=data or {}, timeout=timeout)
+        response.raise_for_status()
+        if b'Rate limit' in response.content[:100] or b'Too many' in response.content[:100]:
+            self._check_limit(urlpath, json.loads(response.content).get('error'))
+        return response.content
+
+
+_shared: Dict[str, KrakenClient] = {}
+_shared_lock = threading.Lock()
+
+
+# The process-wide client every module uses unless one is injected
+def shared_client() -> KrakenClient:
+    with _shared_lock:
+        if 'client' not in _shared:
+            _shared['client'] = KrakenClient(limiter=RateLimiter())
+        return _shared['client']
+
+
+# Example Usage
+if __name__ == '__main__':
+    client = shared_client()
+    print(client.query_public('Time'))
+    print(client.query_public('Ticker', {'pair': 'ADAUSD'})['result'])
+    print(f"[INFO] Requests sent: {dict(client.requests)}, rate limiter: {client.limiter.stats()}")
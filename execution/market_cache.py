@@ -0,0 +1,134 @@
+# market_cache.py
+import asyncio
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from config.config import MARKET_DATA_TTL
+
+
+class MarketDataCache:
+    # Read-through cache for Kraken responses, keyed by (endpoint, *arguments) with a TTL
+    # per endpoint. Concurrent requests for the same key while it is being fetched wait for
+    # that one request instead of sending their own. Failed fetches are not cached (the
+    # error is raised to every waiting caller). Cached values are shared, not copied.
+    def __init__(self, ttl: Dict[str, float] = MARKET_DATA_TTL, clock: Callable[[], float] = time.monotonic):
+        self.ttl = dict(ttl)
+        self.clock = clock
+        self.hits = Counter()  # Per endpoint; includes callers that joined an in-flight request
+        self.misses = Counter()  # Per endpoint; one per network request
+        self._entries: Dict[Tuple, Tuple[float, Any]] = {}  # key -> (expiry, value)
+        self._pending: Dict[Tuple, Future] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple, fetch: Callable[[], Any]) -> Any:
+        return self.get_many([key], lambda keys: {key: fetch()})[key]
+
+    # Values for several keys with at most one fetch_missing(keys) call for the ones neither
+    # cached nor in flight (e.g. one Ticker request for many pairs). fetch_missing returns
+    # {key: value}; keys it leaves out are missing from the result and are not cached.
+    def get_many(self, keys: List[Tuple], fetch_missing: Callable[[List[Tuple]], Dict[Tuple, Any]]) -> Dict[Tuple, Any]:
+        values, waiting, missing = self._claim(keys)
+        if missing:
+            try:
+                fetched = fetch_missing(list(missing))
+            except BaseException as e:
+                self._fail(missing, e)
+                raise
+            values.update(self._settle(missing, fetched))
+        for key, future in waiting.items():
+            try:
+                values[key] = future.result()
+            except KeyError:
+                pass
+        return values
+
+    # *asyncio variants: fetch is a coroutine function, and waiting for a request in flight
+    # (from a thread or another task) suspends the task instead of blocking the loop*
+    async def aget(self, key: Tuple, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        async def fetch_one(keys):
+            return {key: await fetch()}
+        return (await self.aget_many([key], fetch_one))[key]
+
+    async def aget_many(self, keys: List[Tuple],
+                        fetch_missing: Callable[[List[Tuple]], Awaitable[Dict[Tuple, Any]]]) -> Dict[Tuple, Any]:
+        values, waiting, missing = self._claim(keys)
+        if missing:
+            try:
+                fetched = await fetch_missing(list(missing))
+            except BaseException as e:
+                self._fail(missing, e)
+                raise
+            values.update(self._settle(missing, fetched))
+        for key, future in waiting.items():
+            try:
+                values[key] = await asyncio.wrap_future(future)
+            except KeyError:
+                pass
+        return values
+
+    # Split keys into fresh values, requests in flight to wait for, and keys this caller
+    # must fetch (registered as in flight)
+    def _claim(self, keys: List[Tuple]) -> Tuple[Dict[Tuple, Any], Dict[Tuple, Future], Dict[Tuple, Future]]:
+        values, waiting, missing = {}, {}, {}
+        with self._lock:
+            now = self.clock()
+            for key in dict.fromkeys(keys):
+                entry = self._entries.get(key)
+                if entry is not None and now < entry[0]:
+                    self.hits[key[0]] += 1
+                    values[key] = entry[1]
+                elif key in self._pending:
+                    self.hits[key[0]] += 1
+                    waiting[key] = self._pending[key]
+                else:
+                    self.misses[key[0]] += 1
+                    missing[key] = self._pending[key] = Future()
+        return values, waiting, missing
+
+    def _settle(self, missing: Dict[Tuple, Future], fetched: Dict[Tuple, Any]) -> Dict[Tuple, Any]:
+        with self._lock:
+            now = self.clock()
+            for key in missing:
+                del self._pending[key]
+                if key in fetched:
+                    self._entries[key] = (now + self.ttl.get(key[0], 0), fetched[key])
+        for key, future in missing.items():
+            if key in fetched:
+                future.set_result(fetched[key])
+            else:
+                future.set_exception(KeyError(f"No data returned for {key}"))
+        return {key: fetched[key] for key in missing if key in fetched}
+
+    def _fail(self, missing: Dict[Tuple, Future], error: BaseException):
+        with self._lock:
+            for key in missing:
+                del self._pending[key]
+        for future in missing.values():
+            future.set_exception(error)
+
+    # Drop entries whose key starts with `prefix` (everything if no prefix), e.g. the
+    # balance after an order is placed
+    def invalidate(self, *prefix):
+        with self._lock:
+            for key in [key for key in self._entries if key[:len(prefix)] == prefix]:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {endpoint: {'hits': self.hits[endpoint], 'misses': self.misses[endpoint]}
+                for endpoint in sorted(set(self.hits) | set(self.misses))}
+
+
+# One cache per process, so every KrakenDataHandler (bot, risk manager, arbitrage) and the
+# trade executor share it
+shared_cache = MarketDataCache()
+
+
+# Example Usage
+if __name__ == '__main__':
+    cache = MarketDataCache({'Ticker': 5})
+    for _ in range(3):
+        print(cache.get(('Ticker', 'ADAUSD'), lambda: {'ADAUSD': {'c': ['0.85', '1']}}))
+    print(f"[INFO] Cache stats: {cache.stats()}")
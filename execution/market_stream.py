@@ -0,0 +1,317 @@
+# market_stream.py
+import asyncio
+import json
+import threading
+import zlib
+from bisect import bisect_left
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+import aiohttp
+import numpy as np
+
+from config.config import KRAKEN_WS_URL, BOOK_DEPTH
+from data.ohlcv_buffer import OHLCVRingBuffer
+from execution.data_handler import pair_altname
+
+# REST asset names the v2 WebSocket API spells differently
+WS_ASSET_NAMES = {'XBT': 'BTC', 'XDG': 'DOGE'}
+# Quote assets of Kraken pairs, longest first so 'ADAUSDT' splits as ADA / USDT
+QUOTE_ASSETS = ('USDT', 'USDC', 'USD', 'EUR', 'GBP', 'CAD', 'JPY', 'CHF', 'AUD', 'XBT', 'ETH', 'DAI')
+
+# Kraken's book checksum: CRC32 over the top 10 asks (best first) then the top 10 bids, each
+# level as price then quantity, formatted with the pair's precision and stripped of the
+# decimal point and leading zeros
+def book_checksum(asks: Iterable[Tuple[float, float]], bids: Iterable[Tuple[float, float]],
+                  price_precision: int, qty_precision: int) -> int:
+    def digits(value: float, precision: int) -> str:
+        return f'{value:.{precision}f}'.replace('.', '').lstrip('0')
+    text = ''.join(digits(price, price_precision) + digits(qty, qty_precision)
+                   for side in (asks, bids) for price, qty in list(side)[:10])
+    return zlib.crc32(text.encode())
+
+
+class OrderBook:
+    # L2 order book of one pair: quantity per price level plus a sorted price list per side
+    # (bids stored negated, so both sides ascend from the best level). Best bid/ask are the
+    # first entries (O(1)); adding or removing a level is a bisect and a shift over at most
+    # `depth` levels. After every update the book is truncated to `depth`, as Kraken does.
+    # The stream thread writes while bot threads read: a level's quantity is stored before
+    # its key is listed and unlisted before it is removed, and readers skip a level whose
+    # quantity is already gone.
+    def __init__(self, depth: int = BOOK_DEPTH, price_precision: int = 8, qty_precision: int = 8):
+        self.depth = depth
+        self.price_precision = price_precision
+        self.qty_precision = qty_precision
+        self.valid = False  # True once a snapshot arrived and every checksum since matched
+        self._keys = {'asks': [], 'bids': []}  # Sorted keys: ask prices, negated bid prices
+        self._qty = {'asks': {}, 'bids': {}}
+
+    def _apply(self, side: str, levels: Iterable[Dict[str, float]]):
+        keys, quantities = self._keys[side], self._qty[side]
+        sign = -1.0 if side == 'bids' else 1.0
+        for level in levels:
+            price, qty = float(level['price']), float(level['qty'])
+            key = sign * price
+            if qty == 0:
+                if price in quantities:
+                    del keys[bisect_left(keys, key)]
+                    del quantities[price]
+                continue
+            listed = price in quantities
+            quantities[price] = qty
+            if not listed:
+                keys.insert(bisect_left(keys, key), key)
+        dropped = keys[self.depth:]
+        del keys[self.depth:]
+        for key in dropped:
+            del quantities[sign * key]
+
+    def snapshot(self, bids: Iterable[Dict[str, float]], asks: Iterable[Dict[str, float]]):
+        self._keys = {'asks': [], 'bids': []}
+        self._qty = {'asks': {}, 'bids': {}}
+        self.update(bids, asks)
+
+    def update(self, bids: Iterable[Dict[str, float]], asks: Iterable[Dict[str, float]]):
+        self._apply('bids', bids)
+        self._apply('asks', asks)
+
+    # Compare with the exchange's checksum; a mismatch marks the book invalid until the
+    # next snapshot
+    def verify(self, checksum: Optional[int]) -> bool:
+        self.valid = checksum is None or self.checksum() == int(checksum)
+        return self.valid
+
+    def checksum(self) -> int:
+        return book_checksum(self.asks(10), self.bids(10), self.price_precision, self.qty_precision)
+
+    # Levels best first, as (price, quantity)
+    def _levels(self, side: str, levels: int = None) -> List[Tuple[float, float]]:
+        sign = -1.0 if side == 'bids' else 1.0
+        keys, quantities = self._keys[side][:levels], self._qty[side]  # A copy of the keys
+        return [(sign * key, qty) for key in keys if (qty := quantities.get(sign * key)) is not None]
+
+    def asks(self, levels: int = None) -> List[Tuple[float, float]]:
+        return self._levels('asks', levels)
+
+    def bids(self, levels: int = None) -> List[Tuple[float, float]]:
+        return self._levels('bids', levels)
+
+    @property
+    def best_ask(self) -> Optional[Tuple[float, float]]:
+        levels = self._levels('asks', 2)  # The next level if the best was just removed
+        return levels[0] if levels else None
+
+    @property
+    def best_bid(self) -> Optional[Tuple[float, float]]:
+        levels = self._levels('bids', 2)  # The next level if the best was just removed
+        return levels[0] if levels else None
+
+    @property
+    def mid(self) -> Optional[float]:
+        bid, ask = self.best_bid, self.best_ask
+        return (bid[0] + ask[0]) / 2 if bid and ask else None
+
+
+def _epoch_seconds(timestamp: str) -> int:
+    # '2025-01-01T12:00:00.000000000Z' -> epoch seconds
+    return int(np.datetime64(timestamp.rstrip('Z'), 's').astype(np.int64))
+
+
+class MarketStream:
+    # Kraken WebSocket (v2) market data for a set of pairs: ticker, trades, the forming OHLC
+    # bar and an L2 order book per pair, each kept current from the public channels instead
+    # of polling REST. State is keyed by REST pair name ('ADAUSD') and read in O(1):
+    # books[pair].best_bid, tickers[pair], bars[pair] (an OHLCVRingBuffer whose last bar is
+    # the forming one, so it can be handed to TechnicalStrategy.buffers). Book checksums are
+    # verified on every message; a mismatch resubscribes that pair's book for a new snapshot.
+    def __init__(self, pairs: List[str], url: str = KRAKEN_WS_URL, depth: int = BOOK_DEPTH,
+                 interval: int = 60, capacity: int = 720, trades: int = 1000):
+        self.symbols = {pair_altname(pair): _ws_symbol(pair) for pair in pairs}  # 'ADAUSD' -> 'ADA/USD'
+        self.url = url
+        self.depth = depth
+        self.interval = interval
+        self.books: Dict[str, OrderBook] = {pair: OrderBook(depth) for pair in self.symbols}
+        self.tickers: Dict[str, Dict[str, float]] = {}
+        self.trades: Dict[str, Deque[Tuple[int, float, float, str]]] = {pair: deque(maxlen=trades) for pair in self.symbols}
+        self.bars: Dict[str, OHLCVRingBuffer] = {pair: OHLCVRingBuffer(capacity) for pair in self.symbols}
+        self.resubscriptions = 0
+        self.malformed = 0  # Frames the handlers could not apply (skipped)
+        self.connected = threading.Event()
+        self._pairs = {symbol: pair for pair, symbol in self.symbols.items()}
+        self._socket = None
+        self._request_id = 0
+        self._loop = None
+        self._thread = None
+        self._stopping = False
+
+    # REST-shaped ticker (the fields KrakenDataHandler.get_ticker callers read), with bid and
+    # ask taken from the live book while it is valid
+    def ticker(self, pair: str) -> Optional[Dict[str, List[str]]]:
+        ticker = self.tickers.get(pair)
+        if ticker is None:
+            return None
+        book = self.books[pair]
+        bid = book.best_bid if book.valid and book.best_bid else (ticker['bid'], ticker['bid_qty'])
+        ask = book.best_ask if book.valid and book.best_ask else (ticker['ask'], ticker['ask_qty'])
+        return {'a': [str(ask[0]), '1', str(ask[1])], 'b': [str(bid[0]), '1', str(bid[1])],
+                'c': [str(ticker['last']), '0'], 'v': [str(ticker['volume'])] * 2,
+                'p': [str(ticker['vwap'])] * 2, 'l': [str(ticker['low'])] * 2, 'h': [str(ticker['high'])] * 2}
+
+    # *Message handling (synchronous, so recorded frames can be fed in directly)*
+    def handle(self, message: Dict[str, Any]) -> List[Dict[str, Any]]:
+        # Apply one decoded message; returns any requests to send back (resubscriptions)
+        channel = message.get('channel')
+        if channel == 'book':
+            return self._on_book(message)
+        if channel == 'instrument':
+            self._on_instrument(message.get('data', {}))
+            return []
+        handler = {'ticker': self._on_ticker, 'trade': self._on_trade, 'ohlc': self._on_ohlc}.get(channel)
+        if handler is not None:
+            for item in message.get('data', []):
+                handler(item)
+        return []
+
+    def _on_instrument(self, data: Dict[str, Any]):
+        # Pair precisions, which the book checksum is formatted with. A subscribed symbol
+        # missing from the listing is an asset v2 names differently (see WS_ASSET_NAMES).
+        listed = set()
+        for info in data.get('pairs', []):
+            listed.add(info['symbol'])
+            pair = self._pairs.get(info['symbol'])
+            if pair is not None:
+                self.books[pair].price_precision = info['price_precision']
+                self.books[pair].qty_precision = info['qty_precision']
+        if listed:
+            for symbol in set(self._pairs) - listed:
+                print(f"[WARNING] {self._pairs[symbol]}: Kraken lists no WebSocket pair {symbol}.")
+
+    def _on_book(self, message: Dict[str, Any]) -> List[Dict[str, Any]]:
+        requests = []
+        for item in message.get('data', []):
+            pair = self._pairs.get(item['symbol'])
+            if pair is None:
+                continue
+            book = self.books[pair]
+            if message.get('type') == 'snapshot':
+                book.snapshot(item.get('bids', []), item.get('asks', []))
+            elif not book.valid:
+                continue  # Waiting for the snapshot that follows a resubscription
+            else:
+                book.update(item.get('bids', []), item.get('asks', []))
+            if not book.verify(item.get('checksum')):
+                print(f"[WARNING] Order book checksum mismatch for {pair}. Resubscribing.")
+                self.resubscriptions += 1
+                requests.append(self._request('unsubscribe', 'book', [item['symbol']], depth=self.depth))
+                requests.append(self._request('subscribe', 'book', [item['symbol']], depth=self.depth))
+        return requests
+
+    def _on_ticker(self, item: Dict[str, Any]):
+        pair = self._pairs.get(item['symbol'])
+        if pair is not None:
+            self.tickers[pair] = item
+
+    def _on_trade(self, item: Dict[str, Any]):
+        pair = self._pairs.get(item['symbol'])
+        if pair is not None:
+            self.trades[pair].append((_epoch_seconds(item['timestamp']), item['price'], item['qty'], item['side']))
+
+    def _on_ohlc(self, item: Dict[str, Any]):
+        # Updates of the forming bar replace it in place; a new interval_begin appends a bar
+        pair = self._pairs.get(item['symbol'])
+        if pair is None or item.get('interval', self.interval) != self.interval:
+            return
+        time, bars = _epoch_seconds(item['interval_begin']), self.bars[pair]
+        if bars.last_time is None or time >= bars.last_time:
+            bars.update(time, item['open'], item['high'], item['low'], item['close'], item['vwap'],
+                        item['volume'], item['trades'])
+
+    def _request(self, method: str, channel: str, symbols: List[str] = None, **params) -> Dict[str, Any]:
+        self._request_id += 1
+        params = {'channel': channel, **params}
+        if symbols is not None:
+            params['symbol'] = symbols
+        return {'method': method, 'params': params, 'req_id': self._request_id}
+
+    def subscriptions(self) -> List[Dict[str, Any]]:
+        symbols = list(self.symbols.values())
+        return [self._request('subscribe', 'instrument', snapshot=True),
+                self._request('subscribe', 'book', symbols, depth=self.depth),
+                self._request('subscribe', 'ticker', symbols),
+                self._request('subscribe', 'trade', symbols, snapshot=False),
+                self._request('subscribe', 'ohlc', symbols, interval=self.interval)]
+
+    # *Connection*
+    async def run(self, reconnect_delay: float = 1.0):
+        # Consume the feed until stop(); reconnects (and resubscribes) after a dropped connection
+        async with aiohttp.ClientSession() as session:
+            while not self._stopping:
+                try:
+                    async with session.ws_connect(self.url, heartbeat=30) as socket:
+                        self._socket = socket
+                        for request in self.subscriptions():
+                            await socket.send_json(request)
+                        self.connected.set()
+                        async for frame in socket:
+                            if frame.type != aiohttp.WSMsgType.TEXT:
+                                break
+                            try:
+                                requests = self.handle(json.loads(frame.data))
+                            except Exception as e:  # One bad frame must not end the feed
+                                self.malformed += 1
+                                print(f"[WARNING] Skipping malformed market stream frame ({type(e).__name__}: {e}).")
+                                continue
+                            for request in requests:
+                                await socket.send_json(request)
+                except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+                    # Dropped, reset or timed out: reconnect below
+                    print(f"[ERROR] Market stream connection failed: {type(e).__name__}: {e}")
+                finally:
+                    self._socket = None
+                    self.connected.clear()
+                    for book in self.books.values():
+                        book.valid = False
+                if not self._stopping:
+                    await asyncio.sleep(reconnect_delay)
+
+    # Run the feed on a background thread, for the blocking bot modules
+    def start(self) -> 'MarketStream':
+        self._stopping = False
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_until_complete, args=(self.run(),), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        if self._thread is not None:
+            asyncio.run_coroutine_threadsafe(self.close(), self._loop)
+            self._thread.join(timeout)
+            self._thread = None
+
+    # Ends run() from its own event loop
+    async def close(self):
+        self._stopping = True
+        if self._socket is not None:
+            await self._socket.close()
+
+
+def _ws_symbol(pair: str) -> str:
+    # 'ADAUSD' / 'ADA/USD' -> the WebSocket symbol 'ADA/USD'; 'XBTUSD' / 'XXBTZUSD' -> 'BTC/USD'
+    if '/' in pair:
+        base, quote = pair.split('/')
+    else:
+        name = pair_altname(pair)
+        quote = next((asset for asset in QUOTE_ASSETS if name.endswith(asset) and len(name) > len(asset)), name[-3:])
+        base, quote = name[:-len(quote)], quote
+    return '/'.join(WS_ASSET_NAMES.get(asset, asset) for asset in (base, quote))
+
+
+# Example Usage
+if __name__ == '__main__':
+    import time
+    stream = MarketStream(['ADAUSD', 'LTCUSD']).start()
+    stream.connected.wait(10)
+    time.sleep(5)
+    for pair, book in stream.books.items():
+        print(f"[INFO] {pair}: bid {book.best_bid}, ask {book.best_ask}, valid {book.valid}, ticker {stream.ticker(pair)}")
+    stream.stop()
@@ -0,0 +1,296 @@
+# order_pipeline.py
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config.config import ORDER_WORKERS, ORDER_BACKOFF, ORDER_POLL_INTERVAL, BATCH_MAX_ORDERS
+
+# Kraken errors worth retrying (the exchange was busy or throttled us, or a concurrent call's
+# nonce arrived first); any other error answer (insufficient funds, invalid arguments, ...)
+# fails the order at once
+RETRYABLE_ERRORS = ('EService:', 'EAPI:Rate limit', 'EOrder:Rate limit', 'EGeneral:Temporary', 'EGeneral:Too many',
+                    'EAPI:Invalid nonce')
+# Kraken order status -> handle status
+ORDER_STATUS = {'pending': 'open', 'open': 'open', 'closed': 'filled', 'canceled': 'canceled', 'expired': 'expired'}
+FINAL_STATUS = ('filled', 'canceled', 'expired', 'failed')
+
+# Client order references: 32-bit, increasing, and different from the previous run's
+_userrefs = itertools.count(int(time.time() * 10) % 2 ** 31)
+_userref_lock = threading.Lock()
+
+
+def new_userref() -> int:
+    with _userref_lock:
+        return next(_userrefs) % 2 ** 31
+
+
+def is_retryable(errors: List[str]) -> bool:
+    return any(error.startswith(RETRYABLE_ERRORS) for error in errors)
+
+
+# "Full jitter" exponential backoff: a uniform delay up to base * 2^(attempt-1), capped, so
+# retries from many orders spread out instead of arriving together
+def backoff_delay(attempt: int, base: float = ORDER_BACKOFF[0], cap: float = ORDER_BACKOFF[1]) -> float:
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+# Split orders for AddOrderBatch: (pair, positions in `orders`) per call, up to `size` orders
+# of one pair each; groups of one are left for single submission
+def batch_groups(orders: List[Dict], size: int = BATCH_MAX_ORDERS) -> List[Tuple[str, List[int]]]:
+    by_pair: Dict[str, List[int]] = {}
+    for position, order in enumerate(orders):
+        by_pair.setdefault(order['pair'], []).append(position)
+    return [(pair, positions[start:start + size]) for pair, positions in by_pair.items()
+            for start in range(0, len(positions), size)]
+
+
+# One entry of AddOrderBatch's `orders` (the pair is given once for the batch, and the JSON
+# body takes decimals as strings)
+def batch_entry(order_data: Dict) -> Dict:
+    return {name: str(value) if isinstance(value, float) else value
+            for name, value in order_data.items() if name != 'pair'}
+
+
+class OrderHandle:
+    # One submitted order: `future` resolves to the AddOrder result (or raises once the order
+    # has failed), `status` follows queued -> submitting (-> retrying) -> open -> filled /
+    # canceled / expired, or failed, and every change is passed to the callbacks
+    def __init__(self, order_data: Dict, userref: int):
+        self.order_data = order_data
+        self.userref = userref
+        self.future = Future()
+        self.status = 'queued'
+        self.txid: Optional[str] = None
+        self.filled_volume = 0.0
+        self.attempts = 0
+        self.error: Optional[str] = None
+        self.closed = threading.Event()  # Set once the status is final
+        self._callbacks: List[Callable[['OrderHandle'], None]] = []
+        self._lock = threading.Lock()
+
+    # Called with the handle on every status change (and once now, with the current status)
+    def on_status(self, callback: Callable[['OrderHandle'], None]) -> 'OrderHandle':
+        with self._lock:
+            self._callbacks.append(callback)
+        callback(self)
+        return self
+
+    def _set_status(self, status: str, filled_volume: float = None):
+        with self._lock:
+            changed = status != self.status or (filled_volume is not None and filled_volume != self.filled_volume)
+            self.status = status
+            if filled_volume is not None:
+                self.filled_volume = filled_volume
+            callbacks = list(self._callbacks) if changed else []
+        if status in FINAL_STATUS:
+            self.closed.set()
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception as e:
+                print(f"[ERROR] Order status callback failed for {self.userref}: {e}")
+
+    def result(self, timeout: float = None) -> Dict:
+        return self.future.result(timeout)
+
+    def done(self) -> bool:
+        return self.future.done()
+
+
+class OrderPipeline:
+    # Submits orders from a pool of `workers` threads and returns handles at once. The
+    # threads overlap order bookkeeping and callers' waits, but KrakenClient sends private
+    # calls one at a time (nonce order), so the requests themselves do not overlap.
+    # Every order carries a userref; a failed submission is retried after a jittered
+    # exponential backoff scheduled on a timer (no thread sleeps through it), and before a
+    # retry is sent the userref is looked up in open and closed orders, so an order whose
+    # first response was lost is adopted rather than placed twice. Placed orders are
+    # polled in one QueryOrders call per interval until they are filled, canceled or expired.
+    def __init__(self, executor: 'TradeExecutor', workers: int = ORDER_WORKERS, backoff: Tuple[float, float] = ORDER_BACKOFF,
+                 poll_interval: float = ORDER_POLL_INTERVAL):
+        self.executor = executor
+        self.backoff = backoff
+        self.poll_interval = poll_interval
+        self._pool = ThreadPoolExecutor(workers, thread_name_prefix='order')
+        self._watching: Dict[str, OrderHandle] = {}  # txid -> placed handle awaiting its fill
+        self._watch_lock = threading.Lock()
+        self._watcher = None
+        self._stopping = threading.Event()
+
+    @property
+    def api(self):
+        return self.executor.api
+
+    def _handle(self, order_data: Dict, callback: Callable[[OrderHandle], None] = None) -> OrderHandle:
+        order_data = dict(order_data)
+        order_data.setdefault('userref', new_userref())
+        handle = OrderHandle(order_data, order_data['userref'])
+        if callback is not None:
+            handle.on_status(callback)
+        return handle
+
+    def submit(self, order_data: Dict, callback: Callable[[OrderHandle], None] = None) -> OrderHandle:
+        handle = self._handle(order_data, callback)
+        self._pool.submit(self._attempt, handle)
+        return handle
+
+    # Orders of one pair go out together through AddOrderBatch; orders that are alone for
+    # their pair are submitted singly. One handle per order.
+    def submit_batch(self, orders: List[Dict], callback: Callable[[OrderHandle], None] = None) -> List[OrderHandle]:
+        handles = [self._handle(order_data, callback) for order_data in orders]
+        for pair, positions in batch_groups(orders):
+            if len(positions) > 1:
+                self._pool.submit(self._attempt_batch, pair, [handles[position] for position in positions])
+            else:
+                self._pool.submit(self._attempt, handles[positions[0]])
+        return handles
+
+    # Open or closed order placed with this userref, as (txid, order info)
+    def _find_existing(self, userref: int) -> Optional[Tuple[str, Dict]]:
+        for method, key in (('OpenOrders', 'open'), ('ClosedOrders', 'closed')):
+            response = self.api.query_private(method, {'userref': userref})
+            if response.get('error'):
+                raise Exception(', '.join(response['error']))
+            for txid, info in response['result'].get(key, {}).items():
+                return txid, info
+        return None
+
+    def _attempt(self, handle: OrderHandle):
+        handle.attempts += 1
+        try:
+            if handle.attempts > 1:
+                existing = self._find_existing(handle.userref)
+                if existing is not None:
+                    txid, info = existing
+                    print(f"[INFO] Order {handle.userref} was already placed as {txid}; not sending it again.")
+                    self._placed(handle, {'txid': [txid], 'descr': info.get('descr', {})}, info.get('status', 'open'))
+                    return
+            handle._set_status('submitting')
+            print(f"[INFO] Attempting to place order: {handle.order_data}")
+            response = self.api.query_private('AddOrder', handle.order_data)
+        except Exception as e:
+            self._failed(handle, str(e), retryable=True)
+            return
+        if response.get('error'):
+            self._failed(handle, ', '.join(response['error']), is_retryable(response['error']))
+            return
+        print(f"[SUCCESS] Order placed successfully: {response['result']}")
+        self._placed(handle, response['result'])
+
+    def _attempt_batch(self, pair: str, handles: List[OrderHandle]):
+        for handle in handles:
+            handle.attempts += 1
+            handle._set_status('submitting')
+        print(f"[INFO] Attempting to place {len(handles)} orders for {pair} in one batch")
+        try:
+            response = self.api.query_private_json('AddOrderBatch', {
+                'pair': pair, 'orders': [batch_entry(handle.order_data) for handle in handles]}, cost=len(handles))
+            error = ', '.join(response['error']) if response.get('error') else None
+            results = None if error else response['result'].get('orders', [])
+        except Exception as e:
+            error, results = str(e), None
+        if results is None or len(results) != len(handles):
+            error = error or 'no result per order'
+            # Not processed as a whole (Kraken rejects the batch if one order is invalid): each
+            # order is sent on its own, after a lookup of its userref, and fails or succeeds alone
+            print(f"[WARNING] Batch for {pair} failed ({error}); submitting its orders one by one.")
+            for handle in handles:
+                self._retry(handle)
+            return
+        for handle, result in zip(handles, results):
+            if result.get('error'):
+                self._failed(handle, result['error'], is_retryable([result['error']]))
+            else:
+                print(f"[SUCCESS] Order placed successfully: {result}")
+                self._placed(handle, {'txid': [result['txid']], 'descr': result.get('descr', {})})
+
+    def _placed(self, handle: OrderHandle, result: Dict, status: str = 'open'):
+        self.executor._invalidate_account()
+        txids = result.get('txid') or []
+        handle.txid = txids[0] if txids else None
+        handle._set_status(ORDER_STATUS.get(status, 'open'))
+        handle.future.set_result(result)
+        if handle.txid is not None and not handle.closed.is_set():
+            self._watch(handle)
+
+    def _failed(self, handle: OrderHandle, error: str, retryable: bool):
+        handle.error = error
+        print(f"[ERROR] Failed to place order (Attempt {handle.attempts}): {error}")
+        if retryable and handle.attempts < self.executor.retry_attempts and not self._stopping.is_set():
+            handle._set_status('retrying')
+            timer = threading.Timer(backoff_delay(handle.attempts, *self.backoff), self._retry, (handle,))
+            timer.daemon = True
+            timer.start()
+            return
+        print("[FATAL] Order failed after multiple attempts." if retryable else f"[FATAL] Order rejected: {error}")
+        handle._set_status('failed')
+        handle.future.set_exception(Exception(error))
+
+    def _retry(self, handle: OrderHandle):
+        try:
+            self._pool.submit(self._attempt, handle)
+        except RuntimeError:  # Pipeline shut down during the backoff
+            self._failed(handle, 'Order pipeline stopped', retryable=False)
+
+    # *Fill tracking*
+    def _watch(self, handle: OrderHandle):
+        with self._watch_lock:
+            self._watching[handle.txid] = handle
+            if self._watcher is None or not self._watcher.is_alive():
+                self._watcher = threading.Thread(target=self._poll_fills, name='order-fills', daemon=True)
+                self._watcher.start()
+
+    def _poll_fills(self):
+        while not self._stopping.wait(self.poll_interval):
+            with self._watch_lock:
+                txids = list(self._watching)[:50]  # QueryOrders takes up to 50 ids
+                if not txids:
+                    self._watcher = None
+                    return
+            try:
+                self.poll_fills(txids)
+            except Exception as e:
+                print(f"[WARNING] Could not query order status: {e}")
+
+    # Update the handles of these orders from one QueryOrders call
+    def poll_fills(self, txids: List[str] = None):
+        with self._watch_lock:
+            txids = txids if txids is not None else list(self._watching)[:50]
+        if not txids:
+            return
+        response = self.api.query_private('QueryOrders', {'txid': ','.join(txids)})
+        if response.get('error'):
+            raise Exception(', '.join(response['error']))
+        for txid, info in response['result'].items():
+            with self._watch_lock:
+                handle = self._watching.get(txid)
+            if handle is None or not isinstance(info, dict):
+                continue
+            status = ORDER_STATUS.get(info.get('status'), handle.status)
+            handle._set_status(status, float(info.get('vol_exec', handle.filled_volume)))
+            if status in FINAL_STATUS:
+                self.executor._invalidate_account()
+                with self._watch_lock:
+                    self._watching.pop(txid, None)
+
+    def shutdown(self, wait: bool = True):
+        self._stopping.set()
+        self._pool.shutdown(wait)
+
+
+# Example Usage
+if __name__ == '__main__':
+    from execution.trade_executor import TradeExecutor
+    pipeline = OrderPipeline(TradeExecutor())
+    handles = [pipeline.submit({'pair': pair, 'type': 'buy', 'ordertype': 'market', 'volume': 1.0},
+                               lambda handle: print(f"[INFO] {handle.userref}: {handle.status}"))
+               for pair in ('ADAUSD', 'LTCUSD', 'DOTUSD')]
+    for handle in handles:
+        try:
+            print(handle.result(timeout=30))
+        except Exception as e:
+            print(f"[ERROR] {e}")
+    pipeline.shutdown()
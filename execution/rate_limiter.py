@@ -0,0 +1,165 @@
+# rate_limiter.py
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, Tuple
+
+from config.config import API_TIER, API_RATE_LIMITS, API_CALL_COSTS, API_PRIORITIES
+
+DEFAULT_PRIORITY = max(API_PRIORITIES.values()) + 1  # Market data
+
+
+class CallCounter:
+    # Kraken's call counter: each call adds its cost, the counter decays by `decay` per
+    # second, and a call may only be sent while the counter stays within `maximum`
+    def __init__(self, maximum: float, decay: float, clock: Callable[[], float] = time.monotonic):
+        self.maximum = maximum
+        self.decay = decay
+        self.clock = clock
+        self.level = 0.0
+        self._updated = clock()
+
+    def _settle(self, now: float):
+        self.level = max(0.0, self.level - (now - self._updated) * self.decay)
+        self._updated = now
+
+    # Seconds until a call of this cost fits (0 if it fits now)
+    def wait_time(self, cost: float) -> float:
+        self._settle(self.clock())
+        excess = self.level + min(cost, self.maximum) - self.maximum
+        return excess / self.decay if excess > 0 else 0.0
+
+    def take(self, cost: float):
+        self._settle(self.clock())
+        self.level += min(cost, self.maximum)
+
+    # Kraken reported the limit as exceeded: our model is behind, so assume a full counter
+    def exhaust(self):
+        self._settle(self.clock())
+        self.level = self.maximum
+
+
+class RateLimiter:
+    # Paces every Kraken request against the key's call counters (API_RATE_LIMITS for
+    # API_TIER) instead of fixed sleeps. Each endpoint has a counter and a cost
+    # (API_CALL_COSTS); a call that does not fit waits in that counter's queue, which is
+    # served by priority (API_PRIORITIES: orders and cancels, then account data, then market
+    # data) and then arrival, as fast as the counter decays. Calls are granted to the calling
+    # thread or coroutine, so requests that fit still run concurrently.
+    def __init__(self, limits: Dict[str, Tuple[float, float]] = None, costs: Dict[str, Tuple[str, float]] = API_CALL_COSTS,
+                 priorities: Dict[str, int] = API_PRIORITIES, clock: Callable[[], float] = time.monotonic):
+        limits = limits if limits is not None else API_RATE_LIMITS[API_TIER]
+        self.counters = {name: CallCounter(maximum, decay, clock) for name, (maximum, decay) in limits.items()}
+        self.costs = costs
+        self.priorities = priorities
+        self.clock = clock
+        self.calls = Counter()  # Endpoint -> calls granted
+        self.waited = Counter()  # Endpoint -> total seconds spent queued
+        self.max_wait: Dict[str, float] = {}
+        self._queues = {name: [] for name in self.counters}  # Heaps of (priority, arrival)
+        self._arrivals = itertools.count()
+        self._condition = threading.Condition()
+
+    # Counter, cost and priority of an endpoint; `cost` overrides the configured cost (a
+    # batch counts each of its orders)
+    def route(self, method: str, private: bool = False, cost: float = None) -> Tuple[str, float, int]:
+        counter, configured = self.costs.get(method, ('private' if private else 'public', 1))
+        return counter, configured if cost is None else cost, self.priorities.get(method, DEFAULT_PRIORITY)
+
+    def _grant(self, counter: str, cost: float, entry: Tuple[int, int]):
+        # With the lock held: 0 if the call was granted, else seconds to wait (None while
+        # other calls are ahead of it)
+        queue = self._queues[counter]
+        if queue[0] != entry:
+            return None
+        delay = self.counters[counter].wait_time(cost)
+        if delay > 0:
+            return delay
+        self.counters[counter].take(cost)
+        heapq.heappop(queue)
+        self._condition.notify_all()
+        return 0
+
+    def _withdraw(self, counter: str, entry: Tuple[int, int]):
+        with self._condition:
+            queue = self._queues[counter]
+            if entry in queue:
+                queue.remove(entry)
+                heapq.heapify(queue)
+                self._condition.notify_all()
+
+    def _record(self, method: str, started: float) -> float:
+        waited = self.clock() - started
+        with self._condition:
+            self.calls[method] += 1
+            self.waited[method] += waited
+            self.max_wait[method] = max(self.max_wait.get(method, 0.0), waited)
+        return waited
+
+    # Block until the call may be sent; returns the seconds it waited
+    def acquire(self, method: str, private: bool = False, cost: float = None) -> float:
+        counter, cost, priority = self.route(method, private, cost)
+        entry, started, granted = (priority, next(self._arrivals)), self.clock(), False
+        try:
+            with self._condition:
+                heapq.heappush(self._queues[counter], entry)
+                while True:
+                    delay = self._grant(counter, cost, entry)
+                    if delay == 0:
+                        granted = True
+                        break
+                    self._condition.wait(delay)
+        finally:
+            if not granted:
+                self._withdraw(counter, entry)
+        return self._record(method, started)
+
+    # acquire() for coroutines; waits with asyncio.sleep so the event loop keeps running
+    async def aacquire(self, method: str, private: bool = False, cost: float = None) -> float:
+        counter, cost, priority = self.route(method, private, cost)
+        entry, started, granted = (priority, next(self._arrivals)), self.clock(), False
+        try:
+            with self._condition:
+                heapq.heappush(self._queues[counter], entry)
+            while True:
+                with self._condition:
+                    delay = self._grant(counter, cost, entry)
+                if delay == 0:
+                    granted = True
+                    break
+                await asyncio.sleep(delay if delay is not None else 0.005)
+        finally:
+            if not granted:
+                self._withdraw(counter, entry)
+        return self._record(method, started)
+
+    # Kraken answered 'Rate limit exceeded': hold this counter's queue until it has decayed
+    def exhaust(self, method: str, private: bool = False):
+        with self._condition:
+            self.counters[self.route(method, private)[0]].exhaust()
+
+    def queue_depth(self) -> Dict[str, int]:
+        with self._condition:
+            return {name: len(queue) for name, queue in self._queues.items()}
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._condition:
+            waits = {method: {'calls': calls, 'mean_wait': self.waited[method] / calls,
+                              'max_wait': self.max_wait[method]} for method, calls in self.calls.items()}
+            counters = {name: round(counter.level, 3) for name, counter in self.counters.items()}
+        return {'queued': self.queue_depth(), 'counters': counters, 'endpoints': waits}
+
+
+# Example Usage
+if __name__ == '__main__':
+    limiter = RateLimiter({'public': (3, 2.0), 'private': (15, 0.33), 'trading': (60, 1.0)})
+    threads = [threading.Thread(target=limiter.acquire, args=('Ticker',)) for _ in range(9)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(f"[INFO] 9 Ticker calls granted in {time.perf_counter() - start:.2f} s: {limiter.stats()}")
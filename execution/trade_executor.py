@@ -1,18 +1,51 @@
 # trade_executor.py
-import time
-import krakenex
-from typing import Dict, Union
+from typing import Callable, Dict, List, Union
 
-from config.config import API_KEY, API_SECRET, ALLOWED_PAIRS, API_CALL_DELAY
+from config.config import ALLOWED_PAIRS
+from execution.kraken_client import KrakenClient, shared_client
+from execution.market_cache import MarketDataCache, shared_cache
+from execution.order_pipeline import OrderHandle, OrderPipeline
 
 
 class TradeExecutor:
-    def __init__(self):
-        # Initialize Kraken API
-        self.api = krakenex.API()
-        self.api.key = API_KEY
-        self.api.secret = API_SECRET
+    def __init__(self, cache: MarketDataCache = None, client: KrakenClient = None):
+        # Kraken API client (the process-wide pooled one unless injected)
+        self.api = client if client is not None else shared_client()
         self.retry_attempts = 3  # Number of retries for failed orders
+        self.cache = cache if cache is not None else shared_cache  # Account data cached by KrakenDataHandler
+        self._pipeline = None
+
+    # Balance and open orders change once an order is placed or cancelled
+    def _invalidate_account(self):
+        self.cache.invalidate('Balance')
+        self.cache.invalidate('OpenOrders')
+
+    # Queued submission, backoff and fill tracking for this executor's orders (started on first use)
+    @property
+    def pipeline(self) -> OrderPipeline:
+        if self._pipeline is None:
+            self._pipeline = OrderPipeline(self)
+        return self._pipeline
+
+    # Queue an order and return at once: handle.future resolves to the AddOrder result and
+    # `callback` receives the handle on every status change up to the fill
+    def submit_order(self, order_data: Dict, callback: Callable[[OrderHandle], None] = None) -> OrderHandle:
+        return self.pipeline.submit(order_data, callback)
+
+    # Queue several orders at once: orders for the same pair are sent in one AddOrderBatch
+    # call, the others one by one. One handle per order, in the given order
+    def submit_batch(self, orders: List[Dict], callback: Callable[[OrderHandle], None] = None) -> List[OrderHandle]:
+        return self.pipeline.submit_batch(orders, callback)
+
+    # Blocking form of submit_batch: each order's AddOrder result, or None where it failed
+    def place_batch(self, orders: List[Dict]) -> List[Union[Dict, None]]:
+        results = []
+        for handle in self.submit_batch(orders):
+            try:
+                results.append(handle.result())
+            except Exception:
+                results.append(None)  # Reported by the pipeline
+        return results
 
     # Place a market order
     def place_market_order(self, pair: str, volume: float, side: str) -> Union[Dict, None]:
@@ -58,24 +91,12 @@ class TradeExecutor:
     # Execute an order with retry logic
     def _execute_order(self, order_data: Dict) -> Union[Dict, None]:
         """
-        Execute an order with retry logic in case of failure.
+        Execute an order with retry logic in case of failure (waits for the pipeline's result).
         """
-        attempt = 0
-        while attempt < self.retry_attempts:
-            try:
-                print(f"[INFO] Attempting to place order: {order_data}")
-                response = self.api.query_private('AddOrder', order_data)
-                if response.get('error'):
-                    raise Exception(', '.join(response['error']))
-                print(f"[SUCCESS] Order placed successfully: {response['result']}")
-                return response['result']
-            except Exception as e:
-                attempt += 1
-                print(f"[ERROR] Failed to place order (Attempt {attempt}): {e}")
-                time.sleep(API_CALL_DELAY)
-
-        print("[FATAL] Order failed after multiple attempts.")
-        return None
+        try:
+            return self.submit_order(order_data).result()
+        except Exception:
+            return None  # Reported by the pipeline
 
     # Cancel an active order
     def cancel_order(self, order_id: str) -> bool:
@@ -88,6 +109,7 @@ class TradeExecutor:
             if response.get('error'):
                 raise Exception(', '.join(response['error']))
             print(f"[SUCCESS] Order {order_id} cancelled successfully.")
+            self._invalidate_account()
             return True
         except Exception as e:
             print(f"[ERROR] Failed to cancel order {order_id}: {e}")
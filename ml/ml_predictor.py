@@ -4,25 +4,35 @@ import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import GradientBoostingClassifier
 from sklearn.metrics import accuracy_score
-from data_handler import KrakenDataHandler
+from execution.data_handler import KrakenDataHandler
+from data.investing import load_frame
 
 
 class PricePredictor:
-    def __init__(self):
+    # `buffers` maps pairs to OHLCVRingBuffers shared with the strategy; pairs without
+    # one are fetched through the data handler
+    def __init__(self, buffers: dict = None, data_handler: KrakenDataHandler = None):
         self.model = GradientBoostingClassifier()
-        self.data_handler = KrakenDataHandler()
+        self.data_handler = data_handler if data_handler is not None else KrakenDataHandler()
+        self.buffers = buffers if buffers is not None else {}
 
-    def fetch_data(self, pair: str):
-        df = self.data_handler.get_ohlc(pair, interval=60)
+    # historical=True trains on the bundled dataset (columnar history cache) instead
+    def fetch_data(self, pair: str, historical: bool = False):
+        if historical:
+            df = load_frame(pair)
+        elif pair in self.buffers:
+            df = self.buffers[pair].frame()
+        else:
+            df = self.data_handler.get_ohlc(pair, interval=60)
         if df.empty:
             return pd.DataFrame()
         df['return'] = df['close'].pct_change()
         df['future_return'] = df['close'].shift(-1).pct_change()
         df['target'] = (df['future_return'] > 0).astype(int)
-        return df.dropna()
+        return df.dropna(subset=['return', 'future_return'])  # vwap may be NaN (ring buffers)
 
-    def train_model(self, pair: str):
-        data = self.fetch_data(pair)
+    def train_model(self, pair: str, historical: bool = False):
+        data = self.fetch_data(pair, historical)
         if data.empty:
             print("[ERROR] No data to train model.")
             return
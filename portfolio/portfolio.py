@@ -3,14 +3,13 @@ import pandas as pd
 from typing import Dict, Union
 from execution.data_handler import KrakenDataHandler
 from config.config import LEVERAGE, MAX_PORTFOLIO_EXPOSURE, RESERVE_BALANCE, BASE_CURRENCY
-from risk.risk_manager import RiskManager
 
 
 
 class PortfolioManager:
     # Initialize the portfolio manager with data handling and portfolio tracking
-    def __init__(self):
-        self.data_handler = KrakenDataHandler()
+    def __init__(self, data_handler: KrakenDataHandler = None):
+        self.data_handler = data_handler if data_handler is not None else KrakenDataHandler()
         self.positions = {}  # Active positions
         self.balance = {}  # Account balances
 
@@ -1,17 +1,20 @@
 # risk_manager.py
 import time
-from typing import Dict, Union
+import pandas as pd
+from typing import Dict, List, Union
 from execution.data_handler import KrakenDataHandler
 from execution.trade_executor import TradeExecutor
+from portfolio.portfolio import PortfolioManager
 from config.config import STOP_LOSS, TAKE_PROFIT, MAX_DAILY_DRAWDOWN, RISK_PER_TRADE, BASE_CURRENCY
 
 
 class RiskManager:
-    def __init__(self):
-        # Initialize required modules
-        self.data_handler = KrakenDataHandler()
-        self.trade_executor = TradeExecutor()
-        self.portfolio_manager = PortfolioManager()
+    def __init__(self, data_handler: KrakenDataHandler = None, trade_executor: TradeExecutor = None,
+                 portfolio_manager: PortfolioManager = None):
+        # Initialize required modules (all share the process-wide Kraken client by default)
+        self.data_handler = data_handler if data_handler is not None else KrakenDataHandler()
+        self.trade_executor = trade_executor if trade_executor is not None else TradeExecutor()
+        self.portfolio_manager = portfolio_manager if portfolio_manager is not None else PortfolioManager(self.data_handler)
         self.daily_loss = 0.0  # Track daily losses
 
     # Monitor portfolio-wide daily drawdown
@@ -28,6 +31,7 @@ class RiskManager:
 
         if drawdown >= (MAX_DAILY_DRAWDOWN * 100):
             print(f"[ALERT] Daily drawdown limit of {MAX_DAILY_DRAWDOWN * 100}% reached. Trading paused.")
+            self.close_all_positions()  # Flatten the book in one batch while trading is halted
             return True
 
         return False
@@ -35,9 +39,10 @@ class RiskManager:
     # Monitor stop-loss and take-profit levels for open positions
     def monitor_positions(self):
         positions = self.portfolio_manager.get_positions()
+        tickers = self.data_handler.get_tickers(list(positions.index))  # Every position in one request
+        closing = {}  # Pair -> loss booked once its sell order is placed
         for pair, position in positions.iterrows():
-            pair_data = self.data_handler.get_ticker(pair)
-            current_price = float(pair_data[pair]['c'][0]) if pair_data else None
+            current_price = float(tickers[pair]['c'][0]) if pair in tickers else None
 
             if current_price is None:
                 print(f"[WARNING] Could not fetch price data for {pair}. Skipping risk check.")
@@ -51,14 +56,38 @@ class RiskManager:
 
             if current_price <= stop_loss_price:
                 print(f"[ALERT] Stop-loss triggered for {pair}. Closing position.")
-                self.trade_executor.place_market_order(pair, position['amount'], 'sell')
-                self.portfolio_manager.close_position(pair)
-                self.daily_loss += position['amount'] * STOP_LOSS
+                closing[pair] = position['amount'] * STOP_LOSS
 
             elif current_price >= take_profit_price:
                 print(f"[SUCCESS] Take-profit reached for {pair}. Closing position.")
-                self.trade_executor.place_market_order(pair, position['amount'], 'sell')
-                self.portfolio_manager.close_position(pair)
+                closing[pair] = 0.0
+
+        # Every triggered position is closed in one batch submission (one call per pair)
+        for pair in self._close_positions(positions.loc[list(closing)]):
+            self.daily_loss += closing[pair]
+
+    # Close every open position at market in one batch submission (check_daily_drawdown, when
+    # trading halts); orders of one pair share an AddOrderBatch call, other pairs follow in turn
+    def close_all_positions(self) -> Dict[str, bool]:
+        positions = self.portfolio_manager.get_positions()
+        closed = self._close_positions(positions)
+        return {pair: pair in closed for pair in positions.index}
+
+    # Market sells for these positions through one batch submission; positions whose order
+    # was placed are removed from the portfolio, the others stay open. Returns the closed pairs.
+    def _close_positions(self, positions: pd.DataFrame) -> List[str]:
+        if positions.empty:
+            return []
+        orders = [{'pair': pair, 'type': 'sell', 'ordertype': 'market', 'volume': position['amount']}
+                  for pair, position in positions.iterrows()]
+        closed = []
+        for order, result in zip(orders, self.trade_executor.place_batch(orders)):
+            if result is None:
+                print(f"[ERROR] Could not close position {order['pair']}; it stays open.")
+                continue
+            self.portfolio_manager.close_position(order['pair'])
+            closed.append(order['pair'])
+        return closed
 
     # Calculate risk for a new trade
     def calculate_position_size(self, entry_price: float) -> float:
@@ -1 +1 @@
-from .strategy import TradingStrategy
+from .strategy import TechnicalStrategy
@@ -1,15 +1,16 @@
 # arbitrage.py
-from data_handler import KrakenDataHandler
+from execution.data_handler import KrakenDataHandler
 
 
 class Arbitrage:
-    def __init__(self):
-        self.data_handler = KrakenDataHandler()
+    def __init__(self, data_handler: KrakenDataHandler = None):
+        self.data_handler = data_handler if data_handler is not None else KrakenDataHandler()
 
     def find_opportunity(self):
-        usd_price = float(self.data_handler.get_ticker('ADAUSD')['ADAUSD']['c'][0])
-        eur_price = float(self.data_handler.get_ticker('ADAEUR')['ADAEUR']['c'][0])
-        eur_usd = float(self.data_handler.get_ticker('EURUSD')['EURUSD']['c'][0])
+        tickers = self.data_handler.get_tickers(['ADAUSD', 'ADAEUR', 'EURUSD'])  # One request
+        usd_price = float(tickers['ADAUSD']['c'][0])
+        eur_price = float(tickers['ADAEUR']['c'][0])
+        eur_usd = float(tickers['EURUSD']['c'][0])
 
         implied_usd_price = eur_price * eur_usd
         spread = abs(usd_price - implied_usd_price)
@@ -0,0 +1,366 @@
+# incremental.py
+import math
+from collections import deque
+from typing import Dict
+
+NAN = float('nan')
+
+
+def _isnan(value: float) -> bool:
+    return value != value
+
+
+# Float division with pandas/NumPy semantics (x/0 -> +-inf, 0/0 -> NaN)
+def _div(a: float, b: float) -> float:
+    try:
+        return a / b
+    except ZeroDivisionError:
+        if a == 0 or _isnan(a):
+            return NAN
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+
+
+# 100 - 100 / (1 + up / down), shared by RSI and MFI
+def _strength_index(up: float, down: float) -> float:
+    return 100 - _div(100, 1 + _div(up, down))
+
+
+# Matches Series.ewm(span=span).mean() (adjust=True, ignore_na=False)
+class EMA:
+    def __init__(self, span: int):
+        self.decay = 1 - 2 / (span + 1)
+        self.num = 0.0
+        self.den = 0.0
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        if _isnan(x):
+            # NaN keeps the previous mean but still ages the weights
+            self.num *= self.decay
+            self.den *= self.decay
+        else:
+            self.num = x + self.decay * self.num
+            self.den = 1 + self.decay * self.den
+            self.value = self.num / self.den
+        return self.value
+
+
+# Rolling sum / mean / sample std over a fixed window (min_periods=window). Squares are
+# summed about a running offset near the window mean, so sum(x^2) - sum(x)^2/n does not
+# cancel catastrophically when prices are large relative to their spread.
+class RollingWindow:
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+        self.shift = NAN  # Offset the squares are taken about (first value, then the mean at each resync)
+        self.total_sq = 0.0
+        self.valid = 0
+        self._since_resync = 0
+
+    def update(self, x: float):
+        if len(self.values) == self.window:
+            old = self.values[0]
+            if not _isnan(old):
+                self.total -= old
+                self.total_sq -= (old - self.shift) ** 2
+                self.valid -= 1
+        self.values.append(x)
+        if not _isnan(x):
+            if _isnan(self.shift):
+                self.shift = x
+            self.total += x
+            self.total_sq += (x - self.shift) ** 2
+            self.valid += 1
+        # Re-sum once per window so add/remove round-off cannot drift (amortised O(1))
+        self._since_resync += 1
+        if self._since_resync >= self.window:
+            self._since_resync = 0
+            finite = [v for v in self.values if not _isnan(v)]
+            self.total = math.fsum(finite)
+            self.shift = self.total / len(finite) if finite else NAN
+            self.total_sq = math.fsum((v - self.shift) ** 2 for v in finite)
+
+    @property
+    def ready(self) -> bool:
+        return self.valid == self.window
+
+    @property
+    def sum(self) -> float:
+        return self.total if self.ready else NAN
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.window if self.ready else NAN
+
+    @property
+    def var(self) -> float:
+        if not self.ready or self.window < 2:
+            return NAN
+        deviation = self.total - self.shift * self.window
+        variance = (self.total_sq - deviation * deviation / self.window) / (self.window - 1)
+        return max(variance, 0.0)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.var)
+
+
+# Rolling max/min via a monotonic deque of (index, value)
+class RollingExtreme:
+    def __init__(self, window: int, mode: str = 'max'):
+        self.window = window
+        self.is_max = mode == 'max'
+        self.candidates = deque()
+        self.index = -1
+        self.nan_positions = deque()
+
+    def update(self, x: float):
+        self.index += 1
+        expired = self.index - self.window
+        while self.candidates and self.candidates[0][0] <= expired:
+            self.candidates.popleft()
+        while self.nan_positions and self.nan_positions[0] <= expired:
+            self.nan_positions.popleft()
+        if _isnan(x):
+            self.nan_positions.append(self.index)
+            return
+        if self.is_max:
+            while self.candidates and self.candidates[-1][1] <= x:
+                self.candidates.pop()
+        else:
+            while self.candidates and self.candidates[-1][1] >= x:
+                self.candidates.pop()
+        self.candidates.append((self.index, x))
+
+    @property
+    def value(self) -> float:
+        if self.index + 1 < self.window or self.nan_positions:
+            return NAN
+        return self.candidates[0][1]
+
+
+# Keeps the last `depth` + 1 values so x[t - k] is O(1)
+class Lag:
+    def __init__(self, depth: int):
+        self.values = deque(maxlen=depth + 1)
+
+    def update(self, x: float):
+        self.values.append(x)
+
+    def ago(self, k: int) -> float:
+        if k >= len(self.values):
+            return NAN
+        return self.values[-1 - k]
+
+
+# Rolling covariance / variance pair (Series.rolling(w).cov(other) / other.rolling(w).var())
+class RollingBeta:
+    def __init__(self, window: int):
+        self.x = RollingWindow(window)
+        self.y = RollingWindow(window)
+        self.xy = RollingWindow(window)
+        self.market = RollingWindow(window)
+
+    def update(self, x: float, y: float):
+        both = _isnan(x) or _isnan(y)
+        self.x.update(NAN if both else x)
+        self.y.update(NAN if both else y)
+        self.xy.update(NAN if both else x * y)
+        self.market.update(y)
+
+    @property
+    def value(self) -> float:
+        n = self.x.window
+        if not self.xy.ready or not self.market.ready or n < 2:
+            return NAN
+        covariance = (self.xy.total - self.x.total * self.y.total / n) / (n - 1)
+        return _div(covariance, self.market.var)
+
+
+class IncrementalIndicators:
+    # Streaming state for every indicator used by TechnicalStrategy.combined_strategy.
+    # Each update() is O(1) in the length of the history; signals() reproduces the
+    # labels the pandas *_strategy methods return for the same bars.
+    def __init__(self):
+        self.bars = 0
+        self.close_lag = Lag(14)
+        # EMAs (ema_strategy and MACD share spans 12/26)
+        self.ema12 = EMA(12)
+        self.ema26 = EMA(26)
+        self.ema20 = EMA(20)
+        self.macd_signal = EMA(9)
+        # Rolling means of close
+        self.close_means = {w: RollingWindow(w) for w in (5, 7, 9, 14, 15, 20, 26, 50, 52, 200)}
+        self.ichimoku_lag = Lag(26)
+        # RSI gains/losses (simple rolling means, as in calculate_rsi)
+        self.gains = RollingWindow(14)
+        self.losses = RollingWindow(14)
+        # Extremes
+        self.high_max14 = RollingExtreme(14, 'max')
+        self.low_min14 = RollingExtreme(14, 'min')
+        self.high_max20 = RollingExtreme(20, 'max')
+        self.low_min20 = RollingExtreme(20, 'min')
+        self.high_all = -math.inf
+        self.low_all = math.inf
+        # Typical price statistics (CCI, MFI)
+        self.tp_window = RollingWindow(20)
+        self.prev_tp = NAN
+        self.positive_flow = RollingWindow(14)
+        self.negative_flow = RollingWindow(14)
+        # Volatility measures
+        self.close_diff_abs = RollingWindow(14)
+        self.true_range = RollingWindow(14)
+        self.hma_raw = RollingWindow(3)
+        self.hma_prev = NAN
+        self.rvi = RollingWindow(10)
+        self.range10 = RollingWindow(10)
+        self.range10_prev = NAN
+        self.beta = RollingBeta(30)
+        self.last = {}
+
+    def update(self, open_: float, high: float, low: float, close: float, volume: float,
+               market_return: float = NAN):
+        prev_close = self.close_lag.ago(0)
+        self.close_lag.update(close)
+        self.bars += 1
+
+        ema12 = self.ema12.update(close)
+        ema26 = self.ema26.update(close)
+        macd = ema12 - ema26
+        signal_line = self.macd_signal.update(macd)
+        ema20 = self.ema20.update(close)
+
+        for window in self.close_means.values():
+            window.update(close)
+        means = self.close_means
+        tenkan, kijun = means[9].mean, means[26].mean
+        self.ichimoku_lag.update(((tenkan + kijun) / 2, means[52].mean))
+        shifted = self.ichimoku_lag.ago(26)
+        span_a, span_b = shifted if isinstance(shifted, tuple) else (NAN, NAN)
+
+        delta = close - prev_close
+        self.gains.update(delta if delta > 0 else 0.0)
+        self.losses.update(-delta if delta < 0 else 0.0)
+
+        for extreme, value in ((self.high_max14, high), (self.low_min14, low),
+                               (self.high_max20, high), (self.low_min20, low)):
+            extreme.update(value)
+        self.high_all = max(self.high_all, high)
+        self.low_all = min(self.low_all, low)
+
+        tp = (high + low + close) / 3
+        self.tp_window.update(tp)
+        money_flow = tp * volume
+        self.positive_flow.update(money_flow if tp > self.prev_tp else 0.0)
+        self.negative_flow.update(money_flow if tp < self.prev_tp else 0.0)
+        self.prev_tp = tp
+
+        abs_diff = abs(delta)
+        self.close_diff_abs.update(abs_diff)
+        ranges = [r for r in (high - low, abs(high - prev_close), abs(low - prev_close)) if not _isnan(r)]
+        self.true_range.update(max(ranges) if ranges else NAN)
+
+        self.hma_prev = self.hma_raw.mean
+        self.hma_raw.update(means[7].mean * 2 - means[14].mean)
+        self.rvi.update(_div(close - open_, high - low))
+        self.range10_prev = self.range10.mean
+        self.range10.update(high - low)
+        self.beta.update(_div(close, prev_close) - 1, market_return)
+
+        close_atr = self.close_diff_abs.mean
+        bb_mean, bb_std = means[20].mean, means[20].std
+        self.last = {
+            'close': close, 'prev_close': prev_close,
+            'ema_short': ema12, 'ema_long': ema26, 'macd': macd, 'signal_line': signal_line,
+            'span_a': span_a, 'span_b': span_b,
+            'williams_r': _div(self.high_max14.value - close, self.high_max14.value - self.low_min14.value) * -100,
+            'cci': _div(tp - self.tp_window.mean, 0.015 * self.tp_window.std),
+            'momentum': close - self.close_lag.ago(10),
+            'keltner_upper': ema20 + 2 * close_atr, 'keltner_lower': ema20 - 2 * close_atr,
+            'donchian_upper': self.high_max20.value, 'donchian_lower': self.low_min20.value,
+            'pivot': tp,
+            'fib_level': self.low_all + (self.high_all - self.low_all) * 0.618,
+            'rsi': _strength_index(self.gains.mean, self.losses.mean),
+            'short_ma': means[50].mean, 'long_ma': means[200].mean,
+            'upper_band': bb_mean + 2 * bb_std, 'lower_band': bb_mean - 2 * bb_std,
+            '%K': _div(close - self.low_min14.value, self.high_max14.value - self.low_min14.value) * 100,
+            'atr': self.true_range.mean,
+            'tma_short': means[5].mean, 'tma_medium': means[15].mean, 'tma_long': means[50].mean,
+            'hma': self.hma_raw.mean, 'hma_prev': self.hma_prev,
+            'supertrend': (high + low) / 2 + 3 * close_atr,
+            'roc': (_div(close, self.close_lag.ago(14)) - 1) * 100,
+            'rvi': self.rvi.mean,
+            'volatility': self.range10.mean, 'volatility_prev': self.range10_prev,
+            'mfi': _strength_index(self.positive_flow.sum, self.negative_flow.sum),
+            'beta': self.beta.value,
+        }
+
+    @property
+    def atr(self) -> float:
+        return self.last.get('atr', NAN)
+
+    @staticmethod
+    def _cross(a: float, b: float, above: str = 'Buy', below: str = 'Sell') -> str:
+        if a > b:
+            return above
+        elif a < b:
+            return below
+        return 'Hold'
+
+    # Current label for each indicator, mirroring the *_strategy methods
+    def signals(self) -> Dict[str, str]:
+        v = self.last
+        close = v['close']
+        cross = self._cross
+
+        rsi = v['rsi']
+        if rsi < 30:
+            rsi_signal = 'Strong Buy'
+        elif rsi < 50:
+            rsi_signal = 'Buy'
+        elif rsi > 70:
+            rsi_signal = 'Strong Sell'
+        else:
+            rsi_signal = 'Hold'
+
+        if close > v['span_a']:
+            ichimoku = 'Buy'
+        elif close < v['span_b']:
+            ichimoku = 'Sell'
+        else:
+            ichimoku = 'Hold'
+
+        if v['tma_short'] > v['tma_medium'] > v['tma_long']:
+            triple_ma = 'Buy'
+        elif v['tma_short'] < v['tma_medium'] < v['tma_long']:
+            triple_ma = 'Sell'
+        else:
+            triple_ma = 'Hold'
+
+        return {
+            'rsi': rsi_signal,
+            'ma': cross(v['short_ma'], v['long_ma']),
+            'macd': cross(v['macd'], v['signal_line']),
+            'bollinger': 'Sell' if close > v['upper_band'] else 'Buy' if close < v['lower_band'] else 'Hold',
+            'stochastic': 'Buy' if v['%K'] < 20 else 'Sell' if v['%K'] > 80 else 'Hold',
+            'ema': cross(v['ema_short'], v['ema_long']),
+            'parabolic_sar': 'Buy' if close > v['prev_close'] * 0.02 else 'Sell',
+            'ichimoku': ichimoku,
+            'williams_r': 'Sell' if v['williams_r'] > -20 else 'Buy' if v['williams_r'] < -80 else 'Hold',
+            'cci': 'Sell' if v['cci'] > 100 else 'Buy' if v['cci'] < -100 else 'Hold',
+            'momentum': cross(v['momentum'], 0),
+            'keltner': 'Sell' if close > v['keltner_upper'] else 'Buy' if close < v['keltner_lower'] else 'Hold',
+            'donchian': 'Buy' if close > v['donchian_upper'] else 'Sell' if close < v['donchian_lower'] else 'Hold',
+            'pivot': 'Buy' if close > v['pivot'] else 'Sell',
+            'fibonacci': 'Sell' if close > v['fib_level'] else 'Buy',
+            'triple_ma': triple_ma,
+            'hma': cross(v['hma'], v['hma_prev']),
+            'supertrend': cross(close, v['supertrend']),
+            'roc': cross(v['roc'], 0),
+            'macd_histogram': cross(v['macd'] - v['signal_line'], 0),
+            'rvi': cross(v['rvi'], 0),
+            'chaikin_volatility': cross(v['volatility'], v['volatility_prev'], above='Sell', below='Buy'),
+            'mfi': 'Buy' if v['mfi'] < 20 else 'Sell' if v['mfi'] > 80 else 'Hold',
+            'beta': cross(v['beta'], 1, above='Sell', below='Buy'),
+        }
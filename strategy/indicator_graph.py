@@ -0,0 +1,280 @@
+# indicator_graph.py
+from collections import Counter
+from typing import Any, Callable, Dict, Tuple, Union
+import numpy as np
+import pandas as pd
+
+# A source is either a raw column name ('close') or the key of another node
+Source = Union[str, Tuple[Any, ...]]
+
+NODES: Dict[str, Callable] = {}
+
+
+def node(name: str):
+    # Register an indicator node; node functions receive the graph and their arguments
+    def register(fn: Callable) -> Callable:
+        NODES[name] = fn
+        return fn
+    return register
+
+
+class IndicatorGraph:
+    # Evaluates indicator nodes over one frame and memoises every intermediate,
+    # so shared inputs (e.g. ewm(close, 12), rolling_mean(close, 20), true_range)
+    # are computed once per evaluation no matter how many indicators use them.
+    # For chunked evaluation, `state` holds what nodes with unbounded memory (ewm, cummax,
+    # cummin) carried over from the bars before this frame; their state after row
+    # `carry_index` is collected in `next_state` for the following chunk.
+    def __init__(self, data: pd.DataFrame, memoize: bool = True, state: dict = None, carry_index: int = None):
+        self.data = data
+        self.memoize = memoize
+        self.state = state
+        self.carry_index = carry_index
+        self.next_state = {}
+        self.cache = {}
+        self.requests = Counter()
+        self.computed = Counter()
+
+    def get(self, source: Source):
+        if isinstance(source, str):
+            return self.data[source]
+        return self.node(*source)
+
+    def node(self, name: str, *args):
+        key = (name,) + args
+        self.requests[key] += 1
+        if self.memoize and key in self.cache:
+            return self.cache[key]
+        value = NODES[name](self, *args)
+        self.computed[key] += 1
+        if self.memoize:
+            self.cache[key] = value
+        return value
+
+    # Summary of how much work memoisation saved during this evaluation
+    def report(self) -> Dict[str, int]:
+        requested = sum(self.requests.values())
+        computed = sum(self.computed.values())
+        return {
+            'nodes': len(self.requests),
+            'requested': requested,
+            'computed': computed,
+            'reused': requested - computed,
+        }
+
+
+# *Generic transforms*
+@node('ewm')
+def _ewm(graph: IndicatorGraph, source: Source, span: int):
+    values = graph.get(source)
+    mean = values.ewm(span=span).mean()
+    if graph.state is None:
+        return mean
+    return _continue_ewm(graph, ('ewm', source, span), mean, span)
+
+
+@node('rolling_mean')
+def _rolling_mean(graph: IndicatorGraph, source: Source, window: int):
+    return rolling(graph.get(source), window, 'mean')
+
+
+@node('rolling_std')
+def _rolling_std(graph: IndicatorGraph, source: Source, window: int):
+    return rolling(graph.get(source), window, 'std')
+
+
+@node('rolling_sum')
+def _rolling_sum(graph: IndicatorGraph, source: Source, window: int):
+    return rolling(graph.get(source), window, 'sum')
+
+
+@node('rolling_max')
+def _rolling_max(graph: IndicatorGraph, source: Source, window: int):
+    return rolling(graph.get(source), window, 'max')
+
+
+@node('rolling_min')
+def _rolling_min(graph: IndicatorGraph, source: Source, window: int):
+    return rolling(graph.get(source), window, 'min')
+
+
+@node('diff')
+def _diff(graph: IndicatorGraph, source: Source, periods: int):
+    return graph.get(source).diff(periods)
+
+
+@node('shift')
+def _shift(graph: IndicatorGraph, source: Source, periods: int):
+    return graph.get(source).shift(periods)
+
+
+@node('pct_change')
+def _pct_change(graph: IndicatorGraph, source: Source, periods: int):
+    return graph.get(source).pct_change(periods)
+
+
+@node('cummax')
+def _cummax(graph: IndicatorGraph, source: Source):
+    return _running(graph, ('cummax', source), graph.get(source), np.fmax)
+
+
+@node('cummin')
+def _cummin(graph: IndicatorGraph, source: Source):
+    return _running(graph, ('cummin', source), graph.get(source), np.fmin)
+
+
+# *Shared building blocks*
+@node('typical_price')
+def _typical_price(graph: IndicatorGraph):
+    return (graph.get('high') + graph.get('low') + graph.get('close')) / 3
+
+
+@node('hl_range')
+def _hl_range(graph: IndicatorGraph):
+    return graph.get('high') - graph.get('low')
+
+
+@node('true_range')
+def _true_range(graph: IndicatorGraph):
+    prev_close = graph.node('shift', 'close', 1)
+    high_close = (graph.get('high') - prev_close).abs()
+    low_close = (graph.get('low') - prev_close).abs()
+    return np.fmax(np.fmax(graph.node('hl_range'), high_close), low_close)
+
+
+@node('close_atr')
+def _close_atr(graph: IndicatorGraph, period: int):
+    # Close-to-close ATR used by Keltner and SuperTrend
+    return graph.node('rolling_mean', ('abs_diff', 'close'), period)
+
+
+@node('abs_diff')
+def _abs_diff(graph: IndicatorGraph, source: Source):
+    return graph.node('diff', source, 1).abs()
+
+
+@node('macd')
+def _macd(graph: IndicatorGraph, fast: int, slow: int):
+    return graph.node('ewm', 'close', fast) - graph.node('ewm', 'close', slow)
+
+
+@node('rsi')
+def _rsi(graph: IndicatorGraph, period: int):
+    return relative_strength_index(graph.node('diff', 'close', 1), period)
+
+
+@node('hma_raw')
+def _hma_raw(graph: IndicatorGraph, period: int):
+    # Hull MA before its final sqrt(period) smoothing
+    return graph.node('rolling_mean', 'close', int(period / 2)) * 2 - graph.node('rolling_mean', 'close', period)
+
+
+@node('rvi_raw')
+def _rvi_raw(graph: IndicatorGraph):
+    return (graph.get('close') - graph.get('open')) / graph.node('hl_range')
+
+
+@node('mfi')
+def _mfi(graph: IndicatorGraph, period: int):
+    tp = graph.node('typical_price')
+    prev_tp = graph.node('shift', ('typical_price',), 1)
+    money_flow = tp * graph.get('volume')
+    positive_flow = rolling(money_flow.where(tp > prev_tp, 0), period, 'sum')
+    negative_flow = rolling(money_flow.where(tp < prev_tp, 0), period, 'sum')
+    return 100 - (100 / (1 + positive_flow / negative_flow))
+
+
+# *State carried between chunks*
+def _like(obj, values: np.ndarray):
+    if isinstance(obj, pd.DataFrame):
+        return pd.DataFrame(values, index=obj.index, columns=obj.columns, copy=False)
+    return pd.Series(values, index=obj.index, name=obj.name)
+
+
+def _save_state(graph: IndicatorGraph, key: tuple, value):
+    if graph.carry_index is not None:
+        graph.next_state[key] = value
+
+
+# pandas' adjusted EWM is num / den with num = sum(b^k * x[t-k]) and den = sum(b^k).
+# The local mean of this frame is combined with the (num, den) carried in from the
+# bars before it. Assumes gap-free input, as the chunked backtest reads.
+def _continue_ewm(graph: IndicatorGraph, key: tuple, local_mean, span: int):
+    decay = 1 - 2 / (span + 1)
+    mean = local_mean.to_numpy(dtype=float)
+    steps = np.arange(1, len(mean) + 1, dtype=float).reshape((-1,) + (1,) * (mean.ndim - 1))
+    carried_weight = np.exp(steps * np.log(decay))  # decay ** (t + 1)
+    local_den = -np.expm1(steps * np.log(decay)) / (1 - decay)
+    num, den = graph.state.get(key, (0.0, 0.0))
+    total_den = carried_weight * den + local_den
+    values = (carried_weight * num + np.nan_to_num(mean) * local_den) / total_den
+    if graph.carry_index is not None:
+        row = graph.carry_index
+        _save_state(graph, key, (values[row] * total_den[row], total_den[row]))
+    return _like(local_mean, values)
+
+
+def _running(graph: IndicatorGraph, key: tuple, obj, reduce):
+    values = reduce.accumulate(obj.to_numpy(dtype=float), axis=0)
+    if graph.state is not None:
+        if key in graph.state:
+            values = reduce(values, graph.state[key])
+        if graph.carry_index is not None:
+            _save_state(graph, key, values[graph.carry_index])
+    return _like(obj, values)
+
+
+def relative_strength_index(delta, period: int = 14):
+    gain = rolling(delta.where(delta > 0, 0), period, 'mean')
+    loss = rolling(-delta.where(delta < 0, 0), period, 'mean')
+    rs = gain / loss
+    return 100 - (100 / (1 + rs))
+
+
+# *Rolling windows (min_periods = window)*
+# A Series goes through pandas. A bars x pairs DataFrame (OHLCVPanel) goes through the
+# 2-D kernels below, because pandas applies rolling windows one column at a time.
+def rolling(obj, window: int, how: str):
+    if not isinstance(obj, pd.DataFrame):
+        return getattr(obj.rolling(window=window), how)()
+    values = obj.to_numpy(dtype=float)
+    if how in ('max', 'min'):
+        result = _rolling_extreme_2d(values, window, np.maximum if how == 'max' else np.minimum)
+    else:
+        result = _rolling_moment_2d(values, window, how)
+    return pd.DataFrame(result, index=obj.index, columns=obj.columns, copy=False)
+
+
+def _window_total(cumulative: np.ndarray, window: int) -> np.ndarray:
+    total = cumulative.copy()
+    total[window:] -= cumulative[:-window]
+    return total
+
+
+def _rolling_moment_2d(values: np.ndarray, window: int, how: str) -> np.ndarray:
+    valid = ~np.isnan(values)
+    count = _window_total(np.cumsum(valid, axis=0), window)
+    # Centre each column before the running sums so long histories keep their precision
+    offset = np.zeros(values.shape[1:])
+    if how != 'sum':
+        with np.errstate(invalid='ignore'):
+            offset = np.nan_to_num(np.nanmean(np.where(valid, values, np.nan), axis=0))
+    centred = np.where(valid, values - offset, 0.0)
+    total = _window_total(np.cumsum(centred, axis=0), window)
+    full = count == window
+    if how == 'sum':
+        return np.where(full, total, np.nan)
+    if how == 'mean':
+        return np.where(full, offset + total / window, np.nan)
+    squares = _window_total(np.cumsum(centred * centred, axis=0), window)
+    variance = np.maximum((squares - total * total / window) / (window - 1), 0.0)
+    return np.where(full, np.sqrt(variance), np.nan)
+
+
+def _rolling_extreme_2d(values: np.ndarray, window: int, reduce) -> np.ndarray:
+    # np.maximum / np.minimum propagate NaN, matching pandas' min_periods=window
+    result = values.copy()
+    for lag in range(1, window):
+        result[lag:] = reduce(result[lag:], values[:-lag])
+    result[:window - 1] = np.nan
+    return result
@@ -0,0 +1,59 @@
+# indicator_store.py
+from typing import Any, Dict, Optional
+import numpy as np
+import pandas as pd
+
+
+class IndicatorStore:
+    # Indicator outputs kept outside the OHLCV frame, one preallocated typed array per
+    # column. Writing a column copies into its existing buffer instead of adding a column
+    # to the frame, and with bounded=True each column keeps only the last `lookback`
+    # values its indicator reads, so memory stays fixed however long the history grows.
+    def __init__(self, bounded: bool = False, dtype: Any = np.float64, dtypes: Optional[Dict[str, Any]] = None):
+        self.bounded = bounded
+        self.dtype = np.dtype(dtype)
+        self.dtypes = {name: np.dtype(value) for name, value in (dtypes or {}).items()}
+        self._buffers: Dict[str, np.ndarray] = {}
+        self._lengths: Dict[str, int] = {}
+
+    # `lookback` is how many of the latest values the indicator reads (e.g. 2 for [-1] vs [-2])
+    def write(self, name: str, values, lookback: int = 1) -> np.ndarray:
+        if isinstance(values, (pd.Series, pd.DataFrame)):
+            values = values.to_numpy()
+        values = np.asarray(values)
+        if self.bounded:
+            values = values[-lookback:]
+        length = len(values)
+        buffer = self._buffers.get(name)
+        if buffer is None or len(buffer) < length:
+            # Unbounded columns grow by half again so a frame that gains one bar per call
+            # reallocates only occasionally
+            capacity = length if self.bounded or buffer is None else max(length, len(buffer) * 3 // 2)
+            buffer = np.empty(capacity, dtype=self.dtypes.get(name, self.dtype))
+            self._buffers[name] = buffer
+        buffer[:length] = values
+        self._lengths[name] = length
+        return buffer[:length]
+
+    def __setitem__(self, name: str, values):
+        self.write(name, values)
+
+    # Zero-copy view of the stored values (latest value last)
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._buffers[name][:self._lengths[name]]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._buffers
+
+    @property
+    def columns(self):
+        return list(self._buffers)
+
+    # Bytes held by the preallocated buffers
+    @property
+    def nbytes(self) -> int:
+        return sum(buffer.nbytes for buffer in self._buffers.values())
+
+    def clear(self):
+        self._buffers.clear()
+        self._lengths.clear()
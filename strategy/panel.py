@@ -0,0 +1,39 @@
+# panel.py
+from typing import Dict, List
+import numpy as np
+import pandas as pd
+
+
+class OHLCVPanel:
+    # OHLCV for many pairs held as aligned 2-D float64 arrays (bars x pairs), so every
+    # indicator in combined_strategy can be evaluated for all pairs in one pass.
+    FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, index: pd.Index, pairs: List[str], fields: Dict[str, np.ndarray]):
+        self.index = index
+        self.pairs = list(pairs)
+        self.fields = fields
+
+    # Align per-pair frames on the union of their timestamps (missing bars are NaN)
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame], time_column: str = 'time') -> 'OHLCVPanel':
+        pairs = list(frames)
+        indexes = [frame[time_column] if time_column in frame else frame.index for frame in frames.values()]
+        index = pd.Index(indexes[0]) if indexes else pd.Index([])
+        for other in indexes[1:]:
+            index = index.union(pd.Index(other))
+        fields = {field: np.full((len(index), len(pairs)), np.nan) for field in cls.FIELDS}
+        for column, (frame, frame_index) in enumerate(zip(frames.values(), indexes)):
+            rows = index.get_indexer(pd.Index(frame_index))
+            for field in cls.FIELDS:
+                fields[field][rows, column] = frame[field].to_numpy(dtype=float)
+        return cls(index, pairs, fields)
+
+    @property
+    def shape(self):
+        return self.fields['close'].shape
+
+    # Zero-copy DataFrame views (index = time, columns = pairs) for the indicator graph
+    def frames(self) -> Dict[str, pd.DataFrame]:
+        return {field: pd.DataFrame(values, index=self.index, columns=self.pairs, copy=False)
+                for field, values in self.fields.items()}
@@ -0,0 +1,133 @@
+# signal_matrix.py
+from typing import Dict, Any, Optional, Union
+import numpy as np
+import pandas as pd
+
+from strategy.indicator_graph import IndicatorGraph
+
+# Column order of the vote matrix (same order combined_strategy reports its details in)
+INDICATORS = ['rsi', 'ma', 'macd', 'bollinger', 'stochastic', 'ema', 'parabolic_sar', 'ichimoku',
+              'williams_r', 'cci', 'momentum', 'keltner', 'donchian', 'pivot', 'fibonacci',
+              'triple_ma', 'hma', 'supertrend', 'roc', 'macd_histogram', 'rvi',
+              'chaikin_volatility', 'mfi', 'beta']
+
+ACTIONS = np.array(['sell', 'hold', 'buy'])
+
+# Earlier bars the rolling windows behind indicator_votes reach back to (the 200-bar mean
+# in 'ma'); a chunk evaluated with this much overlap reproduces them exactly
+LOOKBACK = 199
+
+
+def _cross(a, b, above: int = 1, below: int = -1) -> np.ndarray:
+    return np.select([a > b, a < b], [above, below], 0)
+
+
+def _band(x, lower, upper, below: int, above: int) -> np.ndarray:
+    # Vote `above` when x > upper, `below` when x < lower, Hold otherwise (upper checked first)
+    return np.select([x > upper, x < lower], [above, below], 0)
+
+
+# Per-bar votes (-2..2) for every indicator, computed over whole columns at once.
+# Each row reproduces what combined_strategy would report if the frame ended at that bar.
+def indicator_votes(graph: IndicatorGraph, market_returns: Optional[pd.Series] = None) -> Dict[str, np.ndarray]:
+    def values(obj):
+        return np.asarray(obj, dtype=float)
+
+    close = values(graph.get('close'))
+    high = values(graph.get('high'))
+    low = values(graph.get('low'))
+    mean = lambda window: values(graph.node('rolling_mean', 'close', window))
+    highest14, lowest14 = values(graph.node('rolling_max', 'high', 14)), values(graph.node('rolling_min', 'low', 14))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = values(graph.node('rsi', 14))
+        macd = values(graph.node('macd', 12, 26))
+        signal_line = values(graph.node('ewm', ('macd', 12, 26), 9))
+        band_mean, band_std = mean(20), values(graph.node('rolling_std', 'close', 20))
+        stochastic = (close - lowest14) / (highest14 - lowest14) * 100
+        span_a = values(((graph.node('rolling_mean', 'close', 9) + graph.node('rolling_mean', 'close', 26)) / 2).shift(26))
+        span_b = values(graph.node('shift', ('rolling_mean', 'close', 52), 26))
+        williams_r = (highest14 - close) / (highest14 - lowest14) * -100
+        tp = values(graph.node('typical_price'))
+        cci = (tp - values(graph.node('rolling_mean', ('typical_price',), 20))) / (
+            0.015 * values(graph.node('rolling_std', ('typical_price',), 20)))
+        ema20, close_atr = values(graph.node('ewm', 'close', 20)), values(graph.node('close_atr', 14))
+        # Fibonacci levels use the highs/lows seen up to each bar
+        high_so_far, low_so_far = values(graph.node('cummax', 'high')), values(graph.node('cummin', 'low'))
+        fib_level = low_so_far + (high_so_far - low_so_far) * 0.618
+        hma = graph.node('rolling_mean', ('hma_raw', 14), int(np.sqrt(14)))
+        rvi = values(graph.node('rolling_mean', ('rvi_raw',), 10))
+        volatility = graph.node('rolling_mean', ('hl_range',), 10)
+        mfi = values(graph.node('mfi', 14))
+
+        votes = {
+            'rsi': np.select([rsi < 30, rsi < 50, rsi > 70], [2, 1, -2], 0),
+            'ma': _cross(mean(50), mean(200)),
+            'macd': _cross(macd, signal_line),
+            'bollinger': _band(close, band_mean - 2 * band_std, band_mean + 2 * band_std, below=1, above=-1),
+            'stochastic': np.select([stochastic < 20, stochastic > 80], [1, -1], 0),
+            'ema': _cross(values(graph.node('ewm', 'close', 12)), values(graph.node('ewm', 'close', 26))),
+            'parabolic_sar': np.where(close > values(graph.node('shift', 'close', 1)) * 0.02, 1, -1),
+            'ichimoku': np.select([close > span_a, close < span_b], [1, -1], 0),
+            'williams_r': np.select([williams_r > -20, williams_r < -80], [-1, 1], 0),
+            'cci': np.select([cci > 100, cci < -100], [-1, 1], 0),
+            'momentum': _cross(values(graph.node('diff', 'close', 10)), 0),
+            'keltner': _band(close, ema20 - 2 * close_atr, ema20 + 2 * close_atr, below=1, above=-1),
+            'donchian': _band(close, values(graph.node('rolling_min', 'low', 20)),
+                              values(graph.node('rolling_max', 'high', 20)), below=-1, above=1),
+            'pivot': np.where(close > tp, 1, -1),
+            'fibonacci': np.where(close > fib_level, -1, 1),
+            'triple_ma': np.select([(mean(5) > mean(15)) & (mean(15) > mean(50)),
+                                    (mean(5) < mean(15)) & (mean(15) < mean(50))], [1, -1], 0),
+            'hma': _cross(values(hma), values(hma.shift(1))),
+            'supertrend': _cross(close, (high + low) / 2 + 3 * close_atr),
+            'roc': _cross(values(graph.node('pct_change', 'close', 14)) * 100, 0),
+            'macd_histogram': _cross(macd - signal_line, 0),
+            'rvi': _cross(rvi, 0),
+            'chaikin_volatility': _cross(values(volatility), values(volatility.shift(1)), above=-1, below=1),
+            'mfi': np.select([mfi < 20, mfi > 80], [1, -1], 0),
+        }
+        if market_returns is None:
+            votes['beta'] = np.zeros(close.shape, dtype=int)
+        else:
+            returns = graph.node('pct_change', 'close', 1)
+            beta = returns.rolling(window=30).cov(market_returns) / market_returns.rolling(window=30).var()
+            votes['beta'] = _cross(values(beta), 1, above=-1, below=1)
+    return votes
+
+
+# Weighted score and action per bar; columns are accumulated in indicator order so the
+# floating-point result is identical to the scalar sum in combined_strategy.
+def score_votes(votes: np.ndarray, weights: Dict[str, float], buy_threshold: float = 1.0,
+                sell_threshold: float = -1.0) -> Dict[str, np.ndarray]:
+    score = np.zeros(votes.shape[:-1])
+    for column, name in enumerate(INDICATORS):
+        weight = weights.get(name, 0)
+        if weight:
+            score = score + votes[..., column] * weight
+    action = np.where(score > buy_threshold, 1, np.where(score < sell_threshold, -1, 0))
+    return {'score': score, 'action': ACTIONS[action + 1]}
+
+
+# `data` is one pair's OHLCV frame (votes: bars x 24) or a mapping of field -> bars x pairs
+# frame from OHLCVPanel.frames() (votes: bars x pairs x 24).
+# `tail` keeps only the last rows of the output (e.g. tail=1 for a latest-bar scan).
+# `state` / `carry_index` continue a previous chunk's EMAs and running extremes (see
+# IndicatorGraph); the state for the next chunk is returned under 'state'.
+def signal_matrix(data: Union[pd.DataFrame, Dict[str, pd.DataFrame]], weights: Dict[str, float],
+                  buy_threshold: float = 1.0, sell_threshold: float = -1.0,
+                  market_returns: Optional[pd.Series] = None, tail: Optional[int] = None,
+                  state: Optional[dict] = None, carry_index: Optional[int] = None) -> Dict[str, Any]:
+    graph = IndicatorGraph(data, state=state, carry_index=carry_index)
+    votes = indicator_votes(graph, market_returns)
+    rows = slice(None) if tail is None else slice(-tail, None)
+    matrix = np.stack([votes[name][rows] for name in INDICATORS], axis=-1).astype(np.int8)
+    result = score_votes(matrix, weights, buy_threshold, sell_threshold)
+    result.update({
+        'votes': matrix,
+        'indicators': list(INDICATORS),
+        'volatility': np.asarray(graph.node('rolling_mean', ('true_range',), 14), dtype=float)[rows],
+    })
+    if state is not None:
+        result['state'] = graph.next_state
+    return result
@@ -1,103 +1,148 @@
 import pandas as pd
 import numpy as np
-import Dict
+from typing import Callable, Dict, Any
+
+from data.ohlcv_buffer import OHLCVRingBuffer
+from strategy.incremental import IncrementalIndicators
+from strategy.indicator_graph import IndicatorGraph, relative_strength_index
+from strategy.indicator_store import IndicatorStore
+from strategy.signal_matrix import signal_matrix
+from strategy.panel import OHLCVPanel
+
+# Map signals to numerical scores
+SIGNAL_MAPPING = {'Strong Buy': 2,'Buy': 1,'Hold': 0,'Sell': -1,'Strong Sell': -2}
+SIGNAL_LABELS = {score: label for label, score in SIGNAL_MAPPING.items()}
+# Indicator weights (you can fine-tune these based on importance)
+INDICATOR_WEIGHTS = {'rsi': 0.1,'ma': 0.1,'macd': 0.1,'bollinger': 0.05,'stochastic': 0.05,
+                     'ema': 0.1,'parabolic_sar': 0.05,'ichimoku': 0.05,'williams_r': 0.05,
+                     'cci': 0.05,'momentum': 0.05,'keltner': 0.05,'donchian': 0.05,
+                     'pivot': 0.05,'fibonacci': 0.05,'triple_ma': 0.05,'hma': 0.05,'supertrend': 0.05,
+                     'roc': 0.05,'macd_histogram': 0.05,'rvi': 0.05,'chaikin_volatility': 0.05,
+                     'mfi': 0.05,'beta': 0.05}
+# Relative cost of each indicator on its own (0.1 ms units on a 720-bar frame), used to
+# order lazy evaluation
+INDICATOR_COSTS = {'rsi': 20,'ma': 10,'macd': 22,'bollinger': 20,'stochastic': 17,
+                   'ema': 10,'parabolic_sar': 5,'ichimoku': 22,'williams_r': 11,
+                   'cci': 23,'momentum': 4,'keltner': 21,'donchian': 11,
+                   'pivot': 7,'fibonacci': 2,'triple_ma': 15,'hma': 7,'supertrend': 13,
+                   'roc': 8,'macd_histogram': 30,'rvi': 10,'chaikin_volatility': 7,
+                   'mfi': 17,'beta': 17}
 
 class TechnicalStrategy:
-    def __init__(self):
+    # bounded_indicators=True keeps only the values each indicator reads, so indicator
+    # memory per pair stays constant however long the bot runs. `buffers` may be shared with a
+    # bar source, e.g. MarketStream.bars, whose last bar is the one still forming
+    def __init__(self, bounded_indicators: bool = False, buffers: Dict[str, OHLCVRingBuffer] = None):
         self.data = pd.DataFrame()
+        self.indicators = IndicatorStore(bounded=bounded_indicators)  # Outputs live here, not in self.data
+        self.engines = {}  # Per-pair streaming indicator state
+        self.buffers = buffers if buffers is not None else {}  # Per-pair OHLCVRingBuffer; combined_strategy evaluates a view of it
+        self._graph = None  # Shared intermediates for the current evaluation
+        self.last_graph_report = None  # IndicatorGraph.report() of the last evaluation (its series are dropped)
+
+    # Indicator intermediates come from the active evaluation graph (memoised per call)
+    def _node(self, name: str, *args):
+        graph = self._graph if self._graph is not None else IndicatorGraph(self.data)
+        return graph.node(name, *args)
 
     # 1. EMA (Exponential Moving Average)
     def ema_strategy(self, short_window: int = 12, long_window: int = 26) -> str:
-        self.data['ema_short'] = self.data['close'].ewm(span=short_window).mean()
-        self.data['ema_long'] = self.data['close'].ewm(span=long_window).mean()
+        self.indicators['ema_short'] = self._node('ewm', 'close', short_window)
+        self.indicators['ema_long'] = self._node('ewm', 'close', long_window)
         
-        if self.data['ema_short'].iloc[-1] > self.data['ema_long'].iloc[-1]:
+        if self.indicators['ema_short'][-1] > self.indicators['ema_long'][-1]:
             return 'Buy'
-        elif self.data['ema_short'].iloc[-1] < self.data['ema_long'].iloc[-1]:
+        elif self.indicators['ema_short'][-1] < self.indicators['ema_long'][-1]:
             return 'Sell'
         return 'Hold'
 
     # 2. Parabolic SAR
     def parabolic_sar_strategy(self) -> str:
-        self.data['psar'] = self.data['close'].shift(1) * 0.02
-        if self.data['close'].iloc[-1] > self.data['psar'].iloc[-1]:
+        self.indicators['psar'] = self._node('shift', 'close', 1) * 0.02
+        if self.data['close'].iloc[-1] > self.indicators['psar'][-1]:
             return 'Buy'
         else:
             return 'Sell'
 
     # 3. Ichimoku Cloud
     def ichimoku_strategy(self) -> str:
-        self.data['tenkan_sen'] = self.data['close'].rolling(window=9).mean()
-        self.data['kijun_sen'] = self.data['close'].rolling(window=26).mean()
-        self.data['senkou_span_a'] = ((self.data['tenkan_sen'] + self.data['kijun_sen']) / 2).shift(26)
-        self.data['senkou_span_b'] = self.data['close'].rolling(window=52).mean().shift(26)
+        tenkan_sen = self._node('rolling_mean', 'close', 9)
+        kijun_sen = self._node('rolling_mean', 'close', 26)
+        self.indicators['tenkan_sen'] = tenkan_sen
+        self.indicators['kijun_sen'] = kijun_sen
+        self.indicators['senkou_span_a'] = ((tenkan_sen + kijun_sen) / 2).shift(26)
+        self.indicators['senkou_span_b'] = self._node('shift', ('rolling_mean', 'close', 52), 26)
         
-        if self.data['close'].iloc[-1] > self.data['senkou_span_a'].iloc[-1]:
+        if self.data['close'].iloc[-1] > self.indicators['senkou_span_a'][-1]:
             return 'Buy'
-        elif self.data['close'].iloc[-1] < self.data['senkou_span_b'].iloc[-1]:
+        elif self.data['close'].iloc[-1] < self.indicators['senkou_span_b'][-1]:
             return 'Sell'
         return 'Hold'
 
     # 4. Williams %R
     def williams_r_strategy(self, period: int = 14) -> str:
-        self.data['williams_r'] = (self.data['high'].rolling(period).max() - self.data['close']) / (
-            self.data['high'].rolling(period).max() - self.data['low'].rolling(period).min()) * -100
+        highest_high = self._node('rolling_max', 'high', period)
+        lowest_low = self._node('rolling_min', 'low', period)
+        self.indicators['williams_r'] = (highest_high - self.data['close']) / (highest_high - lowest_low) * -100
         
-        if self.data['williams_r'].iloc[-1] > -20:
+        if self.indicators['williams_r'][-1] > -20:
             return 'Sell'
-        elif self.data['williams_r'].iloc[-1] < -80:
+        elif self.indicators['williams_r'][-1] < -80:
             return 'Buy'
         return 'Hold'
 
     # 5. Commodity Channel Index (CCI)
     def cci_strategy(self, period: int = 20) -> str:
-        self.data['tp'] = (self.data['high'] + self.data['low'] + self.data['close']) / 3
-        self.data['cci'] = (self.data['tp'] - self.data['tp'].rolling(window=period).mean()) / (
-            0.015 * self.data['tp'].rolling(window=period).std())
+        tp = self._node('typical_price')
+        self.indicators['tp'] = tp
+        self.indicators['cci'] = (tp - self._node('rolling_mean', ('typical_price',), period)) / (
+            0.015 * self._node('rolling_std', ('typical_price',), period))
         
-        if self.data['cci'].iloc[-1] > 100:
+        if self.indicators['cci'][-1] > 100:
             return 'Sell'
-        elif self.data['cci'].iloc[-1] < -100:
+        elif self.indicators['cci'][-1] < -100:
             return 'Buy'
         return 'Hold'
 
     # 6. Momentum Indicator
     def momentum_strategy(self, period: int = 10) -> str:
-        self.data['momentum'] = self.data['close'].diff(period)
-        if self.data['momentum'].iloc[-1] > 0:
+        self.indicators['momentum'] = self._node('diff', 'close', period)
+        if self.indicators['momentum'][-1] > 0:
             return 'Buy'
-        elif self.data['momentum'].iloc[-1] < 0:
+        elif self.indicators['momentum'][-1] < 0:
             return 'Sell'
         return 'Hold'
 
     # 7. Keltner Channel
     def keltner_strategy(self) -> str:
-        self.data['ema'] = self.data['close'].ewm(span=20).mean()
-        self.data['atr'] = self.data['close'].diff().abs().rolling(window=14).mean()
-        self.data['upper'] = self.data['ema'] + 2 * self.data['atr']
-        self.data['lower'] = self.data['ema'] - 2 * self.data['atr']
+        ema = self._node('ewm', 'close', 20)
+        atr = self._node('close_atr', 14)
+        self.indicators['ema'] = ema
+        self.indicators['atr'] = atr
+        self.indicators['upper'] = ema + 2 * atr
+        self.indicators['lower'] = ema - 2 * atr
         
-        if self.data['close'].iloc[-1] > self.data['upper'].iloc[-1]:
+        if self.data['close'].iloc[-1] > self.indicators['upper'][-1]:
             return 'Sell'
-        elif self.data['close'].iloc[-1] < self.data['lower'].iloc[-1]:
+        elif self.data['close'].iloc[-1] < self.indicators['lower'][-1]:
             return 'Buy'
         return 'Hold'
 
     # 8. Donchian Channel
     def donchian_strategy(self, period: int = 20) -> str:
-        self.data['upper'] = self.data['high'].rolling(window=period).max()
-        self.data['lower'] = self.data['low'].rolling(window=period).min()
+        self.indicators['upper'] = self._node('rolling_max', 'high', period)
+        self.indicators['lower'] = self._node('rolling_min', 'low', period)
         
-        if self.data['close'].iloc[-1] > self.data['upper'].iloc[-1]:
+        if self.data['close'].iloc[-1] > self.indicators['upper'][-1]:
             return 'Buy'
-        elif self.data['close'].iloc[-1] < self.data['lower'].iloc[-1]:
+        elif self.data['close'].iloc[-1] < self.indicators['lower'][-1]:
             return 'Sell'
         return 'Hold'
 
     # 9. Pivot Points
     def pivot_points_strategy(self) -> str:
-        self.data['pivot'] = (self.data['high'] + self.data['low'] + self.data['close']) / 3
-        if self.data['close'].iloc[-1] > self.data['pivot'].iloc[-1]:
+        self.indicators['pivot'] = self._node('typical_price')
+        if self.data['close'].iloc[-1] > self.indicators['pivot'][-1]:
             return 'Buy'
         else:
             return 'Sell'
@@ -118,9 +163,9 @@ class TechnicalStrategy:
         if len(self.data) < 10:
             return 'Hold'  # Insufficient data
         # Simple wave pattern detection (placeholder logic)
-        self.data['price_change'] = self.data['close'].diff()
-        upward_moves = (self.data['price_change'] > 0).sum()
-        downward_moves = (self.data['price_change'] < 0).sum()
+        price_change = self.data['close'].diff()
+        upward_moves = (price_change > 0).sum()
+        downward_moves = (price_change < 0).sum()
         
         if upward_moves >= 5 and downward_moves >= 3:
             return 'Buy'  # Wave 3 detected
@@ -149,8 +194,8 @@ class TechnicalStrategy:
     
     # 13. Relative Strength Index
     def rsi_strategy(self, pair: str, period: int = 14) -> str:
-        self.data['rsi'] = self.calculate_rsi(self.data['close'], period)
-        current_rsi = self.data['rsi'].iloc[-1]
+        self.indicators['rsi'] = self._node('rsi', period)
+        current_rsi = self.indicators['rsi'][-1]
         if current_rsi < 30:
             return 'Strong Buy'
         elif current_rsi < 50:
@@ -161,219 +206,284 @@ class TechnicalStrategy:
             return 'Hold'
     
     def calculate_rsi(self, prices, period=14):
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(period).mean()
-        rs = gain / loss
-        return 100 - (100 / (1 + rs))
+        return relative_strength_index(prices.diff(), period)
     
     # 14. Moving Average Crossover Strategy
     def ma_strategy(self, pair: str, short_window: int = 50, long_window: int = 200) -> str:
-        self.data['short_ma'] = self.data['close'].rolling(window=short_window).mean()
-        self.data['long_ma'] = self.data['close'].rolling(window=long_window).mean()
+        self.indicators['short_ma'] = self._node('rolling_mean', 'close', short_window)
+        self.indicators['long_ma'] = self._node('rolling_mean', 'close', long_window)
         
-        if self.data['short_ma'].iloc[-1] > self.data['long_ma'].iloc[-1]:
+        if self.indicators['short_ma'][-1] > self.indicators['long_ma'][-1]:
             return 'Buy'
-        elif self.data['short_ma'].iloc[-1] < self.data['long_ma'].iloc[-1]:
+        elif self.indicators['short_ma'][-1] < self.indicators['long_ma'][-1]:
             return 'Sell'
         else:
             return 'Hold'
     
     # 15. MACD Strategy
     def macd_strategy(self) -> str:
-        self.data['ema12'] = self.data['close'].ewm(span=12).mean()
-        self.data['ema26'] = self.data['close'].ewm(span=26).mean()
-        self.data['macd'] = self.data['ema12'] - self.data['ema26']
-        self.data['signal_line'] = self.data['macd'].ewm(span=9).mean()
+        self.indicators['ema12'] = self._node('ewm', 'close', 12)
+        self.indicators['ema26'] = self._node('ewm', 'close', 26)
+        self.indicators['macd'] = self._node('macd', 12, 26)
+        self.indicators['signal_line'] = self._node('ewm', ('macd', 12, 26), 9)
         
-        if self.data['macd'].iloc[-1] > self.data['signal_line'].iloc[-1]:
+        if self.indicators['macd'][-1] > self.indicators['signal_line'][-1]:
             return 'Buy'
-        elif self.data['macd'].iloc[-1] < self.data['signal_line'].iloc[-1]:
+        elif self.indicators['macd'][-1] < self.indicators['signal_line'][-1]:
             return 'Sell'
         else:
             return 'Hold'
     
     # 16. Bollinger Bands Strategy
     def bollinger_strategy(self) -> str:
-        self.data['rolling_mean'] = self.data['close'].rolling(window=20).mean()
-        self.data['rolling_std'] = self.data['close'].rolling(window=20).std()
-        self.data['upper_band'] = self.data['rolling_mean'] + (2 * self.data['rolling_std'])
-        self.data['lower_band'] = self.data['rolling_mean'] - (2 * self.data['rolling_std'])
+        rolling_mean = self._node('rolling_mean', 'close', 20)
+        rolling_std = self._node('rolling_std', 'close', 20)
+        self.indicators['rolling_mean'] = rolling_mean
+        self.indicators['rolling_std'] = rolling_std
+        self.indicators['upper_band'] = rolling_mean + (2 * rolling_std)
+        self.indicators['lower_band'] = rolling_mean - (2 * rolling_std)
         
         current_price = self.data['close'].iloc[-1]
         
-        if current_price > self.data['upper_band'].iloc[-1]:
+        if current_price > self.indicators['upper_band'][-1]:
             return 'Sell'
-        elif current_price < self.data['lower_band'].iloc[-1]:
+        elif current_price < self.indicators['lower_band'][-1]:
             return 'Buy'
         else:
             return 'Hold'
     
     # 17. Stochastic Oscillator Strategy
     def stochastic_strategy(self, period: int = 14) -> str:
-        self.data['lowest_low'] = self.data['low'].rolling(window=period).min()
-        self.data['highest_high'] = self.data['high'].rolling(window=period).max()
-        self.data['%K'] = (self.data['close'] - self.data['lowest_low']) / (self.data['highest_high'] - self.data['lowest_low']) * 100
+        lowest_low = self._node('rolling_min', 'low', period)
+        highest_high = self._node('rolling_max', 'high', period)
+        self.indicators['lowest_low'] = lowest_low
+        self.indicators['highest_high'] = highest_high
+        self.indicators['%K'] = (self.data['close'] - lowest_low) / (highest_high - lowest_low) * 100
         
-        if self.data['%K'].iloc[-1] < 20:
+        if self.indicators['%K'][-1] < 20:
             return 'Buy'
-        elif self.data['%K'].iloc[-1] > 80:
+        elif self.indicators['%K'][-1] > 80:
             return 'Sell'
         else:
             return 'Hold'
     
     # 18. Average True Range (ATR) Strategy
     def atr_strategy(self, period: int = 14) -> float:
-        self.data['high_low'] = self.data['high'] - self.data['low']
-        self.data['high_close'] = abs(self.data['high'] - self.data['close'].shift())
-        self.data['low_close'] = abs(self.data['low'] - self.data['close'].shift())
-        self.data['true_range'] = self.data[['high_low', 'high_close', 'low_close']].max(axis=1)
-        self.data['atr'] = self.data['true_range'].rolling(window=period).mean()
+        self.indicators['true_range'] = self._node('true_range')
+        self.indicators['atr'] = self._node('rolling_mean', ('true_range',), period)
         
-        return self.data['atr'].iloc[-1]
+        return self.indicators['atr'][-1]
     
     # 19. Triple Moving Average Crossover 
     def triple_ma_strategy(self, short_window: int = 5, medium_window: int = 15, long_window: int = 50) -> str:
-        self.data['short_ma'] = self.data['close'].rolling(window=short_window).mean()
-        self.data['medium_ma'] = self.data['close'].rolling(window=medium_window).mean()
-        self.data['long_ma'] = self.data['close'].rolling(window=long_window).mean()
+        self.indicators['short_ma'] = self._node('rolling_mean', 'close', short_window)
+        self.indicators['medium_ma'] = self._node('rolling_mean', 'close', medium_window)
+        self.indicators['long_ma'] = self._node('rolling_mean', 'close', long_window)
         
-        if self.data['short_ma'].iloc[-1] > self.data['medium_ma'].iloc[-1] > self.data['long_ma'].iloc[-1]:
+        if self.indicators['short_ma'][-1] > self.indicators['medium_ma'][-1] > self.indicators['long_ma'][-1]:
             return 'Buy'
-        elif self.data['short_ma'].iloc[-1] < self.data['medium_ma'].iloc[-1] < self.data['long_ma'].iloc[-1]:
+        elif self.indicators['short_ma'][-1] < self.indicators['medium_ma'][-1] < self.indicators['long_ma'][-1]:
             return 'Sell'
         return 'Hold'
 
     # 20. Hull Moving Average (HMA)
     def hma_strategy(self, period: int = 14) -> str:
-        half_length = int(period / 2)
         sqrt_length = int(np.sqrt(period))
         
-        self.data['hma'] = self.data['close'].rolling(half_length).mean() * 2 - self.data['close'].rolling(period).mean()
-        self.data['hma'] = self.data['hma'].rolling(sqrt_length).mean()
+        hma = self.indicators.write('hma', self._node('rolling_mean', ('hma_raw', period), sqrt_length), lookback=2)
         
-        if self.data['hma'].iloc[-1] > self.data['hma'].iloc[-2]:
+        if hma[-1] > hma[-2]:
             return 'Buy'
-        elif self.data['hma'].iloc[-1] < self.data['hma'].iloc[-2]:
+        elif hma[-1] < hma[-2]:
             return 'Sell'
         return 'Hold'
 
     # 21. SuperTrend Indicator
     def supertrend_strategy(self, multiplier: float = 3, period: int = 14) -> str:
         hl2 = (self.data['high'] + self.data['low']) / 2
-        atr = self.data['close'].diff().abs().rolling(window=period).mean()
-        self.data['supertrend'] = hl2 + (multiplier * atr)
+        atr = self._node('close_atr', period)
+        self.indicators['supertrend'] = hl2 + (multiplier * atr)
         
-        if self.data['close'].iloc[-1] > self.data['supertrend'].iloc[-1]:
+        if self.data['close'].iloc[-1] > self.indicators['supertrend'][-1]:
             return 'Buy'
-        elif self.data['close'].iloc[-1] < self.data['supertrend'].iloc[-1]:
+        elif self.data['close'].iloc[-1] < self.indicators['supertrend'][-1]:
             return 'Sell'
         return 'Hold'
 
     # 23. Rate of Change (ROC)
     def roc_strategy(self, period: int = 14) -> str:
-        self.data['roc'] = self.data['close'].pct_change(period) * 100
-        if self.data['roc'].iloc[-1] > 0:
+        self.indicators['roc'] = self._node('pct_change', 'close', period) * 100
+        if self.indicators['roc'][-1] > 0:
             return 'Buy'
-        elif self.data['roc'].iloc[-1] < 0:
+        elif self.indicators['roc'][-1] < 0:
             return 'Sell'
         return 'Hold'
 
     # 24. Moving Average Convergence Divergence Histogram (MACDH)
     def macd_histogram_strategy(self) -> str:
-        self.data['ema12'] = self.data['close'].ewm(span=12).mean()
-        self.data['ema26'] = self.data['close'].ewm(span=26).mean()
-        self.data['macd'] = self.data['ema12'] - self.data['ema26']
-        self.data['signal_line'] = self.data['macd'].ewm(span=9).mean()
-        self.data['macd_histogram'] = self.data['macd'] - self.data['signal_line']
+        macd = self._node('macd', 12, 26)
+        signal_line = self._node('ewm', ('macd', 12, 26), 9)
+        self.indicators['ema12'] = self._node('ewm', 'close', 12)
+        self.indicators['ema26'] = self._node('ewm', 'close', 26)
+        self.indicators['macd'] = macd
+        self.indicators['signal_line'] = signal_line
+        self.indicators['macd_histogram'] = macd - signal_line
         
-        if self.data['macd_histogram'].iloc[-1] > 0:
+        if self.indicators['macd_histogram'][-1] > 0:
             return 'Buy'
-        elif self.data['macd_histogram'].iloc[-1] < 0:
+        elif self.indicators['macd_histogram'][-1] < 0:
             return 'Sell'
         return 'Hold'
 
     # 25. Relative Vigor Index (RVI)
     def rvi_strategy(self, period: int = 10) -> str:
-        self.data['rvi'] = ((self.data['close'] - self.data['open']) / (self.data['high'] - self.data['low'])).rolling(window=period).mean()
-        if self.data['rvi'].iloc[-1] > 0:
+        self.indicators['rvi'] = self._node('rolling_mean', ('rvi_raw',), period)
+        if self.indicators['rvi'][-1] > 0:
             return 'Buy'
-        elif self.data['rvi'].iloc[-1] < 0:
+        elif self.indicators['rvi'][-1] < 0:
             return 'Sell'
         return 'Hold'
 
     # 26. Chaikin Volatility Indicator
     def chaikin_volatility_strategy(self, period: int = 10) -> str:
-        self.data['volatility'] = (self.data['high'] - self.data['low']).rolling(window=period).mean()
-        if self.data['volatility'].iloc[-1] > self.data['volatility'].iloc[-2]:
+        volatility = self.indicators.write('volatility', self._node('rolling_mean', ('hl_range',), period), lookback=2)
+        if volatility[-1] > volatility[-2]:
             return 'Sell'  # Market becoming unstable
-        elif self.data['volatility'].iloc[-1] < self.data['volatility'].iloc[-2]:
+        elif volatility[-1] < volatility[-2]:
             return 'Buy'  # Market stabilizing
         return 'Hold'
 
+    # 27. Money Flow Index (MFI)
+    def mfi_strategy(self, period: int = 14) -> str:
+        self.indicators['mfi'] = self._node('mfi', period)
+
+        if self.indicators['mfi'][-1] < 20:
+            return 'Buy'
+        elif self.indicators['mfi'][-1] > 80:
+            return 'Sell'
+        return 'Hold'
+
+    # 28. Beta against market returns
+    def beta_strategy(self, market_returns: pd.Series, period: int = 30) -> str:
+        returns = self._node('pct_change', 'close', 1)
+        beta = returns.rolling(window=period).cov(market_returns) / market_returns.rolling(window=period).var()
+        self.indicators['beta'] = beta.reindex(self.data.index)  # Aligned to the bars, as a frame column was
+
+        if self.indicators['beta'][-1] > 1:
+            return 'Sell'  # Amplifies market moves
+        elif self.indicators['beta'][-1] < 1:
+            return 'Buy'
+        return 'Hold'
+
     # *Combine Strategies into Utility Score*
-    def combined_strategy(self, pair: str) -> Dict[str, Any]:
-        # Individual indicator signals
-        rsi_signal = self.rsi_strategy(pair)
-        ma_signal = self.ma_strategy(pair)
-        macd_signal = self.macd_strategy()
-        bollinger_signal = self.bollinger_strategy()
-        stochastic_signal = self.stochastic_strategy()
-        atr_value = self.atr_strategy()
-        ema_signal = self.ema_strategy()
-        parabolic_sar_signal = self.parabolic_sar_strategy()
-        ichimoku_signal = self.ichimoku_strategy()
-        williams_r_signal = self.williams_r_strategy()
-        cci_signal = self.cci_strategy()
-        momentum_signal = self.momentum_strategy()
-        keltner_signal = self.keltner_strategy()
-        donchian_signal = self.donchian_strategy()
-        pivot_signal = self.pivot_points_strategy()
-        fibonacci_signal = self.fibonacci_strategy()
-        triple_ma_signal = self.triple_ma_strategy()
-        hma_signal = self.hma_strategy()
-        supertrend_signal = self.supertrend_strategy()
-        roc_signal = self.roc_strategy()
-        macd_histogram_signal = self.macd_histogram_strategy()
-        rvi_signal = self.rvi_strategy()
-        chaikin_volatility_signal = self.chaikin_volatility_strategy()
-        mfi_signal = self.mfi_strategy()
-        beta_signal = self.beta_strategy(market_returns=pd.Series(np.random.uniform(-0.05, 0.05, size=200)))
-        # Map signals to numerical scores
-        signal_mapping = {'Strong Buy': 2,'Buy': 1,'Hold': 0,'Sell': -1,'Strong Sell': -2}
-        # Indicator weights (you can fine-tune these based on importance)
-        indicator_weights = {'rsi': 0.1,'ma': 0.1,'macd': 0.1,'bollinger': 0.05,'stochastic': 0.05,
-                             'ema': 0.1,'parabolic_sar': 0.05,'ichimoku': 0.05,'williams_r': 0.05,
-                             'cci': 0.05,'momentum': 0.05,'keltner': 0.05,'donchian': 0.05,
-                             'pivot': 0.05,'fibonacci': 0.05,'triple_ma': 0.05,'hma': 0.05,'supertrend': 0.05,
-                             'roc': 0.05,'macd_histogram': 0.05,'rvi': 0.05,'chaikin_volatility': 0.05,
-                             'mfi': 0.05,'beta': 0.05}
-        # Aggregate signals with weights
-        weighted_score = sum([
-            signal_mapping.get(rsi_signal, 0) * indicator_weights['rsi'],
-            signal_mapping.get(ma_signal, 0) * indicator_weights['ma'],
-            signal_mapping.get(macd_signal, 0) * indicator_weights['macd'],
-            signal_mapping.get(bollinger_signal, 0) * indicator_weights['bollinger'],
-            signal_mapping.get(stochastic_signal, 0) * indicator_weights['stochastic'],
-            signal_mapping.get(ema_signal, 0) * indicator_weights['ema'],
-            signal_mapping.get(parabolic_sar_signal, 0) * indicator_weights['parabolic_sar'],
-            signal_mapping.get(ichimoku_signal, 0) * indicator_weights['ichimoku'],
-            signal_mapping.get(williams_r_signal, 0) * indicator_weights['williams_r'],
-            signal_mapping.get(cci_signal, 0) * indicator_weights['cci'],
-            signal_mapping.get(momentum_signal, 0) * indicator_weights['momentum'],
-            signal_mapping.get(keltner_signal, 0) * indicator_weights['keltner'],
-            signal_mapping.get(donchian_signal, 0) * indicator_weights['donchian'],
-            signal_mapping.get(pivot_signal, 0) * indicator_weights['pivot'],
-            signal_mapping.get(fibonacci_signal, 0) * indicator_weights['fibonacci'],
-            signal_mapping.get(triple_ma_signal, 0) * indicator_weights['triple_ma'],
-            signal_mapping.get(hma_signal, 0) * indicator_weights['hma'],
-            signal_mapping.get(supertrend_signal, 0) * indicator_weights['supertrend'],
-            signal_mapping.get(roc_signal, 0) * indicator_weights['roc'],
-            signal_mapping.get(macd_histogram_signal, 0) * indicator_weights['macd_histogram'],
-            signal_mapping.get(rvi_signal, 0) * indicator_weights['rvi'],
-            signal_mapping.get(chaikin_volatility_signal, 0) * indicator_weights['chaikin_volatility'],
-            signal_mapping.get(mfi_signal, 0) * indicator_weights['mfi'],
-            signal_mapping.get(beta_signal, 0) * indicator_weights['beta']])
+    # lazy=True skips zero-weight indicators, evaluates the cheapest per unit of weight
+    # first and stops once the remaining weight can no longer change the action.
+    # With lazy=True the remaining details are only filled in when details=True.
+    def combined_strategy(self, pair: str, lazy: bool = False, details: bool = True) -> Dict[str, Any]:
+        if pair in self.buffers:
+            self.data = self.buffers[pair].frame()  # Zero-copy view of the pair's latest bars
+        return self._evaluate_data(pair, lazy, details)
+
+    # *Multi-timeframe evaluation: one decision per timeframe of a MultiTimeframeResampler,
+    # from zero-copy views of its buffers (no extra OHLC requests or resample() calls)*
+    def multi_timeframe_strategy(self, pair: str, resampler, lazy: bool = False,
+                                 details: bool = True) -> Dict[str, Dict[str, Any]]:
+        decisions = {}
+        for timeframe in resampler.timeframes:
+            self.data = resampler.frame(timeframe)
+            decisions[timeframe] = self._evaluate_data(pair, lazy, details)
+        return decisions
+
+    def _evaluate_data(self, pair: str, lazy: bool, details: bool) -> Dict[str, Any]:
+        # One graph per evaluation, so intermediates shared between indicators are computed once
+        self._graph = IndicatorGraph(self.data)
+        try:
+            if lazy:
+                return self._evaluate_lazily(pair, details)
+            signals, atr_value = self._evaluate_indicators(pair)
+        finally:
+            self.last_graph_report, self._graph = self._graph.report(), None
+        return self.score_signals(signals, atr_value)
+
+    # Individual indicator signals, in INDICATOR_WEIGHTS order
+    def _indicator_functions(self, pair: str) -> Dict[str, Callable[[], str]]:
+        return {
+            'rsi': lambda: self.rsi_strategy(pair),
+            'ma': lambda: self.ma_strategy(pair),
+            'macd': self.macd_strategy,
+            'bollinger': self.bollinger_strategy,
+            'stochastic': self.stochastic_strategy,
+            'ema': self.ema_strategy,
+            'parabolic_sar': self.parabolic_sar_strategy,
+            'ichimoku': self.ichimoku_strategy,
+            'williams_r': self.williams_r_strategy,
+            'cci': self.cci_strategy,
+            'momentum': self.momentum_strategy,
+            'keltner': self.keltner_strategy,
+            'donchian': self.donchian_strategy,
+            'pivot': self.pivot_points_strategy,
+            'fibonacci': self.fibonacci_strategy,
+            'triple_ma': self.triple_ma_strategy,
+            'hma': self.hma_strategy,
+            'supertrend': self.supertrend_strategy,
+            'roc': self.roc_strategy,
+            'macd_histogram': self.macd_histogram_strategy,
+            'rvi': self.rvi_strategy,
+            'chaikin_volatility': self.chaikin_volatility_strategy,
+            'mfi': self.mfi_strategy,
+            'beta': lambda: self.beta_strategy(market_returns=pd.Series(np.random.uniform(-0.05, 0.05, size=200))),
+        }
+
+    def _evaluate_indicators(self, pair: str):
+        signals = {name: evaluate() for name, evaluate in self._indicator_functions(pair).items()}
+        return signals, self.atr_strategy()
+
+    def _evaluate_lazily(self, pair: str, details: bool) -> Dict[str, Any]:
+        functions = self._indicator_functions(pair)
+        max_vote = max(SIGNAL_MAPPING.values())
+        order = sorted((name for name, weight in INDICATOR_WEIGHTS.items() if weight),
+                       key=lambda name: INDICATOR_COSTS[name] / abs(INDICATOR_WEIGHTS[name]))
+        remaining = sum(abs(INDICATOR_WEIGHTS[name]) * max_vote for name in order)
+        signals, score, action = {}, 0.0, None
+        for name in order:
+            signals[name] = functions[name]()
+            score += SIGNAL_MAPPING.get(signals[name], 0) * INDICATOR_WEIGHTS[name]
+            remaining -= abs(INDICATOR_WEIGHTS[name]) * max_vote
+            action = self._settled_action(score, remaining)
+            if action is not None:
+                break
+
+        if details or action is None:
+            for name, evaluate in functions.items():
+                if name not in signals:
+                    signals[name] = evaluate()
+            result = self.score_signals(signals, self.atr_strategy())
+        else:
+            # Score and details cover only the indicators needed to settle the action
+            result = {
+                'action': action,
+                'volatility': self.atr_strategy(),
+                'score': round(score, 2),
+                'details': signals,
+            }
+        result['evaluated'] = len(signals)
+        return result
+
+    # Action implied by a partial score once the weight left cannot move it across a threshold
+    @staticmethod
+    def _settled_action(score: float, remaining: float, margin: float = 1e-9):
+        if score - remaining > 1.0 + margin:
+            return 'buy'
+        if score + remaining < -1.0 - margin:
+            return 'sell'
+        if score + remaining < 1.0 - margin and score - remaining > -1.0 + margin:
+            return 'hold'
+        return None
+
+    # Aggregate indicator signals with weights into a trading decision
+    def score_signals(self, signals: Dict[str, str], volatility: float) -> Dict[str, Any]:
+        weighted_score = sum(SIGNAL_MAPPING.get(signals[name], 0) * weight
+                             for name, weight in INDICATOR_WEIGHTS.items())
         # Decision thresholds
         if weighted_score > 1.0:
             action = 'buy'
@@ -383,36 +493,60 @@ class TechnicalStrategy:
             action = 'hold'
         return {
             'action': action,
-            'volatility': atr_value,
+            'volatility': volatility,
             'score': round(weighted_score, 2),
-            'details': {
-                'rsi': rsi_signal,
-                'ma': ma_signal,
-                'macd': macd_signal,
-                'bollinger': bollinger_signal,
-                'stochastic': stochastic_signal,
-                'ema': ema_signal,
-                'parabolic_sar': parabolic_sar_signal,
-                'ichimoku': ichimoku_signal,
-                'williams_r': williams_r_signal,
-                'cci': cci_signal,
-                'momentum': momentum_signal,
-                'keltner': keltner_signal,
-                'donchian': donchian_signal,
-                'pivot': pivot_signal,
-                'fibonacci': fibonacci_signal,
-                'triple_ma': triple_ma_signal,
-                'hma': hma_signal,
-                'supertrend': supertrend_signal,
-                'roc': roc_signal,
-                'macd_histogram': macd_histogram_signal,
-                'rvi': rvi_signal,
-                'chaikin_volatility': chaikin_volatility_signal,
-                'mfi': mfi_signal,
-                'beta': beta_signal
-            }
+            'details': {name: signals[name] for name in INDICATOR_WEIGHTS}
         }
 
+    # *Full-history evaluation: per-bar votes, scores and actions in one vectorized pass*
+    def signal_matrix(self, data: pd.DataFrame = None, market_returns: pd.Series = None,
+                      weights: Dict[str, float] = None, buy_threshold: float = 1.0,
+                      sell_threshold: float = -1.0, tail: int = None) -> Dict[str, Any]:
+        data = self.data if data is None else data
+        return signal_matrix(data, INDICATOR_WEIGHTS if weights is None else weights,
+                             buy_threshold, sell_threshold, market_returns, tail)
+
+    # *Panel evaluation: latest decision for every pair in an OHLCVPanel at once*
+    def panel_strategy(self, panel: OHLCVPanel, market_returns: pd.Series = None) -> Dict[str, Dict[str, Any]]:
+        result = self.signal_matrix(panel.frames(), market_returns, tail=1)
+        latest_close = panel.fields['close'][-1]
+        decisions = {}
+        for column, pair in enumerate(panel.pairs):
+            if np.isnan(latest_close[column]):
+                print(f"[WARNING] No bar for {pair} at {panel.index[-1]}. Skipping.")
+                continue
+            score = result['score'][-1, column]
+            decisions[pair] = {
+                'action': result['action'][-1, column],
+                'volatility': result['volatility'][-1, column],
+                'score': round(score, 2),
+                'details': {name: SIGNAL_LABELS[vote]
+                            for name, vote in zip(result['indicators'], result['votes'][-1, column])}
+            }
+        return decisions
+
+    # *Streaming evaluation: O(1) indicator updates per closed bar*
+    def update_bar(self, pair: str, bar: Dict[str, float], market_return: float = float('nan')):
+        engine = self.engines.get(pair)
+        if engine is None:
+            engine = self.engines[pair] = IncrementalIndicators()
+        engine.update(bar['open'], bar['high'], bar['low'], bar['close'], bar['volume'], market_return)
+
+    # Replay a history frame into the streaming state for a pair
+    def warm_up(self, pair: str, data: pd.DataFrame, market_returns: pd.Series = None):
+        self.engines[pair] = IncrementalIndicators()
+        columns = [data[col].to_numpy(dtype=float) for col in ('open', 'high', 'low', 'close', 'volume')]
+        if market_returns is None:
+            market = np.full(len(data), np.nan)
+        else:
+            market = market_returns.reindex(data.index).to_numpy(dtype=float)
+        for o, h, l, c, v, m in zip(*columns, market):
+            self.engines[pair].update(o, h, l, c, v, m)
+
+    def incremental_strategy(self, pair: str) -> Dict[str, Any]:
+        engine = self.engines[pair]
+        return self.score_signals(engine.signals(), engine.atr)
+
 
 # Example Usage
 if __name__ == '__main__':
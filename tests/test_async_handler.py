@@ -0,0 +1,79 @@
+# tests/test_async_handler.py
+import asyncio
+import tempfile
+import time
+import unittest
+from data.ohlc_store import OHLCStore
+from execution.async_data_handler import AsyncKrakenDataHandler
+from execution.async_kraken_client import AsyncKrakenClient
+from execution.async_trade_executor import AsyncTradeExecutor
+from execution.data_handler import KrakenDataHandler
+from execution.kraken_client import KrakenClient
+from execution.market_cache import MarketDataCache
+from execution.trade_executor import TradeExecutor
+from tests.test_kraken_client import LocalKraken
+
+PAIRS = [f'PAIR{i:02d}USD' for i in range(20)]
+LATENCY = 0.05
+
+
+class TestAsyncKraken(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.kraken = LocalKraken(latency=LATENCY).__enter__()
+        self.directory = tempfile.TemporaryDirectory()
+        self.client = KrakenClient('key', 'c2VjcmV0')
+        self.client.uri = self.kraken.uri
+
+    async def asyncTearDown(self):
+        self.kraken.__exit__()
+        self.directory.cleanup()
+
+    async def test_handler_matches_blocking_handler_and_overlaps_requests(self):
+        blocking = KrakenDataHandler(OHLCStore(self.directory.name + '/sync'), MarketDataCache({}), self.client)
+        handler = AsyncKrakenDataHandler(OHLCStore(self.directory.name + '/async'), MarketDataCache({'Ticker': 5}),
+                                         AsyncKrakenClient(self.client))
+        try:
+            self.assertEqual(await handler.get_ticker('ADAUSD'), blocking.get_ticker('ADAUSD'))
+            self.assertEqual(await handler.get_tickers(PAIRS[:3]), blocking.get_tickers(PAIRS[:3]))
+            self.assertEqual(await handler.get_balance(), blocking.get_balance())
+            self.assertEqual(await handler.get_open_orders(), blocking.get_open_orders())
+            self.assertTrue((await handler.get_ohlc('ADAUSD')).equals(blocking.get_ohlc('ADAUSD')))
+
+            # Callers asking for the same ticker at once share one request
+            requests = self.client.requests['Ticker']
+            results = await asyncio.gather(*(handler.get_ticker('DOTUSD') for _ in range(5)))
+            self.assertEqual(self.client.requests['Ticker'], requests + 1)
+            self.assertTrue(all(result == results[0] for result in results))
+
+            start = time.perf_counter()
+            frames = await handler.get_ohlc_many(PAIRS)
+            elapsed = time.perf_counter() - start
+            self.assertEqual(list(frames), PAIRS)
+            self.assertTrue(all(len(frame) == 1 for frame in frames.values()))
+            self.assertLess(elapsed, LATENCY * len(PAIRS) / 2)  # Overlapping, not one after another
+        finally:
+            await handler.close()
+
+    async def test_orders_keep_nonce_order_without_blocking_the_loop(self):
+        executor = AsyncTradeExecutor(MarketDataCache({}), AsyncKrakenClient(self.client))
+        try:
+            blocking = TradeExecutor(MarketDataCache({}), self.client).place_market_order('ADAUSD', 1.0, 'buy')
+            start = time.perf_counter()
+            orders = asyncio.gather(*(executor.place_market_order(pair, 1.0, 'buy') for pair in PAIRS))
+            tickers = await asyncio.gather(*(executor.api.query_public('Ticker', {'pair': pair}) for pair in PAIRS))
+            public_elapsed = time.perf_counter() - start
+            results = await orders
+            elapsed = time.perf_counter() - start
+            self.assertEqual(results, [blocking] * len(PAIRS))
+            self.assertTrue(await executor.cancel_order('O1'))
+            # Private calls go out one at a time (nonce order); public ones overlap meanwhile
+            self.assertGreaterEqual(elapsed, LATENCY * len(PAIRS))
+            self.assertTrue(all(not ticker['error'] for ticker in tickers))
+            self.assertLess(public_elapsed, LATENCY * len(PAIRS) / 2)
+            self.assertEqual(self.client.requests['AddOrder'], len(PAIRS) + 1)
+        finally:
+            await executor.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
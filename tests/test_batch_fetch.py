@@ -0,0 +1,89 @@
+# tests/test_batch_fetch.py
+import tempfile
+import threading
+import time
+import unittest
+from data.ohlc_store import OHLCStore
+from execution.data_handler import KrakenDataHandler
+from execution.kraken_client import KrakenClient
+from execution.market_cache import MarketDataCache
+from tests.test_ohlc_store import RecordedResponse
+
+
+def ticker(price: float) -> dict:
+    return {'a': [str(price), '1', '1.0'], 'b': [str(price), '1', '1.0'], 'c': [str(price), '10']}
+
+
+class OHLCServer:
+    # Stands in for the HTTP session: every OHLC request takes `latency` seconds and returns
+    # two hourly bars for the pair; tracks how many requests were in flight at once
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.requests = []
+        self.in_flight = self.peak = 0
+        self.lock = threading.Lock()
+
+    def get(self, url: str, params: dict = None, **kwargs) -> RecordedResponse:
+        with self.lock:
+            self.requests.append(params['pair'])
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(self.latency)
+        with self.lock:
+            self.in_flight -= 1
+        price = len(params['pair'])
+        bars = [[1735570800 + 3600 * i, str(price), str(price + 1), str(price - 1), str(price), str(price), '5.0', 3]
+                for i in range(2)]
+        return RecordedResponse({'error': [], 'result': {params['pair']: bars, 'last': 1735570800}})
+
+
+class TestBatchFetch(unittest.TestCase):
+    def test_tickers_for_many_pairs_in_one_request(self):
+        handler = KrakenDataHandler(cache=MarketDataCache({'Ticker': 5}), client=KrakenClient())
+        requests = []
+
+        def query(method, data=None):
+            requests.append(data['pair'])
+            # Kraken keys some results by the full pair name
+            names = {'XBTUSD': 'XXBTZUSD', 'ETHUSD': 'XETHZUSD'}
+            return {'error': [], 'result': {names.get(pair, pair): ticker(i + 1)
+                                            for i, pair in enumerate(data['pair'].split(','))}}
+
+        handler.api.query_public = query
+        tickers = handler.get_tickers(['ADAUSD', 'XBTUSD', 'ETHUSD', 'DOTUSD'])
+        self.assertEqual(requests, ['ADAUSD,XBTUSD,ETHUSD,DOTUSD'])
+        self.assertEqual({pair: data['c'][0] for pair, data in tickers.items()},
+                         {'ADAUSD': '1', 'XBTUSD': '2', 'ETHUSD': '3', 'DOTUSD': '4'})
+
+        # Cached pairs are served from the batch; only the new pair is requested
+        self.assertEqual(handler.get_ticker('XBTUSD'), {'XBTUSD': tickers['XBTUSD']})
+        tickers = handler.get_tickers(['ADAUSD', 'LTCUSD'])
+        self.assertEqual(requests, ['ADAUSD,XBTUSD,ETHUSD,DOTUSD', 'LTCUSD'])
+        self.assertEqual(sorted(tickers), ['ADAUSD', 'LTCUSD'])
+        self.assertEqual(handler.cache.stats()['Ticker'], {'hits': 2, 'misses': 5})
+
+        handler.api.query_public = lambda method, data=None: {'error': ['EQuery:Unknown asset pair'], 'result': {}}
+        self.assertEqual(handler.get_tickers(['FOOBAR']), {})
+
+    def test_ohlc_for_many_pairs_concurrently(self):
+        pairs = [f'PAIR{i:02d}USD' for i in range(8)]
+        with tempfile.TemporaryDirectory() as directory:
+            handler = KrakenDataHandler(OHLCStore(directory), MarketDataCache({'OHLC': 60}), KrakenClient())
+            handler.api.session = server = OHLCServer(latency=0.1)
+            start = time.perf_counter()
+            frames = handler.get_ohlc_many(pairs, 60, workers=8)
+            elapsed = time.perf_counter() - start
+
+            self.assertEqual(sorted(server.requests), pairs)
+            self.assertGreater(server.peak, 1)
+            self.assertLess(elapsed, 0.1 * len(pairs) / 2)
+            self.assertEqual(list(frames), pairs)
+            self.assertTrue(all(len(frame) == 2 and frame['close'].iloc[-1] == len(pair)
+                                for pair, frame in frames.items()))
+
+            handler.get_ohlc_many(pairs, 60)  # Within the OHLC TTL: no requests
+            self.assertEqual(len(server.requests), len(pairs))
+
+
+if __name__ == '__main__':
+    unittest.main()
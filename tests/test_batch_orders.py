@@ -0,0 +1,94 @@
+# tests/test_batch_orders.py
+import asyncio
+import time
+import unittest
+from execution.async_kraken_client import AsyncKrakenClient
+from execution.async_trade_executor import AsyncTradeExecutor
+from execution.kraken_client import KrakenClient
+from execution.market_cache import MarketDataCache
+from execution.trade_executor import TradeExecutor
+from tests.test_kraken_client import LocalKraken
+from tests.test_order_pipeline import FakeOrders, executor_for
+
+
+class FakeBatches(FakeOrders):
+    # FakeOrders with AddOrderBatch: `reject` maps a volume to the error that order gets
+    # inside an accepted batch, `batch_error` rejects whole batches
+    def __init__(self, reject: dict = None, batch_error: str = None, latency: float = 0.0):
+        super().__init__(latency=latency)
+        self.reject = reject or {}
+        self.batch_error = batch_error
+
+    def __call__(self, method: str, data: dict = None, timeout=None, cost: float = None) -> dict:
+        if method != 'AddOrderBatch':
+            return super().__call__(method, data, timeout)
+        time.sleep(self.latency)
+        with self.lock:
+            self.calls.append((method, data))
+            if self.batch_error:
+                return {'error': [self.batch_error]}
+            results = []
+            for order in data['orders']:
+                if order['volume'] in self.reject:
+                    results.append({'error': self.reject[order['volume']]})
+                    continue
+                txid = f'O{len(self.orders) + 1}'
+                self.orders[txid] = {'userref': order['userref'], 'status': 'open', 'vol_exec': '0',
+                                     'descr': {'pair': data['pair']}}
+                results.append({'txid': txid, 'descr': {'order': f"{order['type']} {order['volume']} {data['pair']}"}})
+            return {'error': [], 'result': {'orders': results}}
+
+
+def order(pair: str, volume: float) -> dict:
+    return {'pair': pair, 'type': 'sell', 'ordertype': 'market', 'volume': volume}
+
+
+class TestBatchOrders(unittest.TestCase):
+    def test_orders_grouped_per_pair_with_individual_results(self):
+        fake = FakeBatches(reject={'3.0': 'EOrder:Insufficient funds'}, latency=0.05)
+        executor = executor_for(fake)
+        orders = [order('ADAUSD', 1.0), order('LTCUSD', 2.0), order('ADAUSD', 3.0), order('DOTUSD', 4.0),
+                  order('ADAUSD', 5.0), order('LTCUSD', 6.0)]
+        start = time.perf_counter()
+        results = executor.place_batch(orders)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(fake.count('AddOrderBatch'), 2)  # ADAUSD and LTCUSD
+        self.assertEqual(fake.count('AddOrder'), 1)  # DOTUSD alone
+        self.assertIsNone(results[2])  # Rejected inside its batch, the rest of it placed
+        self.assertEqual([result is not None for result in results], [True, True, False, True, True, True])
+        placed = {info['userref']: txid for txid, info in fake.orders.items()}
+        batch = next(data for method, data in fake.calls if method == 'AddOrderBatch' and data['pair'] == 'ADAUSD')
+        self.assertEqual([entry['volume'] for entry in batch['orders']], ['1.0', '3.0', '5.0'])
+        self.assertEqual(results[4]['txid'], [placed[batch['orders'][2]['userref']]])
+        self.assertGreaterEqual(elapsed, 0.05 * 3)  # Three calls for six orders, sent one at a time
+        executor.pipeline.shutdown()
+
+    def test_rejected_batch_falls_back_to_single_orders(self):
+        fake = FakeBatches(batch_error='EGeneral:Invalid arguments')
+        executor = executor_for(fake)
+        results = executor.place_batch([order('ADAUSD', 1.0), order('ADAUSD', 2.0)])
+        self.assertEqual(sorted(result['txid'][0] for result in results), ['O1', 'O2'])
+        self.assertEqual((fake.count('AddOrderBatch'), fake.count('OpenOrders'), fake.count('AddOrder')), (1, 2, 2))
+        executor.pipeline.shutdown()
+
+        # Over HTTP: a signed JSON body; the stand-in does not know the batch endpoint
+        with LocalKraken() as kraken:
+            client = KrakenClient('key', 'c2VjcmV0')
+            client.uri = kraken.uri
+            executor = TradeExecutor(MarketDataCache({}), client)
+            executor.pipeline.backoff = (0.01, 0.05)
+            self.assertEqual(executor.place_batch([order('ADAUSD', 1.0), order('ADAUSD', 2.0)]),
+                             [{'method': 'AddOrder'}] * 2)
+            executor.pipeline.shutdown()
+
+            async def place():
+                async with AsyncKrakenClient(client) as session:
+                    return await AsyncTradeExecutor(MarketDataCache({}), session).place_batch(
+                        [order('ADAUSD', 1.0), order('ADAUSD', 2.0), order('LTCUSD', 3.0)])
+            self.assertEqual(asyncio.run(place()), [{'method': 'AddOrder'}] * 3)
+            self.assertEqual((client.requests['AddOrderBatch'], client.requests['AddOrder']), (2, 2 + 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
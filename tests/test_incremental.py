@@ -0,0 +1,75 @@
+# tests/test_incremental.py
+import unittest
+import numpy as np
+import pandas as pd
+from strategy.incremental import RollingWindow
+from strategy.strategy import TechnicalStrategy
+
+
+def make_ohlcv(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    df = pd.DataFrame({'open': close + rng.normal(0, 0.5, n), 'close': close})
+    df['high'] = np.maximum(df['open'], df['close']) + rng.uniform(0, 1, n)
+    df['low'] = np.minimum(df['open'], df['close']) - rng.uniform(0, 1, n)
+    df['volume'] = rng.uniform(1000, 5000, n)
+    return df
+
+
+def pandas_signals(data: pd.DataFrame, market_returns: pd.Series) -> tuple:
+    ref = TechnicalStrategy()
+    ref.data = data.copy()
+    return {
+        'rsi': ref.rsi_strategy('ADAUSD'), 'ma': ref.ma_strategy('ADAUSD'), 'macd': ref.macd_strategy(),
+        'bollinger': ref.bollinger_strategy(), 'stochastic': ref.stochastic_strategy(),
+        'ema': ref.ema_strategy(), 'parabolic_sar': ref.parabolic_sar_strategy(),
+        'ichimoku': ref.ichimoku_strategy(), 'williams_r': ref.williams_r_strategy(),
+        'cci': ref.cci_strategy(), 'momentum': ref.momentum_strategy(), 'keltner': ref.keltner_strategy(),
+        'donchian': ref.donchian_strategy(), 'pivot': ref.pivot_points_strategy(),
+        'fibonacci': ref.fibonacci_strategy(), 'triple_ma': ref.triple_ma_strategy(),
+        'hma': ref.hma_strategy(), 'supertrend': ref.supertrend_strategy(), 'roc': ref.roc_strategy(),
+        'macd_histogram': ref.macd_histogram_strategy(), 'rvi': ref.rvi_strategy(),
+        'chaikin_volatility': ref.chaikin_volatility_strategy(), 'mfi': ref.mfi_strategy(),
+        'beta': ref.beta_strategy(market_returns),
+    }, ref.atr_strategy()
+
+
+class TestIncrementalIndicators(unittest.TestCase):
+    def setUp(self):
+        self.data = make_ohlcv(260)
+        self.market = pd.Series(np.random.default_rng(1).normal(0, 0.02, len(self.data)))
+
+    def test_parity_with_pandas_path(self):
+        strategy = TechnicalStrategy()
+        strategy.warm_up('ADAUSD', self.data.iloc[:30], self.market)
+        for t in range(30, len(self.data)):
+            strategy.update_bar('ADAUSD', self.data.iloc[t].to_dict(), self.market.iloc[t])
+            if t % 23 and t != len(self.data) - 1:
+                continue
+            expected, atr = pandas_signals(self.data.iloc[:t + 1], self.market)
+            self.assertEqual(strategy.engines['ADAUSD'].signals(), expected, f"bar {t}")
+            self.assertAlmostEqual(strategy.engines['ADAUSD'].atr, atr, places=9)
+
+    def test_incremental_strategy_matches_score(self):
+        strategy = TechnicalStrategy()
+        strategy.warm_up('ADAUSD', self.data, self.market)
+        expected, atr = pandas_signals(self.data, self.market)
+        result = strategy.incremental_strategy('ADAUSD')
+        reference = strategy.score_signals(expected, atr)
+        self.assertEqual(result['details'], reference['details'])
+        self.assertEqual((result['action'], result['score']), (reference['action'], reference['score']))
+        self.assertAlmostEqual(result['volatility'], reference['volatility'], places=9)
+
+    def test_rolling_std_at_high_price_levels(self):
+        # A 1e5 price with cent-sized moves: raw sum-of-squares would lose every digit of the variance
+        prices = 1e5 + np.cumsum(np.random.default_rng(2).normal(0, 0.01, 500))
+        window = RollingWindow(20)
+        expected = pd.Series(prices).rolling(20).std().to_numpy()
+        for t, price in enumerate(prices):
+            window.update(price)
+            if t >= 19:
+                self.assertAlmostEqual(window.std / expected[t], 1, places=6, msg=f"bar {t}")
+
+
+if __name__ == '__main__':
+    unittest.main()
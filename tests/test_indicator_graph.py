@@ -0,0 +1,41 @@
+# tests/test_indicator_graph.py
+import unittest
+import numpy as np
+import pandas as pd
+from strategy.strategy import TechnicalStrategy
+from strategy.indicator_graph import IndicatorGraph
+
+
+class TestIndicatorGraph(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        close = 100 + np.cumsum(rng.normal(0, 1, 250))
+        self.data = pd.DataFrame({'open': close, 'high': close + 1, 'low': close - 1,
+                                  'close': close, 'volume': rng.uniform(1000, 5000, 250)})
+
+    def test_shared_nodes_computed_once(self):
+        graph = IndicatorGraph(self.data)
+        macd = graph.node('macd', 12, 26)
+        ema12 = graph.node('ewm', 'close', 12)
+        self.assertIs(graph.node('macd', 12, 26), macd)
+        self.assertEqual(graph.computed[('ewm', 'close', 12)], 1)
+        pd.testing.assert_series_equal(ema12, self.data['close'].ewm(span=12).mean())
+
+    def test_combined_strategy_matches_unshared_evaluation(self):
+        shared = TechnicalStrategy()
+        shared.data = self.data.copy()
+        np.random.seed(0)
+        result = shared.combined_strategy('ADAUSD')
+
+        naive = TechnicalStrategy()
+        naive.data = self.data.copy()
+        naive._graph = IndicatorGraph(naive.data, memoize=False)
+        np.random.seed(0)
+        signals, atr = naive._evaluate_indicators('ADAUSD')
+        self.assertEqual(result, naive.score_signals(signals, atr))
+        self.assertLess(shared.last_graph_report['computed'], naive._graph.report()['computed'])
+        self.assertIsNone(shared._graph)  # No intermediates kept between evaluations
+
+
+if __name__ == '__main__':
+    unittest.main()
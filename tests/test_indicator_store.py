@@ -0,0 +1,36 @@
+# tests/test_indicator_store.py
+import unittest
+import numpy as np
+from strategy.strategy import TechnicalStrategy
+from tests.test_incremental import make_ohlcv
+
+
+class TestIndicatorStore(unittest.TestCase):
+    def evaluate(self, data, **kwargs):
+        strategy = TechnicalStrategy(**kwargs)
+        strategy.data = data
+        np.random.seed(0)
+        return strategy, strategy.combined_strategy('ADAUSD')
+
+    def test_data_is_not_mutated(self):
+        data = make_ohlcv(300)
+        original = data.copy()
+        strategy, _ = self.evaluate(data)
+        self.assertEqual(list(strategy.data.columns), list(original.columns))
+        self.assertTrue(strategy.data.equals(original))
+        self.assertEqual(len(strategy.indicators['ema_short']), len(data))
+
+    def test_bounded_store_matches_and_stays_fixed(self):
+        data = make_ohlcv(2000)
+        _, full = self.evaluate(data)
+        strategy, bounded = self.evaluate(data.iloc[:300], bounded_indicators=True)
+        size = strategy.indicators.nbytes
+        strategy.data = data
+        np.random.seed(0)
+        self.assertEqual(strategy.combined_strategy('ADAUSD'), full)
+        self.assertEqual(strategy.indicators.nbytes, size)
+        self.assertEqual(len(strategy.indicators['hma']), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+# tests/test_investing.py
+import mmap
+import os
+import tempfile
+import unittest
+import numpy as np
+from data.investing import parse_investing_csv, load_history, load_frame
+
+SAMPLE = ('﻿"Date","Price","Open","High","Low","Vol.","Change %"\n'
+          '"02/01/2024","1,234.50","1,200.00","1,250.00","1,190.00","1.50B","2.88%"\n'
+          '"01/01/2024","1,200.00","1,180.00","1,210.00","1,170.00","620.46K","-0.10%"\n'
+          '"31/12/2023","1,201.20","1,190.00","1,205.00","1,185.00","-","1.69%"\n')
+
+
+class TestInvestingLoader(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.datasets = os.path.join(self.directory.name, 'datasets')
+        self.cache = os.path.join(self.directory.name, 'historical')
+        os.makedirs(self.datasets)
+        with open(os.path.join(self.datasets, 'TESTUSD.csv'), 'w', encoding='utf-8') as f:
+            f.write(SAMPLE)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_parse_quirks(self):
+        parsed = parse_investing_csv(os.path.join(self.datasets, 'TESTUSD.csv'))
+        np.testing.assert_array_equal(parsed['time'].view('datetime64[s]'),
+                                      np.array(['2023-12-31', '2024-01-01', '2024-01-02'], dtype='datetime64[s]'))
+        np.testing.assert_array_equal(parsed['close'], [1201.2, 1200.0, 1234.5])
+        np.testing.assert_array_equal(parsed['open'], [1190.0, 1180.0, 1200.0])
+        np.testing.assert_allclose(parsed['volume'], [np.nan, 620.46e3, 1.5e9])
+        np.testing.assert_allclose(parsed['change'], [0.0169, -0.001, 0.0288])
+        self.assertEqual(parsed['time'].dtype, np.int64)
+
+    def test_cached_loads_are_zero_copy_and_follow_the_csv(self):
+        first = load_history('TESTUSD', self.datasets, self.cache)
+        again = load_history('TESTUSD', self.datasets, self.cache)
+        self.assertIsInstance(again['close'].base.obj, mmap.mmap)
+        self.assertFalse(again['close'].flags.writeable)
+        for name, values in first.items():
+            np.testing.assert_array_equal(again[name], values)
+
+        # A changed CSV rebuilds the cache
+        with open(os.path.join(self.datasets, 'TESTUSD.csv'), 'a', encoding='utf-8') as f:
+            f.write('"30/12/2023","1,190.00","1,180.00","1,195.00","1,175.00","10.00M","0.50%"\n')
+        rebuilt = load_history('TESTUSD', self.datasets, self.cache)
+        self.assertEqual(len(rebuilt['close']), 4)
+        self.assertEqual(rebuilt['close'][0], 1190.0)
+
+        frame = load_frame('ADAUSD', cache_path=self.cache)
+        self.assertEqual(len(frame), 2441)
+        self.assertTrue(frame['timestamp'].is_monotonic_increasing)
+        self.assertAlmostEqual(frame['volume'].iloc[-1], 162.76e6, places=3)
+
+
+if __name__ == '__main__':
+    unittest.main()
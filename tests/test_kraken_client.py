@@ -0,0 +1,177 @@
+# tests/test_kraken_client.py
+import asyncio
+import json
+import random
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from execution.async_kraken_client import AsyncKrakenClient
+from execution.data_handler import KrakenDataHandler, fan_out
+from execution.kraken_client import KrakenClient, shared_client
+from execution.market_cache import MarketDataCache
+from execution.trade_executor import TradeExecutor
+
+
+class LocalKraken:
+    # Local HTTP/1.1 stand-in for api.kraken.com: answers Ticker / OHLC / Time and private
+    # calls with fixed data, and counts the TCP connections clients open. `handshake` delays
+    # every new connection (the TLS setup a real one costs), `latency` every request.
+    # With `strict_nonce`, a private call whose nonce is not above the last one seen is
+    # rejected as Kraken does without a nonce window. With `flaky`, every flaky-th AddOrder
+    # call is answered EService:Unavailable. With `batches`, AddOrderBatch places every order
+    # of the batch; without it the stand-in does not know the endpoint.
+    def __init__(self, latency: float = 0.0, handshake: float = 0.0, strict_nonce: bool = False, flaky: int = 0,
+                 batches: bool = False):
+        stand_in = self
+        self.connections = 0
+        self.requests = 0
+        self.add_orders = 0
+        self.last_nonce = 0
+        self.rejected = 0
+        self.lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep-alive
+            disable_nagle_algorithm = True  # Headers and body are separate writes
+
+            def setup(self):
+                super().setup()
+                with stand_in.lock:
+                    stand_in.connections += 1
+                if handshake:
+                    threading.Event().wait(handshake)
+
+            def _reply(self, method: str, params: dict):
+                with stand_in.lock:
+                    stand_in.requests += 1
+                if latency:
+                    threading.Event().wait(latency)
+                pair = params.get('pair', ['ADAUSD'])[0]
+                error = []
+                if strict_nonce and 'nonce' in params:
+                    with stand_in.lock:
+                        if int(params['nonce'][0]) > stand_in.last_nonce:
+                            stand_in.last_nonce = int(params['nonce'][0])
+                        else:
+                            stand_in.rejected += 1
+                            error = ['EAPI:Invalid nonce']
+                if method == 'AddOrder' and not error:
+                    with stand_in.lock:
+                        stand_in.add_orders += 1
+                        if flaky and stand_in.add_orders % flaky == 0:
+                            error = ['EService:Unavailable']
+                if error:
+                    result = {}
+                elif method == 'OHLC':
+                    result = {pair: [[1735570800, '0.85', '0.86', '0.84', '0.855', '0.85', '100.0', 5]], 'last': 1735570800}
+                elif method == 'Ticker':
+                    result = {name: {'c': ['0.85', '10']} for name in pair.split(',')}
+                elif method == 'AddOrderBatch' and batches:
+                    with stand_in.lock:
+                        first, stand_in.add_orders = stand_in.add_orders, stand_in.add_orders + len(params['orders'][0])
+                    result = {'orders': [{'txid': f'O{first + number + 1}', 'descr': {'order': f"{order['type']} {pair}"}}
+                                         for number, order in enumerate(params['orders'][0])]}
+                elif method == 'OpenOrders':
+                    result = {'open': {}}
+                else:
+                    result = {'method': method}
+                body = json.dumps({'error': error, 'result': result}).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                self._reply(url.path.rsplit('/', 1)[-1], parse_qs(url.query))
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0))).decode()
+                if self.headers.get('Content-Type') == 'application/json':
+                    params = {name: [value] for name, value in json.loads(body).items()}
+                else:
+                    params = parse_qs(body)
+                self._reply(self.path.rsplit('/', 1)[-1], params)
+
+            def log_message(self, *args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            daemon_threads = True
+            request_queue_size = 128  # Bursts of new connections from a concurrent fan-out
+
+        self.server = Server(('127.0.0.1', 0), Handler)
+        self.uri = f'http://127.0.0.1:{self.server.server_address[1]}'
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self) -> 'LocalKraken':
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestKrakenClient(unittest.TestCase):
+    def test_modules_share_one_client(self):
+        self.assertIs(KrakenDataHandler().api, shared_client())
+        self.assertIs(TradeExecutor().api, shared_client())
+        client = KrakenClient()
+        self.assertIs(KrakenDataHandler(client=client).api, client)
+
+        # Nonces stay strictly increasing across threads
+        nonces = fan_out(lambda _: client._nonce(), range(200), workers=8)
+        self.assertEqual(len(set(nonces.values())), 200)
+
+    def test_connection_reuse_and_request_counter(self):
+        with LocalKraken() as kraken:
+            client = KrakenClient('key', 'c2VjcmV0', pool_size=8)
+            client.uri = kraken.uri
+            handler = KrakenDataHandler(cache=MarketDataCache({}), client=client)
+            executor = TradeExecutor(MarketDataCache({}), client)
+            for _ in range(5):
+                handler.get_ticker('ADAUSD')
+                handler.get_balance()
+                executor.place_market_order('ADAUSD', 1.0, 'buy')
+            self.assertEqual(kraken.connections, 1)  # One keep-alive connection for all modules
+            self.assertEqual(dict(client.requests), {'Ticker': 5, 'Balance': 5, 'AddOrder': 5})
+
+            # A concurrent fan-out opens at most pool_size connections and keeps them
+            for _ in range(3):
+                fan_out(lambda pair: client.public_payload('OHLC', {'pair': pair}), [f'P{i}' for i in range(32)], 8)
+            self.assertLessEqual(kraken.connections, 1 + 8)
+            self.assertEqual(client.total_requests, 15 + 96)
+            self.assertEqual(kraken.requests, client.total_requests)
+
+    def test_concurrent_private_calls_keep_nonce_order(self):
+        with LocalKraken(strict_nonce=True) as kraken:
+            client = KrakenClient('key', 'c2VjcmV0')
+            client.uri = kraken.uri
+            take_nonce = client._nonce
+
+            def delayed_nonce() -> int:
+                # The thread is descheduled between taking its nonce and sending the request
+                nonce = take_nonce()
+                time.sleep(random.uniform(0, 0.01))
+                return nonce
+            client._nonce = delayed_nonce
+            # Threads and gathered coroutines may not overtake a call that took a lower nonce
+            results = fan_out(lambda i: client.query_private('AddOrder', {'pair': 'ADAUSD', 'userref': i}), range(40), 8)
+            self.assertEqual(list(results.values()), [{'error': [], 'result': {'method': 'AddOrder'}}] * 40)
+            batches = fan_out(lambda i: client.query_private_json('AddOrderBatch', {'pair': 'ADAUSD'}), range(16), 8)
+            self.assertTrue(all(not result['error'] for result in batches.values()))
+            self.assertEqual((kraken.rejected, client.total_requests), (0, 40 + 16))
+
+            async def gathered():
+                async with AsyncKrakenClient(client) as session:
+                    return await asyncio.gather(*(session.query_private('Balance') for _ in range(20)))
+            self.assertTrue(all(not result['error'] for result in asyncio.run(gathered())))
+            self.assertEqual(kraken.rejected, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
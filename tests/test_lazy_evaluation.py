@@ -0,0 +1,58 @@
+# tests/test_lazy_evaluation.py
+import unittest
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+from strategy.strategy import TechnicalStrategy
+from tests.test_incremental import make_ohlcv
+
+
+class TestLazyEvaluation(unittest.TestCase):
+    def evaluate(self, data, seed, **kwargs):
+        strategy = TechnicalStrategy()
+        strategy.data = data.copy()
+        np.random.seed(seed)
+        return strategy.combined_strategy('ADAUSD', **kwargs)
+
+    def test_same_action_with_fewer_indicators(self):
+        for seed in range(10):
+            data = make_ohlcv(300, seed=seed)
+            full = self.evaluate(data, seed)
+            lazy = self.evaluate(data, seed, lazy=True, details=False)
+            self.assertEqual(lazy['action'], full['action'])
+            self.assertLess(lazy['evaluated'], 24)
+            self.assertEqual(len(lazy['details']), lazy['evaluated'])
+
+        on_demand = self.evaluate(data, seed, lazy=True)
+        self.assertEqual(on_demand['details'], full['details'])
+        self.assertEqual(on_demand['evaluated'], 24)
+
+    def test_settled_score_skips_remaining_indicators(self):
+        # A steady uptrend: 16 indicators settle the action, the other 8 are never run
+        close = np.linspace(100, 200, 300)
+        data = pd.DataFrame({'open': close, 'high': close * 1.01, 'low': close * 0.99, 'close': close,
+                             'volume': np.full(300, 1000.0)})
+        skipped = ['beta', 'bollinger', 'cci', 'ichimoku', 'keltner', 'macd_histogram', 'mfi', 'stochastic']
+        full = self.evaluate(data, 0)
+        patches = [patch.object(TechnicalStrategy, f'{name}_strategy', side_effect=AssertionError(name))
+                   for name in skipped]
+        for method in patches:
+            method.start()
+        try:
+            lazy = self.evaluate(data, 0, lazy=True, details=False)
+        finally:
+            for method in patches:
+                method.stop()
+        self.assertEqual(lazy['action'], full['action'])
+        self.assertEqual(lazy['evaluated'], 16)
+        self.assertEqual(sorted(set(full['details']) - set(lazy['details'])), skipped)
+
+    def test_zero_weights_are_skipped(self):
+        weights = dict.fromkeys(['rsi', 'ma', 'macd', 'ema'], 0.0)
+        with patch.dict('strategy.strategy.INDICATOR_WEIGHTS', weights):
+            lazy = self.evaluate(make_ohlcv(300), 0, lazy=True, details=False)
+        self.assertFalse(set(weights) & set(lazy['details']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+# tests/test_market_cache.py
+import threading
+import unittest
+from execution.data_handler import KrakenDataHandler
+from execution.kraken_client import KrakenClient
+from execution.market_cache import MarketDataCache
+from execution.trade_executor import TradeExecutor
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestMarketDataCache(unittest.TestCase):
+    def test_ttl_invalidation_and_in_flight_requests(self):
+        clock = FakeClock()
+        cache = MarketDataCache({'Ticker': 5, 'OHLC': 60}, clock)
+        calls = []
+        fetch = lambda: calls.append(1) or len(calls)
+        self.assertEqual([cache.get(('Ticker', 'ADAUSD'), fetch) for _ in range(3)], [1, 1, 1])
+        clock.now = 5.0  # Expired
+        self.assertEqual(cache.get(('Ticker', 'ADAUSD'), fetch), 2)
+        self.assertEqual(cache.get(('Ticker', 'LTCUSD'), fetch), 3)
+        cache.invalidate('Ticker', 'ADAUSD')
+        self.assertEqual(cache.get(('Ticker', 'ADAUSD'), fetch), 4)
+        self.assertEqual(cache.get(('Ticker', 'LTCUSD'), fetch), 3)
+        self.assertEqual(cache.get(('Balance',), fetch), 5)  # No TTL: never reused
+        self.assertEqual(cache.get(('Balance',), fetch), 6)
+        self.assertEqual(cache.stats(), {'Balance': {'hits': 0, 'misses': 2}, 'Ticker': {'hits': 3, 'misses': 4}})
+
+        # Failures are raised but not cached
+        def failing_fetch():
+            raise RuntimeError('Kraken unavailable')
+
+        with self.assertRaises(RuntimeError):
+            cache.get(('OHLC', 'ADAUSD'), failing_fetch)
+        self.assertEqual(cache.get(('OHLC', 'ADAUSD'), lambda: 'bars'), 'bars')
+
+        # Concurrent callers share the request already in flight
+        release, started = threading.Event(), threading.Event()
+        requests, results = [], []
+
+        def slow_fetch():
+            requests.append(1)
+            started.set()
+            release.wait(5)
+            return 'ticker'
+
+        threads = [threading.Thread(target=lambda: results.append(cache.get(('Ticker', 'DOTUSD'), slow_fetch)))
+                   for _ in range(8)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        while cache.hits['Ticker'] < 3 + 7:
+            threading.Event().wait(0.001)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual((len(requests), results), (1, ['ticker'] * 8))
+
+    def test_handler_makes_one_request_per_resource(self):
+        cache = MarketDataCache({'Ticker': 5, 'Balance': 5, 'OpenOrders': 5})
+        requests = []
+
+        def query(method, data=None):
+            requests.append((method, data))
+            if method == 'Ticker':
+                return {'error': [], 'result': {data['pair']: {'c': ['0.85', '10']}}}
+            if method == 'OpenOrders':
+                return {'error': [], 'result': {'open': {}}}
+            return {'error': [], 'result': {'ZUSD': '1000.0'}}
+
+        # Two components with their own handlers (as TradingBot and RiskManager have) sharing one cache
+        client = KrakenClient()
+        client.query_public = client.query_private = query
+        bot_handler, risk_handler = KrakenDataHandler(cache=cache, client=client), KrakenDataHandler(cache=cache, client=client)
+        for handler in (bot_handler, risk_handler, bot_handler):
+            self.assertEqual(handler.get_ticker('ADAUSD')['ADAUSD']['c'][0], '0.85')
+            self.assertEqual(handler.get_balance(), {'ZUSD': '1000.0'})
+            self.assertEqual(handler.get_open_orders(), {})
+        self.assertEqual([method for method, _ in requests], ['Ticker', 'Balance', 'OpenOrders'])
+
+        # Placing an order drops the cached account data, not market data
+        executor = TradeExecutor(cache, KrakenClient())
+        executor.api.query_private = lambda method, data=None: {'error': [], 'result': {'txid': ['O1']}}
+        executor.place_market_order('ADAUSD', 1.0, 'buy')
+        risk_handler.get_ticker('ADAUSD')
+        risk_handler.get_balance()
+        risk_handler.get_open_orders()
+        self.assertEqual([method for method, _ in requests], ['Ticker', 'Balance', 'OpenOrders', 'Balance', 'OpenOrders'])
+        self.assertEqual(cache.stats()['Ticker'], {'hits': 3, 'misses': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
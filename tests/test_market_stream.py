@@ -0,0 +1,157 @@
+# tests/test_market_stream.py
+import asyncio
+import json
+import os
+import random
+import threading
+import unittest
+from aiohttp import web
+from execution.data_handler import KrakenDataHandler
+from execution.kraken_client import KrakenClient
+from execution.market_cache import MarketDataCache
+from execution.market_stream import MarketStream, OrderBook
+from strategy.strategy import TechnicalStrategy
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'kraken_ws_v2_session.json')
+
+
+class ReplayKraken:
+    # Local stand-in for ws.kraken.com/v2: records the requests a client sends and replays
+    # recorded frames, the 'session' list once the initial subscriptions are in and the
+    # 'resubscribe' list when the book is subscribed again
+    def __init__(self, path: str = FIXTURE):
+        with open(path) as f:
+            self.frames = json.load(f)
+        self.received = []
+        self.runner = None
+        self.url = None
+
+    async def _socket(self, request):
+        socket = web.WebSocketResponse()
+        await socket.prepare(request)
+        async for message in socket:
+            self.received.append(json.loads(message.data))
+            params = self.received[-1].get('params', {})
+            if self.received[-1]['method'] != 'subscribe':
+                continue
+            replay = {'ohlc': 'session', 'book': 'resubscribe' if len(self.received) > 5 else None}.get(params['channel'])
+            for frame in self.frames.get(replay, []):
+                await socket.send_json(frame)
+        return socket
+
+    async def start(self) -> 'ReplayKraken':
+        app = web.Application()
+        app.router.add_get('/v2', self._socket)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        self.url = f'ws://127.0.0.1:{self.runner.addresses[0][1]}/v2'
+        return self
+
+    async def close(self):
+        await self.runner.cleanup()
+
+
+async def wait_for(condition, timeout: float = 5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError('Timed out waiting for the stream')
+        await asyncio.sleep(0.01)
+
+
+class TestMarketStream(unittest.IsolatedAsyncioTestCase):
+    async def test_order_book_matches_reference(self):
+        rng = random.Random(7)
+        book, bids, asks = OrderBook(depth=25), {}, {}
+        for _ in range(5000):
+            side, levels = rng.choice([('bids', bids), ('asks', asks)])
+            price = round(rng.uniform(0.80, 0.85) if side == 'bids' else rng.uniform(0.85, 0.90), 4)
+            qty = 0.0 if rng.random() < 0.3 else round(rng.uniform(1, 1000), 2)
+            delta = [{'price': price, 'qty': qty}]
+            book.update(delta if side == 'bids' else [], delta if side == 'asks' else [])
+            # Reference: a plain dict sorted on every update, truncated to the depth
+            if qty == 0:
+                levels.pop(price, None)
+            else:
+                levels[price] = qty
+            for extra in sorted(levels, reverse=side == 'bids')[25:]:
+                del levels[extra]
+            self.assertEqual(book.bids(), sorted(bids.items(), reverse=True))
+            self.assertEqual(book.asks(), sorted(asks.items()))
+        self.assertEqual(book.best_bid, max(bids.items()))
+        self.assertEqual(book.best_ask, min(asks.items()))
+        self.assertTrue(book.verify(book.checksum()))
+        self.assertFalse(book.verify(book.checksum() ^ 1))
+
+        # Reads from another thread while the book is updated never see a half-removed level
+        errors, done = [], threading.Event()
+
+        def read():
+            while not done.is_set():
+                try:
+                    book.best_bid, book.best_ask, book.bids(), book.asks()
+                except Exception as e:
+                    errors.append(e)
+        reader = threading.Thread(target=read)
+        reader.start()
+        for _ in range(20000):
+            price = round(rng.uniform(0.84, 0.86), 4)
+            delta = [{'price': price, 'qty': 0.0 if rng.random() < 0.5 else 1.0}]
+            book.update(delta if price < 0.85 else [], delta if price >= 0.85 else [])
+        done.set()
+        reader.join()
+        self.assertEqual(errors, [])
+
+    async def test_replayed_session(self):
+        # REST names map to v2 symbols, including the assets v2 renames
+        renamed = MarketStream(['XBTUSD', 'XXBTZUSD', 'XDGUSD', 'ETH/XBT', 'ADAUSD', 'ADAUSDT', 'XBTUSDC', 'ADAETH'])
+        self.assertEqual(renamed.symbols, {'XBTUSD': 'BTC/USD', 'XDGUSD': 'DOGE/USD', 'ETHXBT': 'ETH/BTC',
+                                           'ADAUSD': 'ADA/USD', 'ADAUSDT': 'ADA/USDT', 'XBTUSDC': 'BTC/USDC',
+                                           'ADAETH': 'ADA/ETH'})
+        renamed.handle({'channel': 'ticker', 'data': [{'symbol': 'BTC/USD', 'last': 95000.0}]})
+        self.assertEqual(renamed.tickers['XBTUSD']['last'], 95000.0)
+
+        kraken = await ReplayKraken().start()
+        kraken.frames['session'].insert(0, {'channel': 'ticker', 'data': [{'last': 0.85}]})  # No symbol
+        stream = MarketStream(['ADAUSD', 'LTCUSD'], url=kraken.url)
+        task = asyncio.create_task(stream.run())
+        try:
+            # The bad checksum resubscribes the book; the new snapshot makes it valid again
+            await wait_for(lambda: stream.resubscriptions == 1 and stream.books['ADAUSD'].valid)
+            await wait_for(lambda: stream.books['ADAUSD'].best_bid == (0.8504, 40.0))
+            self.assertEqual([(r['method'], r['params']['channel']) for r in kraken.received[-2:]],
+                             [('unsubscribe', 'book'), ('subscribe', 'book')])
+            book = stream.books['ADAUSD']
+            self.assertEqual(book.best_ask, (0.8507, 690.0))
+            self.assertEqual(len(book.bids()), 10)
+            self.assertEqual(book.price_precision, 6)
+            self.assertEqual(stream.malformed, 1)  # Skipped; the frames after it were applied
+
+            # Forming bar updated in place after the two-bar snapshot
+            bars = stream.bars['ADAUSD']
+            self.assertEqual(len(bars), 3)
+            self.assertEqual(bars.last_time, 1735732800)
+            self.assertEqual(bars.column('close')[-1], 0.8503)
+            self.assertEqual(stream.trades['ADAUSD'][-1], (1735732802, 0.8503, 120.0, 'buy'))
+            self.assertIs(TechnicalStrategy(buffers=stream.bars).buffers['ADAUSD'], bars)
+
+            # The handler serves streamed pairs without a request, and the rest over REST
+            requested, client = [], KrakenClient()
+            client.query_public = lambda method, data: requested.append(data['pair']) or \
+                {'error': [], 'result': {'LTCUSD': {'c': ['70.0', '1']}}}
+            handler = KrakenDataHandler(cache=MarketDataCache({}), client=client, stream=stream)
+            tickers = handler.get_tickers(['ADAUSD', 'LTCUSD'])
+            self.assertEqual(tickers['ADAUSD']['b'][0], '0.8504')  # Best bid from the live book
+            self.assertEqual(tickers['ADAUSD']['c'][0], '0.8503')
+            self.assertEqual(tickers['LTCUSD'], {'c': ['70.0', '1']})
+            self.assertEqual(requested, ['LTCUSD'])
+        finally:
+            await stream.close()
+            await asyncio.wait_for(task, 5)
+            await kraken.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
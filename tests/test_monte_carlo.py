@@ -0,0 +1,67 @@
+# tests/test_monte_carlo.py
+import unittest
+import numpy as np
+from backtesting.backtester import Backtester, round_trip_returns
+from backtesting.monte_carlo import monte_carlo, resample_indices
+from tests.test_vectorized_backtest import load_dataset
+
+
+class TestMonteCarlo(unittest.TestCase):
+    def test_resampling_and_process_independence(self):
+        rng = np.random.default_rng(0)
+        indices = resample_indices(rng, 100, 50, block_size=10)
+        self.assertEqual(indices.shape, (50, 100))
+        # Within each block of 10 the bars are consecutive (wrapping around the end)
+        blocks = indices.reshape(50, 10, 10)
+        self.assertTrue(np.all(np.diff(blocks, axis=2) % 100 == 1))
+
+        returns = np.random.default_rng(1).normal(0.001, 0.02, 500)
+        serial = monte_carlo(returns, paths=600, block_size=5, processes=0, seed=3)
+        pooled = monte_carlo(returns, paths=600, block_size=5, processes=2, seed=3)
+        np.testing.assert_array_equal(serial.to_numpy(), pooled.to_numpy())
+        self.assertTrue((serial['Lower'] <= serial['Upper']).all())
+        # Resampling does not change the mean return, so the final balance interval brackets no-resampling
+        self.assertTrue(serial.loc['Final Balance', 'Lower'] < serial.loc['Final Balance', 'Estimate']
+                        < serial.loc['Final Balance', 'Upper'])
+
+    def test_backtest_intervals(self):
+        backtester = Backtester(load_dataset('ADAUSD'))
+        backtester.buy_threshold, backtester.sell_threshold, backtester.trade_size = 0.3, -0.3, 0.5
+        backtester.run_vectorized()
+        results = backtester.monte_carlo(paths=2000, processes=0)
+        equity = backtester.equity
+        self.assertAlmostEqual(results['returns'].loc['Final Balance', 'Estimate'], equity[-1], places=6)
+        self.assertAlmostEqual(results['returns'].loc['Max Drawdown', 'Estimate'],
+                               (np.maximum.accumulate(np.maximum(equity, backtester.initial_balance)) - equity).max(),
+                               places=6)
+
+        # Round trips: paths start at the initial balance and compound to the realized result
+        trips = round_trip_returns(backtester.trade_log, backtester.initial_balance, backtester.balance)
+        self.assertAlmostEqual(backtester.initial_balance * np.prod(1 + trips), backtester.balance, places=4)
+        final = results['pnl'].loc['Final Balance']
+        self.assertAlmostEqual(final['Estimate'], backtester.balance, places=4)
+        # A long-only book cannot go below zero, and the interval brackets the realized balance
+        self.assertGreater(final['Lower'], 0)
+        self.assertLess(final['Lower'], backtester.balance)
+        self.assertGreater(final['Upper'], backtester.balance)
+        self.assertLessEqual(final['Upper'], backtester.initial_balance * (1 + trips.max()) ** len(trips))
+        self.assertTrue((results['pnl']['Lower'] <= results['pnl']['Upper']).all())
+
+        # Round trips of a few percent each: the median path ends near the realized balance
+        trade_log, cash, price = [], backtester.initial_balance, 1.0
+        for change in np.random.default_rng(2).normal(0.01, 0.03, 60):
+            trade_log.append({'action': 'buy', 'price': price, 'balance': 0.0})
+            price *= 1 + change
+            cash *= 1 + change
+            trade_log.append({'action': 'sell', 'price': price, 'balance': cash})
+        backtester.trade_log, backtester.balance, backtester.equity = trade_log, cash, None
+        final = backtester.monte_carlo(paths=2000, processes=0)['pnl'].loc['Final Balance']
+        self.assertAlmostEqual(final['Estimate'], cash, places=4)
+        self.assertLess(abs(np.log(final['Median'] / cash)), 0.1)
+        self.assertLess(final['Lower'], cash)
+        self.assertGreater(final['Upper'], cash)
+        self.assertLess(final['Upper'] / final['Lower'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+# tests/test_ohlc_parser.py
+import json
+import os
+import unittest
+import numpy as np
+from data.ohlc_store import parse_payload, parse_rows, DTYPES
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'kraken_ohlc_adausd_60.json')
+
+
+class TestOHLCParser(unittest.TestCase):
+    def test_payload_matches_decoded_rows(self):
+        with open(FIXTURE) as f:
+            recording = json.load(f)
+        for entry in recording:
+            result = entry['response']['result']
+            for payload in (json.dumps(entry['response']).encode(),
+                            json.dumps(entry['response'], indent=2).encode(),
+                            json.dumps(entry['response'], separators=(',', ':')).encode()):
+                columns, last = parse_payload(payload)
+                self.assertEqual(last, result['last'])
+                expected = parse_rows(result['ADAUSD'])
+                self.assertEqual(list(columns), list(DTYPES))
+                for name, values in columns.items():
+                    self.assertEqual(values.dtype, DTYPES[name])
+                    self.assertTrue(values.flags.c_contiguous)
+                    np.testing.assert_array_equal(values, expected[name])
+
+    def test_result_key_empty_bars_and_errors(self):
+        payload = (b'{"error":[],"result":{"XXBTZUSD":[[1700000000,"37000.1","37100.0","36900.5","37050.0",'
+                   b'"37010.2","12.50000000",1042]],"last":1699996400}}')
+        columns, last = parse_payload(payload)
+        self.assertEqual((columns['time'][0], columns['close'][0], columns['count'][0], last),
+                         (1700000000, 37050.0, 1042, 1699996400))
+        columns, last = parse_payload(b'{"error": [], "result": {"ADAUSD": [], "last": 1700000000}}')
+        self.assertEqual((len(columns['close']), last), (0, 1700000000))
+        columns, last = parse_payload(b'{"error":[],"result":{"last":1699996400,"XXBTZUSD":[[1700000000,"37000.1",'
+                                      b'"37100.0","36900.5","37050.0","37010.2","12.50000000",1042]]}}')
+        self.assertEqual((columns['close'][0], last), (37050.0, 1699996400))
+        with self.assertRaises(Exception) as raised:
+            parse_payload(b'{"error":["EQuery:Unknown asset pair"]}')
+        self.assertIn('Unknown asset pair', str(raised.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+# tests/test_ohlc_store.py
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from data.ohlc_store import OHLCStore
+from execution.data_handler import KrakenDataHandler
+from execution.kraken_client import KrakenClient
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'kraken_ohlc_adausd_60.json')
+
+
+class RecordedResponse:
+    def __init__(self, body: dict):
+        self.content = json.dumps(body).encode()
+        self.status_code = 200
+
+    def json(self, **options) -> dict:
+        return json.loads(self.content, **options)
+
+    def raise_for_status(self):
+        pass
+
+
+class RecordedSession:
+    # Stands in for krakenex's requests.Session: replays recorded responses in order,
+    # checking each request against the recording
+    def __init__(self, recording: list):
+        self.recording = list(recording)
+        self.requests = []
+
+    def get(self, url: str, params: dict = None, **kwargs) -> RecordedResponse:
+        self.requests.append((url, params))
+        expected = self.recording.pop(0)
+        assert params == expected['request'], f"Unexpected request {params}, recorded {expected['request']}"
+        return RecordedResponse(expected['response'])
+
+
+class TestOHLCStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        with open(FIXTURE) as f:
+            self.recording = json.load(f)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_merge_replaces_forming_bar_and_persists(self):
+        store = OHLCStore(self.directory.name)
+        rows = [[60, '1', '2', '0.5', '1.5', '1.2', '10', 3], [120, '1.5', '1.6', '1.4', '1.45', '1.5', '1', 1]]
+        self.assertEqual(store.merge('ADAUSD', 1, rows, last=60), 2)
+        update = [[60, '9', '9', '9', '9', '9', '9', 9],  # Already stored, ignored
+                  [120, '1.5', '1.7', '1.4', '1.65', '1.55', '4', 5], [120, '1.5', '1.8', '1.4', '1.7', '1.6', '5', 6],
+                  [180, '1.7', '1.7', '1.7', '1.7', '1.7', '0.1', 1]]
+        self.assertEqual(store.merge('ADAUSD', 1, update, last=120), 1)
+
+        reopened = OHLCStore(self.directory.name)
+        self.assertEqual(reopened.cursor('ADAUSD', 1), 120)
+        arrays = reopened.arrays('ADAUSD', 1)
+        np.testing.assert_array_equal(arrays['time'], [60, 120, 180])
+        np.testing.assert_array_equal(arrays['close'], [1.5, 1.7, 1.7])  # Last version of the forming bar wins
+        self.assertEqual(arrays['count'].dtype, np.int64)
+        self.assertEqual(arrays['close'].dtype, np.float64)
+        np.testing.assert_array_equal(reopened.arrays('ADAUSD', 1, ['time'], bars=2)['time'], [120, 180])
+        self.assertEqual(len(reopened.frame('BTCUSD', 1)), 0)
+
+    def test_handler_fetches_only_new_bars(self):
+        handler = KrakenDataHandler(OHLCStore(self.directory.name), client=KrakenClient())
+        handler.api.session = RecordedSession(self.recording)
+        first = handler.get_ohlc('ADAUSD', 60)
+        self.assertEqual(len(first), 8)
+        self.assertEqual(handler.sync_ohlc('ADAUSD', 60), 1)  # Forming bar completed, one new bar
+        self.assertEqual(handler.sync_ohlc('ADAUSD', 60), 0)  # Forming bar updated in place
+        self.assertEqual([params.get('since') for _, params in handler.api.session.requests],
+                         [None, 1735581600, 1735585200])
+
+        frame = handler.store.frame('ADAUSD', 60)
+        self.assertEqual(len(frame), 9)
+        self.assertTrue(frame['time'].is_unique and frame['time'].is_monotonic_increasing)
+        self.assertEqual(frame['close'].iloc[-2], 0.857151)
+        self.assertEqual(frame['count'].iloc[-2], 534)
+        self.assertEqual((frame['close'].iloc[-1], frame['count'].iloc[-1]), (0.856151, 19))
+        self.assertEqual(len(handler.store.frame('ADAUSD', 60, bars=5)), 5)
+
+        # A new handler over the same store resumes from the saved cursor
+        resumed = KrakenDataHandler(OHLCStore(self.directory.name), client=KrakenClient())
+        resumed.api.session = RecordedSession([{'request': {'pair': 'ADAUSD', 'interval': 60, 'since': 1735585200},
+                                                'response': {'error': [], 'result': {'ADAUSD': [], 'last': 1735585200}}}])
+        self.assertEqual(len(resumed.get_ohlc('ADAUSD', 60)), 9)
+
+
+if __name__ == '__main__':
+    unittest.main()
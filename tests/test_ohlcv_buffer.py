@@ -0,0 +1,53 @@
+# tests/test_ohlcv_buffer.py
+import unittest
+import numpy as np
+from data.ohlcv_buffer import OHLCVRingBuffer, COLUMNS
+from strategy.strategy import TechnicalStrategy
+from tests.test_incremental import make_ohlcv
+
+
+def kraken_rows(data, start_time: int = 0) -> list:
+    return [[start_time + 60 * i, *(str(row[name]) for name in COLUMNS[:-1]), 5]
+            for i, row in enumerate(data.assign(vwap=data['close']).to_dict('records'))]
+
+
+class TestOHLCVRingBuffer(unittest.TestCase):
+    def test_window_append_and_forming_bar(self):
+        buffer = OHLCVRingBuffer(capacity=5)
+        for t in range(23):
+            buffer.append(t, t, t + 1, t - 1, t + 0.5, t, 10.0, 1)
+        self.assertEqual(list(buffer.time), list(range(18, 23)))
+        self.assertEqual(list(buffer.column('close')), [t + 0.5 for t in range(18, 23)])
+        self.assertTrue(np.shares_memory(buffer.frame()['close'].to_numpy(), buffer.column('close')))
+
+        buffer.update(22, 22, 30, 21, 29, 25, 12.0, 2)
+        buffer.update(23, 29, 31, 28, 30, 30, 1.0, 1)
+        self.assertEqual(list(buffer.column('high')[-2:]), [30, 31])
+        self.assertEqual(len(buffer), 5)
+        with self.assertRaises(ValueError):
+            buffer.update(10, 1, 1, 1, 1)
+
+        # Overlapping responses: older rows ignored, same-time row replaces the forming bar
+        buffer.extend([[22, '0', '0', '0', '0', '0', '0', 0], [23, '1', '2', '0', '1.5', '1', '3', 4],
+                       [24, '2', '3', '1', '2.5', '2', '5', 6]])
+        self.assertEqual(list(buffer.time), [20, 21, 22, 23, 24])
+        self.assertEqual(list(buffer.column('close')[-2:]), [1.5, 2.5])
+        self.assertEqual(buffer.column('high')[-3], 30)
+
+    def test_strategy_reads_buffer(self):
+        data = make_ohlcv(400)
+        buffer = OHLCVRingBuffer(capacity=300)
+        buffer.extend(kraken_rows(data))
+        expected = TechnicalStrategy()
+        expected.data = data.iloc[-300:].reset_index(drop=True)
+        np.random.seed(0)
+        reference = expected.combined_strategy('ADAUSD')
+
+        strategy = TechnicalStrategy()
+        strategy.buffers['ADAUSD'] = buffer
+        np.random.seed(0)
+        self.assertEqual(strategy.combined_strategy('ADAUSD'), reference)
+
+
+if __name__ == '__main__':
+    unittest.main()
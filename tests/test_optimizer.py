@@ -0,0 +1,57 @@
+# tests/test_optimizer.py
+import os
+import tempfile
+import unittest
+from backtesting.backtester import Backtester
+from backtesting.optimizer import Optimizer, grid, evaluate_candidate
+from tests.test_vectorized_backtest import load_dataset
+
+
+class TestOptimizer(unittest.TestCase):
+    def setUp(self):
+        self.data = load_dataset('ADAUSD')
+        self.space = {'buy_threshold': [0.2, 0.4], 'sell_threshold': [-0.3], 'stop_loss': [0, 0.05]}
+
+    def test_candidate_matches_backtester(self):
+        optimizer = Optimizer(self.data, processes=0)
+        metrics = evaluate_candidate(optimizer.prices, optimizer.votes,
+                                     {'buy_threshold': 0.3, 'sell_threshold': -0.3, 'stop_loss': 0,
+                                      'take_profit': 0, 'trade_size': 0.5})
+        backtester = Backtester(self.data)
+        backtester.buy_threshold, backtester.sell_threshold, backtester.trade_size = 0.3, -0.3, 0.5
+        backtester.run_vectorized()
+        self.assertAlmostEqual(metrics['Final Balance'], backtester.balance, places=6)
+        self.assertEqual(metrics['Trades'], len(backtester.trade_log))
+
+        # Windows with no bars or a single bar leave the balance as it was
+        for start, end in ((len(self.data), None), (100, 100), (len(self.data) - 1, None)):
+            metrics = evaluate_candidate(optimizer.prices, optimizer.votes, {}, start, end, initial_balance=500)
+            self.assertEqual((metrics['Final Balance'], metrics['Trades']), (500, 0))
+        swept = optimizer.sweep(grid(self.space), start=len(self.data))
+        self.assertEqual(len(swept), 4)
+        self.assertTrue(swept['Sharpe Ratio'].isna().all())
+
+    def test_pool_sweep_resumes_and_walk_forward(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results.jsonl')
+            pooled = Optimizer(self.data, results_path=path, processes=2).sweep(grid(self.space))
+            serial = Optimizer(self.data, processes=0).sweep(grid(self.space))
+            self.assertEqual(len(pooled), 4)
+            self.assertEqual(list(pooled['Final Balance']), list(serial['Final Balance']))
+            self.assertTrue(pooled['Sharpe Ratio'].is_monotonic_decreasing)
+
+            with open(path) as f:
+                lines = f.readlines()
+            resumed = Optimizer(self.data, results_path=path, processes=2).sweep(grid(self.space))
+            with open(path) as f:
+                self.assertEqual(f.readlines(), lines)  # Nothing re-run
+            self.assertEqual(list(resumed['Final Balance']), list(pooled['Final Balance']))
+
+            windows = Optimizer(self.data, results_path=path, processes=2).walk_forward(
+                grid(self.space), train_size=1000, test_size=400)
+            self.assertEqual(list(windows['start']), [1000, 1400, 1800])
+            self.assertTrue((windows['phase'] == 'test').all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+# tests/test_order_pipeline.py
+import threading
+import time
+import unittest
+from unittest import mock
+from execution.kraken_client import KrakenClient
+from execution.market_cache import MarketDataCache
+from execution.order_pipeline import backoff_delay
+from execution.trade_executor import TradeExecutor
+
+
+class FakeOrders:
+    # Private-endpoint stand-in keeping placed orders by userref. `lose` drops the response
+    # of the first N AddOrder calls after the order was placed (a timeout), `errors` answers
+    # the next AddOrder calls with these errors, and `latency` delays every call.
+    def __init__(self, lose: int = 0, errors: list = None, latency: float = 0.0):
+        self.lose = lose
+        self.errors = list(errors or [])
+        self.latency = latency
+        self.orders = {}  # txid -> order info
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, method: str, data: dict = None, timeout=None) -> dict:
+        time.sleep(self.latency)
+        with self.lock:
+            self.calls.append((method, dict(data or {})))
+            if method == 'AddOrder':
+                if self.errors:
+                    return {'error': [self.errors.pop(0)]}
+                txid = f'O{len(self.orders) + 1}'
+                self.orders[txid] = {'userref': data['userref'], 'status': 'open', 'vol_exec': '0',
+                                     'descr': {'pair': data['pair']}}
+                if self.lose:
+                    self.lose -= 1
+                    raise TimeoutError('Read timed out')
+                return {'error': [], 'result': {'txid': [txid], 'descr': {'pair': data['pair']}}}
+            if method in ('OpenOrders', 'ClosedOrders'):
+                key = 'open' if method == 'OpenOrders' else 'closed'
+                return {'error': [], 'result': {key: {txid: info for txid, info in self.orders.items()
+                                                      if info['userref'] == data['userref'] and
+                                                      (info['status'] == 'open') == (key == 'open')}}}
+            if method == 'QueryOrders':
+                return {'error': [], 'result': {txid: self.orders[txid] for txid in data['txid'].split(',')}}
+            return {'error': [], 'result': {}}
+
+    def count(self, method: str) -> int:
+        return sum(1 for name, _ in self.calls if name == method)
+
+
+# An executor whose client answers private calls (and JSON ones, for fakes taking them)
+# from `fake`, one call at a time as KrakenClient sends them
+def executor_for(fake: FakeOrders) -> TradeExecutor:
+    executor = TradeExecutor(MarketDataCache({}), KrakenClient('key', 'c2VjcmV0'))
+
+    def query_private(*args, **kwargs) -> dict:
+        with executor.api._private_lock:
+            return fake(*args, **kwargs)
+    executor.api.query_private = executor.api.query_private_json = query_private
+    executor.pipeline.backoff = (0.01, 0.05)
+    executor.pipeline.poll_interval = 0.02
+    return executor
+
+
+class TestOrderPipeline(unittest.TestCase):
+    def test_lost_response_is_not_placed_twice_and_fill_is_reported(self):
+        fake = FakeOrders(lose=1)
+        executor = executor_for(fake)
+        statuses = []
+        handle = executor.submit_order({'pair': 'ADAUSD', 'type': 'buy', 'ordertype': 'market', 'volume': 1.0},
+                                       lambda order: statuses.append(order.status))
+        self.assertEqual(handle.result(timeout=5)['txid'], ['O1'])
+        self.assertEqual(fake.count('AddOrder'), 1)  # The retry found the order by its userref
+        self.assertEqual(fake.calls[1], ('OpenOrders', {'userref': handle.userref}))
+
+        fake.orders['O1'].update(status='closed', vol_exec='1.0')
+        self.assertTrue(handle.closed.wait(5))
+        self.assertEqual(statuses, ['queued', 'submitting', 'retrying', 'open', 'filled'])
+        self.assertEqual(handle.filled_volume, 1.0)
+        executor.pipeline.shutdown()
+
+    def test_backoff_retries_and_concurrency(self):
+        fake = FakeOrders(errors=['EService:Unavailable', 'EService:Busy'])
+        executor = executor_for(fake)
+        self.assertEqual(executor.place_market_order('ADAUSD', 1.0, 'buy')['txid'], ['O1'])
+        self.assertEqual(fake.count('AddOrder'), 3)
+
+        # A permanent error fails at once; retries run out after retry_attempts
+        fake.errors = ['EOrder:Insufficient funds']
+        self.assertIsNone(executor.place_market_order('ADAUSD', 1.0, 'buy'))
+        self.assertEqual(fake.count('AddOrder'), 4)
+        fake.errors = ['EService:Unavailable'] * 3
+        handle = executor.submit_order({'pair': 'ADAUSD', 'type': 'buy', 'ordertype': 'market', 'volume': 1.0})
+        self.assertRaises(Exception, handle.result, 5)
+        self.assertEqual((handle.status, handle.attempts), ('failed', 3))
+
+        delays = [backoff_delay(attempt, 0.5, 8.0) for attempt in (1, 3, 10) for _ in range(200)]
+        self.assertTrue(all(0 <= delay <= 0.5 for delay in delays[:200]))
+        self.assertTrue(all(0 <= delay <= 2.0 for delay in delays[200:400]))
+        self.assertGreater(max(delays[400:]), 4.0)  # Capped at 8 s, jittered below it
+        self.assertLessEqual(max(delays[400:]), 8.0)
+
+        # Orders are submitted at once but sent one at a time (nonce order); an order waiting
+        # out its backoff does not hold up the ones behind it
+        fake.latency = 0.05
+        fake.errors = ['EService:Unavailable']
+        executor.pipeline.backoff = (1.0, 1.0)
+        start = time.perf_counter()
+        with mock.patch('execution.order_pipeline.random.uniform', lambda low, high: high):  # A 1 s backoff
+            handles = [executor.submit_order({'pair': f'P{i}USD', 'type': 'buy', 'ordertype': 'market', 'volume': 1.0})
+                       for i in range(8)]
+            while sum(handle.done() for handle in handles) < 7 and time.perf_counter() - start < 5:
+                time.sleep(0.005)
+        self.assertGreaterEqual(time.perf_counter() - start, 0.05 * 8)
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual([handle.status for handle in handles if not handle.done()], ['retrying'])
+        self.assertTrue(all(handle.result(timeout=5) for handle in handles))
+        self.assertEqual(len({handle.userref for handle in handles}), 8)
+        executor.pipeline.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+# tests/test_out_of_core.py
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from backtesting.backtester import Backtester, performance_metrics
+from backtesting.out_of_core import OutOfCoreBacktester, FIELDS
+from data.columnar import ColumnarFile
+from strategy.signal_matrix import signal_matrix, LOOKBACK
+from strategy.strategy import INDICATOR_WEIGHTS
+from tests.test_incremental import make_ohlcv
+
+
+class TestOutOfCoreBacktest(unittest.TestCase):
+    def setUp(self):
+        self.data = make_ohlcv(3000, seed=4)
+        self.data[['open', 'high', 'low', 'close']] -= self.data['low'].min() - 5  # Keep prices positive
+        self.directory = tempfile.TemporaryDirectory()
+        ColumnarFile.from_frame(self.directory.name, self.data.assign(time=np.arange(3000, dtype=np.int64) * 60))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_chunked_votes_match_full_history(self):
+        history = ColumnarFile(self.directory.name)
+        self.assertEqual(len(history), len(self.data))
+        np.testing.assert_array_equal(history.read(100, 200)['close'], self.data['close'].to_numpy()[100:200])
+
+        # EMAs and running extremes continued across windows reproduce one full pass
+        full = signal_matrix(self.data, INDICATOR_WEIGHTS)['votes']
+        chunks, state = [], {}
+        for first, start, stop, bars in history.windows(700, LOOKBACK, FIELDS):
+            carry = stop - LOOKBACK - 1 - first if stop < len(history) else None
+            result = signal_matrix(pd.DataFrame(bars), INDICATOR_WEIGHTS, tail=stop - start,
+                                   state=state, carry_index=carry)
+            chunks.append(result['votes'])
+            state = result['state']
+        np.testing.assert_array_equal(np.concatenate(chunks), full)
+
+    def test_matches_in_memory_backtest(self):
+        backtester = Backtester(self.data)
+        backtester.buy_threshold, backtester.sell_threshold, backtester.trade_size = 0.3, -0.3, 0.5
+        backtester.run_vectorized()
+        expected = performance_metrics([t['balance'] for t in backtester.trade_log], backtester.balance)
+
+        chunked = OutOfCoreBacktester(self.directory.name, chunk_size=450)
+        chunked.buy_threshold, chunked.sell_threshold, chunked.trade_size = 0.3, -0.3, 0.5
+        chunked.run()
+        self.assertEqual(chunked.trades, len(backtester.trade_log))
+        results = chunked.evaluate_performance()
+        for name, value in expected.items():
+            self.assertAlmostEqual(results[name], value, delta=1e-6 * abs(value), msg=name)
+        with self.assertRaises(ValueError):
+            OutOfCoreBacktester(self.directory.name, chunk_size=LOOKBACK)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+# tests/test_panel.py
+import unittest
+import numpy as np
+import pandas as pd
+from strategy.strategy import TechnicalStrategy
+from strategy.panel import OHLCVPanel
+from tests.test_incremental import make_ohlcv
+
+
+class TestPanel(unittest.TestCase):
+    def setUp(self):
+        # Pairs listed at different times but all trading up to the latest bar
+        self.frames = {}
+        for i, pair in enumerate(['ADAUSD', 'LTCUSD', 'DOTUSD']):
+            frame = make_ohlcv(260 - 20 * i, seed=i)
+            frame.index = pd.RangeIndex(20 * i, 260)
+            self.frames[pair] = frame
+        self.panel = OHLCVPanel.from_frames(self.frames)
+
+    def test_alignment(self):
+        self.assertEqual(self.panel.shape, (260, 3))
+        self.assertTrue(np.isnan(self.panel.fields['close'][:20, 1]).all())
+
+    def test_panel_matches_per_pair_evaluation(self):
+        strategy = TechnicalStrategy()
+        decisions = strategy.panel_strategy(self.panel)
+        for pair, frame in self.frames.items():
+            strategy.data = frame.copy()
+            expected = strategy.combined_strategy(pair)
+            details = dict(expected['details'], beta='Hold')  # beta needs real market returns
+            self.assertEqual(decisions[pair]['details'], details)
+            self.assertAlmostEqual(decisions[pair]['volatility'], expected['volatility'], places=9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+# tests/test_portfolio_backtest.py
+import unittest
+import numpy as np
+from backtesting.backtester import Backtester
+from backtesting.portfolio_backtester import PortfolioBacktester
+from tests.test_vectorized_backtest import load_dataset
+
+
+def reference_run(prices, actions, initial_balance, max_exposure, reserve):
+    # Bar-by-bar shared-capital loop the vectorized run must reproduce
+    bars, pairs = prices.shape
+    equity, held, last_price = initial_balance, [False] * pairs, [np.nan] * pairs
+    weights, curve = [0.0] * pairs, [initial_balance]
+    for t in range(bars):
+        if t:
+            growth = 0.0
+            for i in range(pairs):
+                if not np.isnan(prices[t, i]) and not np.isnan(last_price[i]):
+                    growth += weights[i] * (prices[t, i] / last_price[i] - 1)
+            equity *= 1 + growth
+            curve.append(equity)
+        for i in range(pairs):
+            if not np.isnan(prices[t, i]):
+                last_price[i] = prices[t, i]
+                if actions[t, i] == 'buy':
+                    held[i] = True
+                elif actions[t, i] == 'sell':
+                    held[i] = False
+        count = sum(held)
+        weights = [min(max_exposure, (1 - reserve) / max(count, 1)) if h else 0.0 for h in held]
+    return np.array(curve)
+
+
+class TestPortfolioBacktest(unittest.TestCase):
+    def setUp(self):
+        self.frames = {pair: load_dataset(pair) for pair in ('ADAUSD', 'LTCUSD')}
+
+    def test_single_pair_full_exposure_matches_backtester(self):
+        single = Backtester(self.frames['ADAUSD'])
+        single.buy_threshold, single.sell_threshold = 0.3, -0.3
+        actions, sizes = single.decisions()
+        single.run_vectorized(actions, sizes)
+        portfolio = PortfolioBacktester({'ADAUSD': self.frames['ADAUSD']}, max_exposure=1.0, reserve=0.0)
+        portfolio.run(actions[:, None])
+        self.assertAlmostEqual(portfolio.equity.iloc[-1] / single.balance, 1.0, places=9)
+
+    def test_shared_capital_matches_reference_loop(self):
+        portfolio = PortfolioBacktester(self.frames)
+        portfolio.buy_threshold, portfolio.sell_threshold = 0.3, -0.3
+        actions = portfolio.decisions()
+        result = portfolio.run(actions)
+        expected = reference_run(portfolio.panel.fields['close'], actions, 10000, portfolio.max_exposure,
+                                 portfolio.reserve)
+        np.testing.assert_allclose(result['equity'], expected, rtol=1e-10)
+        np.testing.assert_allclose(portfolio.pair_equity.iloc[-1].sum(), expected[-1] - 10000, rtol=1e-9)
+        self.assertTrue((result['weights'] <= portfolio.max_exposure).all())
+        self.assertTrue((result['cash'] >= portfolio.reserve * result['equity'] - 1e-6).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
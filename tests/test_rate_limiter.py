@@ -0,0 +1,77 @@
+# tests/test_rate_limiter.py
+import asyncio
+import threading
+import time
+import unittest
+from execution.data_handler import fan_out
+from execution.kraken_client import KrakenClient
+from execution.rate_limiter import CallCounter, RateLimiter
+from tests.test_kraken_client import LocalKraken
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_counter_decay_and_priorities(self):
+        now = [0.0]
+        counter = CallCounter(15, 0.5, clock=lambda: now[0])
+        for _ in range(15):
+            self.assertEqual(counter.wait_time(1), 0.0)
+            counter.take(1)
+        self.assertEqual(counter.wait_time(2), 4.0)  # Two units over at 0.5 per second
+        now[0] = 4.0
+        self.assertEqual(counter.wait_time(2), 0.0)
+        counter.exhaust()
+        self.assertEqual(counter.wait_time(1), 2.0)
+
+        # Queued calls on a full counter go out by priority, then arrival
+        limiter = RateLimiter({'public': (1, 20.0), 'private': (1, 20.0)}, costs={},
+                              priorities={'AddOrder': 0, 'Balance': 1})
+        limiter.exhaust('Ledgers', private=True)
+        granted, threads = [], []
+
+        def call(method: str):
+            limiter.acquire(method, private=True)
+            granted.append(method)
+        for method in ('Ledgers', 'TradesHistory', 'Balance', 'AddOrder'):
+            threads.append(threading.Thread(target=call, args=(method,)))
+            threads[-1].start()
+            while limiter.queue_depth()['private'] < len(threads):
+                time.sleep(0.001)
+        for thread in threads:
+            thread.join()
+        self.assertEqual(granted, ['AddOrder', 'Balance', 'Ledgers', 'TradesHistory'])
+        stats = limiter.stats()
+        self.assertEqual(stats['queued'], {'public': 0, 'private': 0})
+        self.assertGreater(stats['endpoints']['TradesHistory']['max_wait'], stats['endpoints']['AddOrder']['max_wait'])
+
+        # Coroutines share the queues and wait without blocking the loop
+        async def burst():
+            return await asyncio.gather(*(limiter.aacquire('Ticker') for _ in range(5)))
+        start = time.perf_counter()
+        asyncio.run(burst())
+        self.assertGreaterEqual(time.perf_counter() - start, 4 / 20 - 0.02)
+
+    def test_client_requests_are_paced(self):
+        with LocalKraken() as kraken:
+            limiter = RateLimiter({'public': (5, 50.0), 'private': (15, 0.33), 'trading': (60, 1.0)})
+            client = KrakenClient('key', 'c2VjcmV0', limiter=limiter)
+            client.uri = kraken.uri
+            start = time.perf_counter()
+            fan_out(lambda pair: client.query_public('Ticker', {'pair': pair}), [f'P{i}' for i in range(30)], 8)
+            elapsed = time.perf_counter() - start
+            self.assertGreaterEqual(elapsed, (30 - 5) / 50 - 0.05)  # Burst of 5, then 50 per second
+            self.assertLess(elapsed, 2.0)
+            self.assertEqual(limiter.calls['Ticker'], 30)
+            self.assertEqual(kraken.requests, 30)
+
+            # Orders use their own counter, so a drained public budget does not delay them
+            start = time.perf_counter()
+            client.query_private('AddOrder', {'pair': 'ADAUSD'})
+            self.assertLess(time.perf_counter() - start, 0.1)
+
+            # A rate-limit answer holds the endpoint's counter until it has decayed
+            client._check_limit('/0/private/Balance', ['EAPI:Rate limit exceeded'])
+            self.assertEqual(limiter.counters['private'].level, 15)
+
+
+if __name__ == '__main__':
+    unittest.main()
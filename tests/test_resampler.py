@@ -0,0 +1,97 @@
+# tests/test_resampler.py
+import json
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from data.ohlc_store import OHLCStore
+from data.resampler import MultiTimeframeResampler
+from execution.data_handler import KrakenDataHandler
+from execution.kraken_client import KrakenClient
+from execution.market_cache import MarketDataCache
+from tests.test_ohlc_store import FIXTURE, RecordedSession
+
+
+def make_bars(n: int, seed: int = 0) -> pd.DataFrame:
+    # Hourly bars with gaps and some zero-volume bars, starting mid-week and mid-day
+    rng = np.random.default_rng(seed)
+    times = 1700010000 // 3600 * 3600 + 3600 * np.cumsum(rng.integers(1, 3, n))
+    close = 0.4 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    open_ = np.r_[0.4, close[:-1]]
+    volume = np.where(rng.random(n) < 0.1, 0.0, rng.uniform(100, 1000, n))
+    return pd.DataFrame({'time': times, 'open': open_, 'high': np.maximum(open_, close) * 1.01,
+                         'low': np.minimum(open_, close) * 0.99, 'close': close,
+                         'vwap': (open_ + close) / 2, 'volume': volume, 'count': rng.integers(0, 50, n)})
+
+
+def pandas_resample(bars: pd.DataFrame, rule: str, origin: str = 'epoch') -> pd.DataFrame:
+    indexed = bars.assign(traded=bars['vwap'] * bars['volume']).set_index(pd.to_datetime(bars['time'], unit='s'))
+    resampled = indexed.resample(rule, origin=origin).agg(
+        {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum',
+         'count': 'sum', 'traded': 'sum', 'vwap': 'last'}).dropna(subset=['open'])
+    traded = resampled['volume'] > 0
+    resampled.loc[traded, 'vwap'] = resampled['traded'] / resampled['volume']
+    return resampled
+
+
+class TestMultiTimeframeResampler(unittest.TestCase):
+    def test_streaming_and_bulk_match_pandas_resample(self):
+        bars = make_bars(3000)
+        streaming = MultiTimeframeResampler('1h', ['4h', 240, '1d', '1w'], capacity=5000)
+        for row in bars.itertuples(index=False):
+            streaming.on_bar(*row)
+        self.assertEqual(streaming.timeframes, ['1h', '4h', '1d', '1w'])
+        self.assertFalse(streaming.on_bar(*bars.iloc[-1]))  # Already seen
+
+        bulk = MultiTimeframeResampler(60, ['4h', '1d', '1w'], capacity=5000)
+        for start, stop in ((0, 7), (5, 1000), (1000, 1001), (1001, 3000)):  # Overlapping chunks
+            bulk.extend(bars.iloc[start:stop])
+
+        # Weekly bars open on Mondays
+        for timeframe, rule, origin in (('4h', '4h', 'epoch'), ('1d', '24h', 'epoch'), ('1w', '168h', '1970-01-05')):
+            expected = pandas_resample(bars, rule, origin)
+            for resampler in (streaming, bulk):
+                frame = resampler.frame(timeframe)
+                np.testing.assert_array_equal(frame['time'].to_numpy(), expected.index.to_numpy())
+                for name in ('open', 'high', 'low', 'close', 'volume', 'count', 'vwap'):
+                    np.testing.assert_allclose(frame[name].to_numpy(), expected[name].to_numpy(), rtol=1e-12)
+        np.testing.assert_array_equal(bulk.frame('1h')['close'], bars['close'])
+
+        with self.assertRaises(ValueError):
+            MultiTimeframeResampler('1h', ['90m'])
+
+    def test_handler_and_strategy_share_one_request(self):
+        from strategy.strategy import TechnicalStrategy
+        with open(FIXTURE) as f:
+            recording = json.load(f)
+        with tempfile.TemporaryDirectory() as directory:
+            handler = KrakenDataHandler(OHLCStore(directory), MarketDataCache({'OHLC': 0}), KrakenClient())
+            handler.api.session = RecordedSession(recording)
+            resampler = handler.get_timeframes('ADAUSD', ['4h'], interval=60)
+            self.assertEqual(len(resampler.frame('1h')), 7)  # The forming bar is left out
+            handler.get_timeframes('ADAUSD', ['4h'], interval=60)
+            handler.get_timeframes('ADAUSD', ['4h'], interval=60)
+            self.assertEqual(len(handler.api.session.requests), 3)  # One OHLC request per call
+
+            stored = pd.DataFrame(handler.store.arrays('ADAUSD', 60)).iloc[:-1]
+            np.testing.assert_array_equal(resampler.frame('1h')['close'], stored['close'])
+            expected = pandas_resample(stored, '4h')
+            np.testing.assert_allclose(resampler.frame('4h')['high'], expected['high'])
+
+        bars = make_bars(600)
+        resampler = MultiTimeframeResampler('1h', ['4h'])
+        resampler.extend(bars)
+        strategy = TechnicalStrategy()
+        np.random.seed(0)
+        decisions = strategy.multi_timeframe_strategy('ADAUSD', resampler)
+        reference = TechnicalStrategy()
+        np.random.seed(0)
+        for timeframe in ('1h', '4h'):
+            reference.data = resampler.frame(timeframe)
+            expected = reference.combined_strategy('ADAUSD')
+            self.assertEqual(decisions[timeframe]['action'], expected['action'])
+            self.assertEqual(decisions[timeframe]['score'], expected['score'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+# tests/test_result_cache.py
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+from backtesting.backtester import Backtester
+from backtesting.cache import ResultCache
+from backtesting.optimizer import Optimizer, grid
+from tests.test_vectorized_backtest import load_dataset
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.data = load_dataset('ADAUSD')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def backtest(self, cache, buy_threshold=0.3):
+        backtester = Backtester(self.data, cache=cache)
+        backtester.buy_threshold, backtester.sell_threshold, backtester.trade_size = buy_threshold, -0.3, 0.5
+        backtester.run_vectorized()
+        return backtester
+
+    def test_backtest_hits_and_parameter_invalidation(self):
+        cache = ResultCache(self.directory.name)
+        first = self.backtest(cache)
+        with mock.patch.object(Backtester, 'decisions', side_effect=AssertionError('recomputed')):
+            started = time.perf_counter()
+            repeat = self.backtest(cache)
+            self.assertLess(time.perf_counter() - started, 0.5)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(repeat.trade_log, first.trade_log)
+        self.assertEqual(repeat.evaluate_performance(), first.evaluate_performance())
+
+        # A changed parameter adds its own entry and leaves the first one in place
+        self.backtest(cache, buy_threshold=0.2)
+        self.assertEqual(len(cache.entries()), 2)
+        self.backtest(cache)
+        self.assertEqual(cache.hits, 2)
+
+        # Sweep candidates evaluated before are served from the cache
+        space = {'buy_threshold': [0.2, 0.4], 'sell_threshold': [-0.3]}
+        swept = Optimizer(self.data, processes=0, cache=cache).sweep(grid(space))
+        with mock.patch('backtesting.optimizer.evaluate_candidate', side_effect=AssertionError('recomputed')):
+            again = Optimizer(self.data, processes=0, cache=cache).sweep(grid(space))
+        self.assertEqual(list(again['Final Balance']), list(swept['Final Balance']))
+
+        # Candidates run with a different configured stop-loss are not served the old results
+        misses = cache.misses
+        with mock.patch.dict('backtesting.optimizer.DEFAULT_PARAMS', stop_loss=0.01):
+            Optimizer(self.data, processes=0, cache=cache).sweep(grid(space))
+        self.assertEqual(cache.misses, misses + 2)
+
+    def test_lru_eviction(self):
+        cache = ResultCache(self.directory.name, max_bytes=4000)
+        for name in 'abcd':
+            cache.put(cache.key(name), b'x' * 900)
+            time.sleep(0.01)
+        self.assertIsNotNone(cache.get(cache.key('a')))  # Now the most recently used
+        cache.put(cache.key('e'), b'x' * 900)
+        kept = {name for name in 'abcde' if cache.key(name) in cache}
+        self.assertEqual(kept, {'a', 'c', 'd', 'e'})
+        self.assertLessEqual(cache.nbytes, 4000)
+        self.assertFalse([name for name in os.listdir(self.directory.name) if name.endswith('.tmp')])
+
+        # Rewriting an existing key replaces its size rather than adding to it, so nothing is evicted
+        with mock.patch.object(cache, 'evict', side_effect=AssertionError('evicted')):
+            for _ in range(5):
+                cache.put(cache.key('e'), b'x' * 900)
+        self.assertEqual(cache._nbytes, cache.nbytes)
+        self.assertEqual({name for name in 'abcde' if cache.key(name) in cache}, {'a', 'c', 'd', 'e'})
+
+
+if __name__ == '__main__':
+    unittest.main()
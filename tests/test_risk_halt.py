@@ -0,0 +1,49 @@
+# tests/test_risk_halt.py
+import importlib.util
+import os
+import unittest
+from unittest.mock import MagicMock
+from config.config import BASE_CURRENCY, MAX_DAILY_DRAWDOWN
+from portfolio.portfolio import PortfolioManager
+
+# risk/risk _manager.py has a space in its name, so it is loaded from its path
+_spec = importlib.util.spec_from_file_location(
+    'risk_manager', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'risk', 'risk _manager.py'))
+risk_manager = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(risk_manager)
+
+POSITIONS = (('ADAUSD', 100.0), ('LTCUSD', 2.0), ('DOTUSD', 10.0))
+
+
+class TestDrawdownHalt(unittest.TestCase):
+    def setUp(self):
+        data_handler = MagicMock()
+        data_handler.get_balance.return_value = {BASE_CURRENCY: '1000.0'}
+        self.executor = MagicMock()
+        self.manager = risk_manager.RiskManager(data_handler, self.executor)
+        self.assertIsInstance(self.manager.portfolio_manager, PortfolioManager)
+        self.manager.portfolio_manager.positions = {pair: {'amount': amount, 'leverage': 1, 'status': 'open'}
+                                                    for pair, amount in POSITIONS}
+
+    def test_breach_closes_every_position_in_one_batch(self):
+        self.executor.place_batch.return_value = [{'txid': ['O1']}, None, {'txid': ['O3']}]
+        self.manager.daily_loss = 1000.0 * MAX_DAILY_DRAWDOWN
+
+        self.assertTrue(self.manager.check_daily_drawdown())
+        self.executor.place_batch.assert_called_once()
+        orders = self.executor.place_batch.call_args[0][0]
+        self.assertEqual([(order['pair'], order['type'], order['volume']) for order in orders],
+                         [(pair, 'sell', amount) for pair, amount in POSITIONS])
+        self.executor.place_market_order.assert_not_called()
+        # The order that was not placed leaves its position open
+        self.assertEqual(list(self.manager.portfolio_manager.positions), ['LTCUSD'])
+
+    def test_within_limit_keeps_positions(self):
+        self.manager.daily_loss = 1000.0 * MAX_DAILY_DRAWDOWN / 2
+        self.assertFalse(self.manager.check_daily_drawdown())
+        self.executor.place_batch.assert_not_called()
+        self.assertEqual(len(self.manager.portfolio_manager.positions), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
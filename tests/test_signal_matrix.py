@@ -0,0 +1,33 @@
+# tests/test_signal_matrix.py
+import unittest
+import numpy as np
+import pandas as pd
+from strategy.strategy import TechnicalStrategy, SIGNAL_MAPPING
+from strategy.signal_matrix import INDICATORS
+from tests.test_incremental import make_ohlcv, pandas_signals
+
+
+class TestSignalMatrix(unittest.TestCase):
+    def setUp(self):
+        self.data = make_ohlcv(240, seed=5)
+        self.market = pd.Series(np.random.default_rng(2).normal(0, 0.02, len(self.data)))
+        self.strategy = TechnicalStrategy()
+
+    def test_shape(self):
+        result = self.strategy.signal_matrix(self.data)
+        self.assertEqual(result['votes'].shape, (len(self.data), len(INDICATORS)))
+        self.assertEqual(len(result['action']), len(self.data))
+        self.assertTrue((result['votes'][:, INDICATORS.index('beta')] == 0).all())
+
+    def test_rows_match_last_bar_evaluation(self):
+        result = self.strategy.signal_matrix(self.data, self.market)
+        for t in list(range(5, len(self.data), 17)) + [len(self.data) - 1]:
+            signals, atr = pandas_signals(self.data.iloc[:t + 1], self.market)
+            self.assertEqual(list(result['votes'][t]), [SIGNAL_MAPPING[signals[name]] for name in INDICATORS])
+            expected = self.strategy.score_signals(signals, atr)
+            self.assertEqual(result['action'][t], expected['action'])
+            self.assertEqual(round(result['score'][t], 2), expected['score'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+# tests/test_vectorized_backtest.py
+import unittest
+import numpy as np
+import pandas as pd
+from backtesting.backtester import Backtester
+from data.investing import load_frame
+
+
+def load_dataset(pair: str) -> pd.DataFrame:
+    # Bundled Investing.com history, parsed without touching the on-disk cache
+    return load_frame(pair, cache_path=None)
+
+
+class TestVectorizedBacktest(unittest.TestCase):
+    def run_both(self, data, actions, sizes):
+        loop, vectorized = Backtester(data), Backtester(data)
+        loop.run(actions, sizes)
+        vectorized.run_vectorized(actions, sizes)
+        return loop, vectorized
+
+    def assert_same_account(self, loop, vectorized):
+        self.assertAlmostEqual(vectorized.balance / loop.balance, 1.0, places=9)
+        self.assertEqual([t['action'] for t in vectorized.trade_log], [t['action'] for t in loop.trade_log])
+        np.testing.assert_allclose([t['balance'] for t in vectorized.trade_log],
+                                   [t['balance'] for t in loop.trade_log], rtol=1e-9, atol=1e-9)
+
+    def test_matches_loop_on_bundled_datasets(self):
+        for pair in ('ADAUSD', 'LTCUSD'):
+            data = load_dataset(pair)
+            backtester = Backtester(data)
+            backtester.buy_threshold, backtester.sell_threshold = 0.3, -0.3
+            for trade_size in (1.0, 0.25):
+                backtester.trade_size = trade_size
+                actions, sizes = backtester.decisions()
+                loop, vectorized = self.run_both(data, actions, sizes)
+                self.assert_same_account(loop, vectorized)
+                self.assertGreater(len(loop.trade_log), 0)
+
+    def test_matches_loop_on_random_signals(self):
+        data = load_dataset('ADAUSD')
+        rng = np.random.default_rng(3)
+        for _ in range(5):
+            actions = rng.choice(['buy', 'sell', 'hold'], size=len(data))
+            sizes = rng.choice([0.0, 0.1, 0.5, 1.0], size=len(data))
+            loop, vectorized = self.run_both(data, actions, sizes)
+            self.assert_same_account(loop, vectorized)
+
+
+if __name__ == '__main__':
+    unittest.main()